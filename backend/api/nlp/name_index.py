@@ -0,0 +1,178 @@
+import re
+
+# Words that show up in almost every chat message. They are never treated as
+# nicknames or typo candidates, otherwise "season" would fuzzy-match "Sexton".
+COMMON_WORDS = {
+    "who", "is", "the", "best", "compare", "draft", "or", "vs", "tell", "me", "about",
+    "stats", "for", "should", "i", "top", "rank", "and", "how", "many", "much", "did",
+    "does", "was", "what", "his", "her", "in", "of", "a", "an", "to", "last", "year",
+    "season", "points", "point", "score", "scored", "fantasy", "yards", "yard",
+    "touchdown", "touchdowns", "rushing", "rushed", "passing", "passed", "threw",
+    "throw", "receiving", "catch", "caught", "receptions", "trade", "better", "than",
+    "have", "has", "get", "games", "game", "week", "total", "with", "this", "that",
+}
+
+# Name suffixes are skipped when picking a player's "last name".
+NAME_SUFFIXES = {"jr", "sr", "ii", "iii", "iv", "v"}
+
+# Nicknames fans actually type. Anything with 3+ name parts also gets its
+# initials registered automatically (e.g. "jsn" for Jaxon Smith-Njigba).
+NICKNAMES = {
+    "cmc": "Christian McCaffrey",
+    "arsb": "Amon-Ra St. Brown",
+    "ajb": "A.J. Brown",
+    "tmac": "Terry McLaurin",
+    "mhj": "Marvin Harrison",
+    "kw3": "Kenneth Walker",
+}
+
+
+def normalize_tokens(text):
+    """Lowercases a name or message and splits it into comparable tokens."""
+    text = text.lower()
+    text = re.sub(r"['’]s\b", "", text)      # "Mahomes's" -> "Mahomes"
+    text = re.sub(r"['’.]", "", text)         # "A.J." -> "aj", "Ja'Marr" -> "jamarr"
+    return re.findall(r"[a-z0-9]+", text)
+
+
+def _deletes(word, max_distance):
+    """All strings reachable from `word` by deleting up to `max_distance` characters."""
+    results = {word}
+    frontier = {word}
+    for _ in range(max_distance):
+        next_frontier = set()
+        for w in frontier:
+            for i in range(len(w)):
+                next_frontier.add(w[:i] + w[i + 1:])
+        results |= next_frontier
+        frontier = next_frontier
+    return results
+
+
+def _edit_distance(a, b):
+    """Optimal string alignment distance (Levenshtein + adjacent transpositions)."""
+    prev2 = None
+    prev = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        curr = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            curr[j] = min(prev[j] + 1, curr[j - 1] + 1, prev[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                curr[j] = min(curr[j], prev2[j - 2] + 1)
+        prev2, prev = prev, curr
+    return prev[-1]
+
+
+def _max_typos(word):
+    """How many typos we tolerate for a word of this length."""
+    if len(word) < 4:
+        return 0
+    return 1 if len(word) < 8 else 2
+
+
+class PlayerNameIndex:
+    """
+    Prebuilt lookup tables for resolving player names inside a chat message.
+
+    `players` must be ordered by popularity (fantasy points DESC). Every map
+    keeps only the best-ranked player per key, so "Josh" still resolves to
+    Josh Allen. A lookup only touches the message's tokens, so its cost does
+    not depend on how many players are indexed.
+    """
+
+    MAX_TYPOS = 2
+
+    def __init__(self, players):
+        self.full_names = {}
+        self.last_names = {}
+        self.first_names = {}
+        self.aliases = {}
+        self.fuzzy = {}       # deletion variant -> {name token: rank}
+        self.players = []     # rank -> (name, player_id)
+        self.max_name_tokens = 1
+
+        for name, player_id in players:
+            if not name:
+                continue
+            tokens = normalize_tokens(name)
+            if not tokens:
+                continue
+
+            rank = len(self.players)
+            self.players.append((name, player_id))
+            self.max_name_tokens = max(self.max_name_tokens, len(tokens))
+
+            core = [t for t in tokens if t not in NAME_SUFFIXES] or tokens
+            self.full_names.setdefault(" ".join(tokens), rank)
+            self.full_names.setdefault(" ".join(core), rank)
+            self.last_names.setdefault(core[-1], rank)
+            self.first_names.setdefault(core[0], rank)
+
+            if len(core) >= 3:
+                initials = "".join(t[0] for t in core)
+                if initials not in COMMON_WORDS:
+                    self.aliases.setdefault(initials, rank)
+
+            for token in set(core):
+                if len(token) < 4:
+                    continue
+                for variant in _deletes(token, self.MAX_TYPOS):
+                    bucket = self.fuzzy.setdefault(variant, {})
+                    bucket.setdefault(token, rank)
+
+        for nickname, full_name in NICKNAMES.items():
+            rank = self.full_names.get(" ".join(normalize_tokens(full_name)))
+            if rank is not None:
+                self.aliases[nickname] = rank
+
+    def __len__(self):
+        return len(self.players)
+
+    def match(self, text):
+        """
+        Returns (name, player_id) for the best player mentioned in `text`,
+        or (None, None). Priority: full name, last name, first name,
+        nickname, then a typo-tolerant match on any name token.
+        """
+        tokens = normalize_tokens(text)
+        if not tokens:
+            return None, None
+
+        # 1. Full name (any run of consecutive words)
+        best = None
+        for n in range(1, min(self.max_name_tokens, len(tokens)) + 1):
+            for i in range(len(tokens) - n + 1):
+                rank = self.full_names.get(" ".join(tokens[i:i + n]))
+                if rank is not None and (best is None or rank < best):
+                    best = rank
+        if best is not None:
+            return self.players[best]
+
+        # 2. Last name, 3. First name, 4. Nickname / initials
+        for table in (self.last_names, self.first_names, self.aliases):
+            ranks = [table[t] for t in tokens if t in table]
+            if ranks:
+                return self.players[min(ranks)]
+
+        # 5. Typos ("Mahomse", "McCafrey")
+        best = None
+        for token in tokens:
+            if token in COMMON_WORDS:
+                continue
+            limit = _max_typos(token)
+            if not limit:
+                continue
+            seen = set()
+            for variant in _deletes(token, limit):
+                for candidate, rank in self.fuzzy.get(variant, {}).items():
+                    if candidate in seen:
+                        continue
+                    seen.add(candidate)
+                    distance = _edit_distance(token, candidate)
+                    if distance <= limit and (best is None or (distance, rank) < best):
+                        best = (distance, rank)
+        if best is not None:
+            return self.players[best[1]]
+
+        return None, None
@@ -0,0 +1,278 @@
+import asyncio
+import threading
+import time
+from bisect import bisect_left
+from sqlalchemy import text
+from database import engine, async_engine
+
+# Shared player lookup used by the chat bot, trade agent, RAG model and the
+# /players and /predict routes. `name ILIKE '%x%'` can't use a B-tree, so we
+# back it with a pg_trgm GIN index (migrations/0003_player_search.sql), or
+# with an in-process index when the database has no pg_trgm.
+
+SIMILARITY_THRESHOLD = 0.3   # Same default as pg_trgm's similarity threshold
+MEMORY_INDEX_TTL = 600       # Seconds before the in-process index reloads
+
+_backend = None              # "pg_trgm" or "memory", decided on first successful probe
+_backend_lock = threading.Lock()
+_memory_indexes = {}         # season -> MemoryPlayerIndex
+
+PROBE_SQL = text("""
+    SELECT EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm')
+       AND to_regclass('idx_players_name_trgm') IS NOT NULL
+""")
+
+
+def search_index_available():
+    """
+    True if the migration installed pg_trgm and the trigram index, False if
+    we have to search in-process, None if the database couldn't be asked.
+    Read-only: the DDL lives in the migration.
+    """
+    try:
+        with engine.connect() as conn:
+            return bool(conn.execute(PROBE_SQL).scalar())
+    except Exception as e:
+        print(f"⚠️ Could not check for pg_trgm, searching in-process for now: {e}")
+        return None
+
+
+def get_backend():
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                available = search_index_available()
+                if available is None:
+                    return "memory"   # not remembered, the next call probes again
+                _backend = "pg_trgm" if available else "memory"
+                if not available:
+                    print("⚠️ pg_trgm index missing (run python -m etl.migrate), using in-process player search")
+    return _backend
+
+
+def _trigrams(value):
+    """pg_trgm style trigrams: each word padded with two leading and one trailing space."""
+    grams = set()
+    for word in value.lower().split():
+        padded = f"  {word} "
+        for i in range(len(padded) - 2):
+            grams.add(padded[i:i + 3])
+    return grams
+
+
+def _raw_trigrams(value):
+    """Unpadded trigrams, used to find substring candidates."""
+    return {value[i:i + 3] for i in range(len(value) - 2)}
+
+
+class MemoryPlayerIndex:
+    """
+    In-process fallback: a sorted name list for prefix search and trigram
+    postings for substring and fuzzy search. Rows are kept in memory, so a
+    search never touches the players table.
+    """
+
+    def __init__(self, rows):
+        # rows are ordered by popularity; list position doubles as the rank.
+        # A traded player has one season_stats row per team, keep the best one.
+        self.rows = []
+        seen = set()
+        for r in rows:
+            if r.get("gsis_id") in seen:
+                continue
+            seen.add(r.get("gsis_id"))
+            self.rows.append(dict(r))
+        self.names = [(r.get("name") or "").lower() for r in self.rows]
+        self.sorted_names = sorted((name, i) for i, name in enumerate(self.names))
+        self.raw_postings = {}
+        self.trigram_postings = {}
+        self.name_grams = []    # trigrams of the full name, then of each word
+        for i, name in enumerate(self.names):
+            for gram in _raw_trigrams(name):
+                self.raw_postings.setdefault(gram, set()).add(i)
+            full = _trigrams(name)
+            self.name_grams.append([full] + [_trigrams(w) for w in name.split()])
+            for gram in full:
+                self.trigram_postings.setdefault(gram, []).append(i)
+        self.loaded_at = time.monotonic()
+
+    def prefix(self, query):
+        q = query.lower()
+        start = bisect_left(self.sorted_names, (q, -1))
+        hits = []
+        for name, i in self.sorted_names[start:]:
+            if not name.startswith(q):
+                break
+            hits.append(i)
+        return hits
+
+    def substring(self, query):
+        q = query.lower()
+        grams = _raw_trigrams(q)
+        if not grams:
+            # Too short for trigrams: a scan over 3k short strings is still cheap
+            return [i for i, name in enumerate(self.names) if q in name]
+        candidates = None
+        for gram in grams:
+            posting = self.raw_postings.get(gram, set())
+            candidates = posting if candidates is None else candidates & posting
+            if not candidates:
+                return []
+        return sorted(i for i in candidates if q in self.names[i])
+
+    def fuzzy(self, query):
+        """Best trigram similarity against the whole name or any single word of it."""
+        grams = _trigrams(query)
+        if not grams:
+            return []
+        candidates = set()
+        for gram in grams:
+            candidates.update(self.trigram_postings.get(gram, []))
+        scored = []
+        for i in candidates:
+            score = max(len(grams & g) / len(grams | g) for g in self.name_grams[i])
+            if score >= SIMILARITY_THRESHOLD:
+                scored.append((-score, i))
+        return [i for _, i in sorted(scored)]
+
+
+def _get_memory_index(season):
+    index = _memory_indexes.get(season)
+    if index is None or time.monotonic() - index.loaded_at > MEMORY_INDEX_TTL:
+        with engine.connect() as conn:
+            rows = conn.execute(text("""
+                SELECT p.*, s.fantasy_points
+                FROM players p
+                LEFT JOIN season_stats s ON p.gsis_id = s.gsis_id AND s.season = :season
+                ORDER BY s.fantasy_points DESC NULLS LAST
+            """), {"season": season}).mappings().all()
+        index = MemoryPlayerIndex(rows)
+        _memory_indexes[season] = index
+    return index
+
+
+def _escape_like(value):
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+# --- RANKED SEARCH ---
+# Prefix hits first, then substring hits, then typo matches. Each tier is
+# ordered by fantasy points so the player people mean shows up first.
+
+SEARCH_SQL = text("""
+    SELECT p.*
+    FROM players p
+    LEFT JOIN (
+        SELECT gsis_id, MAX(fantasy_points) AS fantasy_points
+        FROM season_stats WHERE season = :season GROUP BY gsis_id
+    ) s ON p.gsis_id = s.gsis_id
+    WHERE lower(p.name) LIKE :contains OR :q <% lower(p.name)
+    ORDER BY
+        CASE WHEN lower(p.name) LIKE :prefix THEN 0
+             WHEN lower(p.name) LIKE :contains THEN 1
+             ELSE 2 END,
+        s.fantasy_points DESC NULLS LAST,
+        word_similarity(:q, lower(p.name)) DESC,
+        p.name ASC
+    LIMIT :limit
+""")
+
+
+def search_players(db, query, limit=10, season=2025):
+    query = (query or "").strip()
+    if not query:
+        sql = text("SELECT * FROM players ORDER BY name ASC LIMIT :limit")
+        return [dict(r) for r in db.execute(sql, {"limit": limit}).mappings().all()]
+
+    if get_backend() == "memory":
+        index = _get_memory_index(season)
+        ranked, seen = [], set()
+        # Stages run one at a time: a full page of prefix hits never pays for the fuzzy pass
+        for stage in (index.prefix, index.substring, index.fuzzy):
+            for i in sorted(stage(query)):
+                if i not in seen:
+                    seen.add(i)
+                    ranked.append(i)
+            if len(ranked) >= limit:
+                break
+        return [index.rows[i] for i in ranked[:limit]]
+
+    q = query.lower()
+    params = {
+        "q": q,
+        "prefix": f"{_escape_like(q)}%",
+        "contains": f"%{_escape_like(q)}%",
+        "season": season,
+        "limit": limit,
+    }
+    return [dict(r) for r in db.execute(SEARCH_SQL, params).mappings().all()]
+
+
+FIND_SQL = text("""
+    SELECT p.*, s.fantasy_points
+    FROM players p
+    LEFT JOIN season_stats s ON p.gsis_id = s.gsis_id AND s.season = :season
+    WHERE lower(p.name) LIKE :contains
+    ORDER BY s.fantasy_points DESC NULLS LAST
+    LIMIT 1
+""")
+
+FIND_FUZZY_SQL = text("""
+    SELECT p.*, s.fantasy_points
+    FROM players p
+    LEFT JOIN season_stats s ON p.gsis_id = s.gsis_id AND s.season = :season
+    WHERE :q <% lower(p.name)
+    ORDER BY word_similarity(:q, lower(p.name)) DESC, s.fantasy_points DESC NULLS LAST
+    LIMIT 1
+""")
+
+
+def _find_in_memory(name, season):
+    index = _get_memory_index(season)
+    hits = index.substring(name) or index.fuzzy(name)[:1]
+    return index.rows[min(hits)] if hits else None
+
+
+def find_player(db, name, season=2025):
+    """
+    SMART LOOKUP: The most popular player whose name contains `name`
+    (same semantics as the old ILIKE query), falling back to the closest
+    typo match. Returns players.* plus that season's fantasy_points.
+    """
+    name = (name or "").strip()
+    if not name:
+        return None
+
+    if get_backend() == "memory":
+        return _find_in_memory(name, season)
+
+    q = name.lower()
+    player = db.execute(FIND_SQL, {"contains": f"%{_escape_like(q)}%", "season": season}).mappings().first()
+    if player:
+        return player
+    return db.execute(FIND_FUZZY_SQL, {"q": q, "season": season}).mappings().first()
+
+
+async def find_player_async(name, season=2025):
+    """
+    Async version of find_player for the chat pipeline. Each call checks out
+    its own pooled connection, so several lookups can run with asyncio.gather.
+    """
+    name = (name or "").strip()
+    if not name:
+        return None
+
+    # First call probes the database / loads the fallback, keep that off the event loop
+    backend = _backend or await asyncio.to_thread(get_backend)
+    if backend == "memory":
+        return await asyncio.to_thread(_find_in_memory, name, season)
+
+    q = name.lower()
+    async with async_engine.connect() as conn:
+        result = await conn.execute(FIND_SQL, {"contains": f"%{_escape_like(q)}%", "season": season})
+        player = result.mappings().first()
+        if player:
+            return player
+        result = await conn.execute(FIND_FUZZY_SQL, {"q": q, "season": season})
+        return result.mappings().first()
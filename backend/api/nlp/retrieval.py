@@ -1,20 +1,6 @@
 from sqlalchemy import text
-
-def calculate_fantasy(stats):
-    if not stats: return 0.0
-    try:
-        if stats.get('fantasy_points'): return float(stats.get('fantasy_points'))
-        p_yds = float(stats.get('passing_yards', 0) or 0)
-        p_tds = float(stats.get('passing_tds', 0) or 0)
-        ints = float(stats.get('interceptions', 0) or 0)
-        r_yds = float(stats.get('rushing_yards', 0) or 0)
-        r_tds = float(stats.get('rushing_tds', 0) or 0)
-        rec_yds = float(stats.get('receiving_yards', 0) or 0)
-        rec_tds = float(stats.get('receiving_tds', 0) or 0)
-        recs = float(stats.get('receptions', 0) or 0)
-        return round((p_yds/25) + (p_tds*4) - (ints*2) + (r_yds/10) + (r_tds*6) + (rec_yds/10) + (rec_tds*6) + recs, 2)
-    except:
-        return 0.0
+from api.nlp.player_search import find_player
+from etl.scoring import score_stats
 
 class RetrievalEngine:
     def __init__(self, db_session):
@@ -53,8 +39,7 @@ class RetrievalEngine:
         }
 
     def get_player_stats(self, name):
-        sql_p = text("SELECT * FROM players WHERE name ILIKE :name LIMIT 1")
-        p = self.db.execute(sql_p, {"name": f"%{name}%"}).mappings().first()
+        p = find_player(self.db, name)
         if not p: return None
         
         pid = p.get('gsis_id') or p.get('player_id')
@@ -65,7 +50,7 @@ class RetrievalEngine:
         return {
             "info": dict(p),
             "stats": stats,
-            "fantasy": calculate_fantasy(stats)
+            "fantasy": score_stats(stats)
         }
 
     def _format_player(self, row, sort_col):
@@ -73,6 +58,6 @@ class RetrievalEngine:
             "name": row['name'],
             "team": row['team_id'],
             "val": row[sort_col],
-            "fantasy": calculate_fantasy(dict(row)),
+            "fantasy": score_stats(dict(row)),
             "player_id": row['gsis_id']
         }
\ No newline at end of file
@@ -5,6 +5,20 @@ from database import get_db
 
 router = APIRouter()
 
+TABLE_MAP = {
+    "QB": "season_passing_stats",
+    "RB": "season_rushing_stats",
+    "WR": "season_receiving_stats",
+    "TE": "season_receiving_stats"
+}
+
+def seasons_sql(table_name):
+    return text(f"""
+        SELECT season, * FROM {table_name} 
+        WHERE player_id = :pid AND season IN (2024, 2025)
+        ORDER BY season ASC
+    """)
+
 @router.get("/compare-seasons/{player_id}", response_model=dict)
 def compare_seasons(
     player_id: str,
@@ -15,28 +29,15 @@ def compare_seasons(
     Compares a player's stats between 2024 (Previous) and 2025 (Current).
     """
     # 1. Determine which table to query
-    table_map = {
-        "QB": "season_passing_stats",
-        "RB": "season_rushing_stats",
-        "WR": "season_receiving_stats",
-        "TE": "season_receiving_stats"
-    }
-    
-    if position not in table_map:
+    if position not in TABLE_MAP:
         raise HTTPException(status_code=400, detail="Invalid position. Use QB, RB, WR, or TE.")
     
-    table_name = table_map[position]
+    table_name = TABLE_MAP[position]
 
     # 2. Query for 2024 and 2025
     # FIXED: Changed years to 2024 and 2025
-    sql = text(f"""
-        SELECT season, * FROM {table_name} 
-        WHERE player_id = :pid AND season IN (2024, 2025)
-        ORDER BY season ASC
-    """)
-    
     try:
-        results = db.execute(sql, {"pid": player_id}).mappings().all()
+        results = db.execute(seasons_sql(table_name), {"pid": player_id}).mappings().all()
     except Exception as e:
         print(f"Query Error: {e}")
         raise HTTPException(status_code=500, detail="Database error")
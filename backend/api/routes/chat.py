@@ -1,23 +1,24 @@
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
 from sqlalchemy import text
 from pydantic import BaseModel
+import asyncio
 import re
-import requests 
-from database import get_db, engine
+from database import engine, AsyncSessionLocal
 from ml.trade_agent import trade_agent
+from ml.model_client import model_client
 from api.auth import get_current_user 
+from api.nlp.name_index import PlayerNameIndex
 
 router = APIRouter()
-MODEL_SERVICE_URL = "http://127.0.0.1:8001/generate"
 
 class ChatRequest(BaseModel):
     message: str
 
 # --- KNOWLEDGE BASE ---
 PLAYER_KNOWLEDGE_BASE = []
+PLAYER_NAME_INDEX = PlayerNameIndex([])
 def refresh_knowledge_base():
-    global PLAYER_KNOWLEDGE_BASE
+    global PLAYER_KNOWLEDGE_BASE, PLAYER_NAME_INDEX
     try:
         with engine.connect() as conn:
             # We explicitly fetch top 500 players so common names like "Josh" default to the best one (Josh Allen)
@@ -28,42 +29,41 @@ def refresh_knowledge_base():
                 ORDER BY s.fantasy_points DESC NULLS LAST LIMIT 500
             """)
             PLAYER_KNOWLEDGE_BASE = [(r[0], r[1]) for r in conn.execute(sql).fetchall()]
+            # Build the lookup tables once here instead of scanning the list per message
+            PLAYER_NAME_INDEX = PlayerNameIndex(PLAYER_KNOWLEDGE_BASE)
             print(f"✅ Knowledge Base Loaded: {len(PLAYER_KNOWLEDGE_BASE)} players.")
     except: pass
 refresh_knowledge_base()
 
 def find_best_entity_match(user_text):
-    user_text_lower = user_text.lower()
-    
-    # 1. Check Full Name (Exact Substring) - Highest Priority
-    for name, pid in PLAYER_KNOWLEDGE_BASE:
-        if name.lower() in user_text_lower: return name, pid
-        
-    # 2. Check Last Name (Exact Word)
-    user_words = user_text_lower.split()
-    for name, pid in PLAYER_KNOWLEDGE_BASE:
-        if name.split()[-1].lower() in user_words: return name, pid
-        
-    # 3. Check First Name (Exact Word) - NEW FIX
-    # This enables "Saquon", "Lamar", "Patrick" to work
-    for name, pid in PLAYER_KNOWLEDGE_BASE:
-        if name.split()[0].lower() in user_words: return name, pid
-        
-    return None, None
+    # Full name > last name > first name > nickname ("CMC") > typo ("Mahomse").
+    # Ties go to the player with the most fantasy points.
+    return PLAYER_NAME_INDEX.match(user_text)
+
+async def fetch_rows(sql, params):
+    # Each lookup gets its own pooled session so independent queries can run together
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(sql, params)
+        return result.mappings().all()
 
-def get_top_players_by_position(db, position, limit=5):
-    sql = text("""
-        SELECT p.name, p.gsis_id as player_id, p.team_id as team, s.fantasy_points as fantasy
-        FROM season_stats s JOIN players p ON s.gsis_id = p.gsis_id
-        WHERE s.season = 2025 AND p.position = :pos ORDER BY s.fantasy_points DESC LIMIT :limit
-    """)
-    return db.execute(sql, {"pos": position, "limit": limit}).mappings().all()
+TOP_PLAYERS_SQL = text("""
+    SELECT p.name, p.gsis_id as player_id, p.team_id as team, s.fantasy_points as fantasy
+    FROM season_stats s JOIN players p ON s.gsis_id = p.gsis_id
+    WHERE s.season = 2025 AND p.position = :pos ORDER BY s.fantasy_points DESC LIMIT :limit
+""")
+COMPARE_STATS_SQL = text("SELECT * FROM season_stats WHERE gsis_id IN (:id1, :id2) AND season = 2025")
+COMPARE_PLAYERS_SQL = text("SELECT * FROM players WHERE gsis_id IN (:id1, :id2)")
+
+async def get_top_players_by_position(position, limit=5):
+    return await fetch_rows(TOP_PLAYERS_SQL, {"pos": position, "limit": limit})
+
+async def no_rows():
+    return None
 
 # --- ENDPOINT ---
 @router.post("/")
-def chat_endpoint(request: ChatRequest, 
-                  db: Session = Depends(get_db), 
-                  user: dict = Depends(get_current_user)):
+async def chat_endpoint(request: ChatRequest, 
+                        user: dict = Depends(get_current_user)):
     
     user_msg = request.message
     msg_lower = user_msg.lower()
@@ -74,7 +74,7 @@ def chat_endpoint(request: ChatRequest,
     if trade_match:
         p_give_raw = trade_match.group(1).strip()
         p_receive_raw = trade_match.group(2).strip()
-        data, advice = trade_agent.analyze_trade(p_give_raw, p_receive_raw)
+        data, advice = await trade_agent.analyze_trade(p_give_raw, p_receive_raw)
         if data:
             return {"response": advice, "data": {"type": "trade_analysis", "player1": data['give'], "player2": data['receive'], "diff": data['diff'], "verdict": data['verdict']}}
         else:
@@ -86,14 +86,20 @@ def chat_endpoint(request: ChatRequest,
         if "qb" in msg_lower or "quarterback" in msg_lower: pos = "QB"
         elif "rb" in msg_lower or "running" in msg_lower: pos = "RB"
         elif "wr" in msg_lower or "receiver" in msg_lower: pos = "WR"
+
+        # The three position boards are independent, fetch them concurrently
+        qbs, rbs, wrs = await asyncio.gather(*[
+            get_top_players_by_position(p) if not pos or pos == p else no_rows()
+            for p in ("QB", "RB", "WR")
+        ])
         
         return {
             "response": f"Here are the top {pos if pos else 'players'} for 2025:",
             "data": {
                 "type": "draft_board", 
-                "qbs": get_top_players_by_position(db, 'QB') if not pos or pos=='QB' else None,
-                "rbs": get_top_players_by_position(db, 'RB') if not pos or pos=='RB' else None,
-                "wrs": get_top_players_by_position(db, 'WR') if not pos or pos=='WR' else None
+                "qbs": qbs,
+                "rbs": rbs,
+                "wrs": wrs
             }
         }
 
@@ -120,15 +126,14 @@ def chat_endpoint(request: ChatRequest,
             id1, id2 = found_ids[0], found_ids[1]
             n1, n2 = found_names[0], found_names[1]
             
-            sql_stats = text("SELECT * FROM season_stats WHERE gsis_id IN (:id1, :id2) AND season = 2025")
-            stats_rows = db.execute(sql_stats, {"id1": id1, "id2": id2}).mappings().all()
+            stats_rows, p_rows = await asyncio.gather(
+                fetch_rows(COMPARE_STATS_SQL, {"id1": id1, "id2": id2}),
+                fetch_rows(COMPARE_PLAYERS_SQL, {"id1": id1, "id2": id2})
+            )
             
             s1 = next((s for s in stats_rows if s['gsis_id'] == id1), {})
             s2 = next((s for s in stats_rows if s['gsis_id'] == id2), {})
             
-            sql_p = text("SELECT * FROM players WHERE gsis_id IN (:id1, :id2)")
-            p_rows = db.execute(sql_p, {"id1": id1, "id2": id2}).mappings().all()
-            
             pd1 = next((p for p in p_rows if p['gsis_id'] == id1), {})
             pd2 = next((p for p in p_rows if p['gsis_id'] == id2), {})
 
@@ -155,11 +160,9 @@ def chat_endpoint(request: ChatRequest,
                  "data": {"type": "player_profile", "player_id": matched_id, "name": matched_name}
              }
         
-        # Otherwise, ask the AI
-        try:
-            resp = requests.post(MODEL_SERVICE_URL, json={"player_name": matched_name, "question": user_msg})
-            ai_res = resp.json().get("answer", "Error.") if resp.status_code == 200 else "Error."
-        except: ai_res = "Service offline."
+        # Otherwise, ask the AI (non-blocking: the worker keeps serving other chats meanwhile)
+        ai_res = await model_client.generate(matched_name, user_msg)
+        if ai_res is None: ai_res = "Service offline."
         return {"response": ai_res, "data": {"type": "text_only"}}
 
     return {"response": "Try 'Trade Lamar for CMC' or 'How many points did Saquon score?'"}
\ No newline at end of file
@@ -5,6 +5,19 @@ from database import get_db
 
 router = APIRouter()
 
+PROFILE_SQL = text("SELECT name, position, team_id FROM players WHERE player_id = :pid")
+
+# One range scan of player_week's (player_id, season, week) key
+STATS_SQL = text("""
+    SELECT 
+        SUM(passing_yards) as total_pass, 
+        SUM(rushing_yards) as total_rush, 
+        SUM(receiving_yards) as total_rec,
+        COUNT(*) as games
+    FROM player_week
+    WHERE player_id = :pid AND season = 2024
+""")
+
 @router.get("/", response_model=dict)
 def compare_players(
     p1: str = Query(..., description="ID of Player 1"),
@@ -13,25 +26,12 @@ def compare_players(
 ):
     def get_player_data(pid):
         # 1. Profile (Get the name first)
-        player = db.execute(text("SELECT name, position, team_id FROM players WHERE player_id = :pid"), {"pid": pid}).fetchone()
+        player = db.execute(PROFILE_SQL, {"pid": pid}).fetchone()
         if not player:
             return None
         
-        # 2. Stats (Join by NAME because IDs don't match)
-        stats = db.execute(text("""
-            SELECT 
-                SUM(passing_yards) as total_pass, 
-                SUM(rushing_yards) as total_rush, 
-                SUM(receiving_yards) as total_rec,
-                COUNT(*) as games
-            FROM (
-                SELECT passing_yards, 0 as rushing_yards, 0 as receiving_yards FROM weekly_passing_stats WHERE player_name = :name AND season = 2024
-                UNION ALL
-                SELECT 0, rushing_yards, 0 FROM weekly_rushing_stats WHERE player_name = :name AND season = 2024
-                UNION ALL
-                SELECT 0, 0, receiving_yards FROM weekly_receiving_stats WHERE player_name = :name AND season = 2024
-            ) as combined
-        """), {"name": player.name}).fetchone()
+        # 2. Stats
+        stats = db.execute(STATS_SQL, {"pid": pid}).fetchone()
 
         return {
             "name": player.name,
@@ -7,39 +7,40 @@ from schemas import LeaderEntry
 
 router = APIRouter()
 
-@router.get("/", response_model=List[LeaderEntry])
-def get_draft_suggestions(
-    position: str,
-    db: Session = Depends(get_db)
-):
-    table_map = {
-        "QB": ("weekly_passing_stats", "passing_yards"),
-        "RB": ("weekly_rushing_stats", "rushing_yards"),
-        "WR": ("weekly_receiving_stats", "receiving_yards"),
-        "TE": ("weekly_receiving_stats", "receiving_yards")
-    }
-    
-    if position not in table_map:
-        return []
+METRIC_MAP = {
+    "QB": "passing_yards",
+    "RB": "rushing_yards",
+    "WR": "receiving_yards",
+    "TE": "receiving_yards"
+}
 
-    table_name, metric = table_map[position]
-
-    # FIXED: Joining on NAME instead of ID
-    sql = text(f"""
+def draft_sql(metric):
+    # player_week holds every weekly stat per player; the season filter is a (season, week) index range
+    return text(f"""
         SELECT 
             p.player_id, 
             p.name, 
             p.team_id as team, 
             SUM(w.{metric}) as value
-        FROM {table_name} w
-        JOIN players p ON p.name = w.player_name
-        WHERE w.season = 2024
+        FROM player_week w
+        JOIN players p ON p.player_id = w.player_id
+        WHERE w.season = 2024 AND w.{metric} IS NOT NULL
         GROUP BY p.player_id, p.name, p.team_id
         ORDER BY value DESC
         LIMIT 5
     """)
-    
-    results = db.execute(sql).fetchall()
+
+@router.get("/", response_model=List[LeaderEntry])
+def get_draft_suggestions(
+    position: str,
+    db: Session = Depends(get_db)
+):
+    if position not in METRIC_MAP:
+        return []
+
+    metric = METRIC_MAP[position]
+
+    results = db.execute(draft_sql(metric)).fetchall()
 
     return [
         {
@@ -1,36 +1,53 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 from database import get_db
+from etl.leaderboards import CATEGORIES, TOP_N, leaderboard_status, lookup_leaders
 
 router = APIRouter()
 
-@router.get("/")
-def get_leaders(category: str = "passing", season: int = 2025, db: Session = Depends(get_db)):
-    # 1. Map frontend category to DB column
-    col_map = {
-        "passing": "passing_yards",
-        "rushing": "rushing_yards",
-        "receiving": "receiving_yards",
-        "fantasy": "fantasy_points"
-    }
-    
-    sort_col = col_map.get(category, "passing_yards")
-    
-    # 2. Query (Safe Join)
+def live_sql(sort_col, position):
+    pos_filter = "AND p.position = :position" if position != "ALL" else ""
     # We join players and stats. We use COALESCE to turn NULLs into 0 for sorting.
-    sql = text(f"""
+    return text(f"""
         SELECT p.name, p.team_id, COALESCE(s.{sort_col}, 0) as value, p.headshot_url
         FROM season_stats s
         JOIN players p ON s.gsis_id = p.gsis_id
-        WHERE s.season = :season
+        WHERE s.season = :season {pos_filter}
         ORDER BY value DESC
-        LIMIT 5
+        LIMIT :limit
     """)
-    
+
+def live_leaders(db, season, sort_col, position, limit):
+    """Old path: sort the whole season join. Used until the ETL has built leaderboard_snapshots."""
+    sql = live_sql(sort_col, position)
+    return db.execute(sql, {"season": season, "position": position, "limit": limit}).mappings().all()
+
+def snapshot_leaders(db, season, category, position, limit):
+    try:
+        return lookup_leaders(db, season, category, position, limit)
+    except Exception as e:
+        db.rollback()   # table not built yet
+        print(f"Leaderboard snapshot unavailable: {e}")
+        return []
+
+@router.get("/")
+def get_leaders(response: Response, category: str = "passing", season: int = 2025, position: str = "ALL",
+                limit: int = 5, db: Session = Depends(get_db)):
+    # 1. Map frontend category to DB column
+    if category not in CATEGORIES:
+        category = "passing"
+    sort_col = CATEGORIES[category]
+    position = position.upper()
+    limit = max(1, min(limit, TOP_N))
+
+    # 2. Query: precomputed board (primary-key read), live sort as a fallback
     try:
-        results = db.execute(sql, {"season": season}).mappings().all()
-        
+        results = snapshot_leaders(db, season, category, position, limit)
+        response.headers["X-Leaders-Source"] = "snapshot" if results else "live"
+        if not results:
+            results = live_leaders(db, season, sort_col, position, limit)
+
         return [
             {
                 "rank": i+1,
@@ -43,4 +60,15 @@ def get_leaders(category: str = "passing", season: int = 2025, db: Session = Dep
         ]
     except Exception as e:
         print(f"Error fetching leaders: {e}")
-        return []
\ No newline at end of file
+        return []
+
+@router.get("/status")
+def get_leaders_status(db: Session = Depends(get_db)):
+    """When the boards were last refreshed, how long it took, and whether newer stats are waiting."""
+    try:
+        status = leaderboard_status(db)
+    except Exception as e:
+        db.rollback()
+        print(f"Leaderboard status unavailable: {e}")
+        status = None
+    return status or {"refreshed_at": None, "stale": True}
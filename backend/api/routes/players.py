@@ -2,47 +2,62 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 from database import get_db
+from api.nlp import player_search
+from etl.percentiles import lookup_percentile
+from etl.scoring import score_stats
 import logging
 from scipy import stats # You might need to pip install scipy if you haven't, but we can do simple math without it too. Let's stick to simple math to avoid huge installs.
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
-def calculate_fantasy(stats):
-    if not stats: return 0.0
+PROFILE_SQL = text("SELECT * FROM players WHERE gsis_id = :pid LIMIT 1")
+HISTORY_SQL = text("SELECT * FROM season_stats WHERE gsis_id = :pid ORDER BY season ASC")
+PLAYER_KEY_SQL = text("SELECT player_id FROM players WHERE gsis_id = :pid LIMIT 1")
+GAMES_SQL = text("""
+    SELECT * FROM player_week
+    WHERE player_id = :id AND season = :season
+    ORDER BY week ASC
+""")
+
+def scan_percentile(db, score):
+    """Old path: pull every 2025 score and count in Python. Used until the ETL builds season_percentiles."""
+    sql_rank = text("SELECT fantasy_points FROM season_stats WHERE season = 2025")
+    all_scores = [float(r['fantasy_points'] or 0) for r in db.execute(sql_rank).mappings().all()]
+    if not all_scores:
+        return None
+    return sum(1 for x in all_scores if x < score), len(all_scores)
+
+def indexed_percentile(db, score, position="ALL"):
     try:
-        if stats.get('fantasy_points'): return float(stats.get('fantasy_points'))
-        p_yds = float(stats.get('passing_yards', 0) or 0)
-        p_tds = float(stats.get('passing_tds', 0) or 0)
-        ints = float(stats.get('interceptions', 0) or 0)
-        r_yds = float(stats.get('rushing_yards', 0) or 0)
-        r_tds = float(stats.get('rushing_tds', 0) or 0)
-        rec_yds = float(stats.get('receiving_yards', 0) or 0)
-        rec_tds = float(stats.get('receiving_tds', 0) or 0)
-        recs = float(stats.get('receptions', 0) or 0)
-        return round((p_yds/25) + (p_tds*4) - (ints*2) + (r_yds/10) + (r_tds*6) + (rec_yds/10) + (rec_tds*6) + recs, 2)
-    except:
-        return 0.0
+        return lookup_percentile(db, 2025, score, position)
+    except Exception:
+        db.rollback()   # table not built yet
+        return None
+
+def top_label(ranked):
+    if not ranked:
+        return "N/A"
+    below, total = ranked
+    percentile = (below / total) * 100
+    return f"Top {100 - int(percentile)}%" # e.g., "Top 5%"
 
 @router.get("/")
 def search_players(search: str = "", limit: int = 10, db: Session = Depends(get_db)):
-    sql = text("SELECT * FROM players WHERE name ILIKE :search ORDER BY name ASC LIMIT :limit")
-    results = db.execute(sql, {"search": f"%{search}%", "limit": limit}).mappings().all()
-    return [dict(r) for r in results]
+    # Prefix matches first, then substring, then typos (backed by a trigram index)
+    return player_search.search_players(db, search, limit=limit)
 
 @router.get("/{player_id}")
 def get_player_profile(player_id: str, db: Session = Depends(get_db)):
     # 1. Get Player Info
-    sql_p = text("SELECT * FROM players WHERE gsis_id = :pid LIMIT 1")
-    player = db.execute(sql_p, {"pid": player_id}).mappings().first()
+    player = db.execute(PROFILE_SQL, {"pid": player_id}).mappings().first()
     
     if not player:
         raise HTTPException(status_code=404, detail="Player not found")
 
     # 2. Get History
     pid = player['gsis_id']
-    sql_s = text("SELECT * FROM season_stats WHERE gsis_id = :pid ORDER BY season ASC")
-    stats = db.execute(sql_s, {"pid": pid}).mappings().all()
+    stats = db.execute(HISTORY_SQL, {"pid": pid}).mappings().all()
     season_stats = [dict(s) for s in stats]
     
     # 3. Calculate Comparison (Deltas)
@@ -53,18 +68,13 @@ def get_player_profile(player_id: str, db: Session = Depends(get_db)):
         current = season_stats[-1] # Most recent season (2025)
         
         # --- NEW: Percentile Logic ---
-        # Get ALL players' fantasy points for 2025 to rank this player
-        sql_rank = text("SELECT fantasy_points FROM season_stats WHERE season = 2025")
-        all_scores = [float(r['fantasy_points'] or 0) for r in db.execute(sql_rank).mappings().all()]
-        
-        if all_scores:
-            my_score = float(current.get('fantasy_points', 0))
-            # Sort scores
-            all_scores.sort()
-            # Find index
-            rank = sum(1 for x in all_scores if x < my_score)
-            percentile = (rank / len(all_scores)) * 100
-            percentile_rank = f"Top {100 - int(percentile)}%" # e.g., "Top 5%"
+        # Rank against every 2025 score via the precomputed season_percentiles table
+        my_score = float(current.get('fantasy_points') or 0)
+        ranked = indexed_percentile(db, my_score)
+        if ranked is None:
+            ranked = scan_percentile(db, my_score)
+        percentile_rank = top_label(ranked)
+        position_rank = top_label(indexed_percentile(db, my_score, player.get('position') or 'UNK'))
 
         # Delta Logic (from before)
         if len(season_stats) >= 2:
@@ -73,18 +83,31 @@ def get_player_profile(player_id: str, db: Session = Depends(get_db)):
                 "season_diff": f"{current['season']} vs {previous['season']}",
                 "passing_yards_delta": float(current.get('passing_yards', 0)) - float(previous.get('passing_yards', 0)),
                 "rushing_yards_delta": float(current.get('rushing_yards', 0)) - float(previous.get('rushing_yards', 0)),
-                "fantasy_points_delta": round(calculate_fantasy(current) - calculate_fantasy(previous), 2),
-                "percentile": percentile_rank # <--- Added this
+                "fantasy_points_delta": round(score_stats(current) - score_stats(previous), 2),
+                "percentile": percentile_rank, # <--- Added this
+                "position_percentile": position_rank
             }
         else:
             # If only 1 season exists, we can still show percentile
             comparison = {
                 "season_diff": "No previous season",
-                "percentile": percentile_rank
+                "percentile": percentile_rank,
+                "position_percentile": position_rank
             }
 
     return {
         "player_info": dict(player),
         "season_stats": season_stats,
         "comparison": comparison
-    }
\ No newline at end of file
+    }
+
+
+@router.get("/{player_id}/games")
+def get_player_game_log(player_id: str, season: int = 2025, db: Session = Depends(get_db)):
+    """Week-by-week stat lines for one season (a player_week primary-key range scan)."""
+    player = db.execute(PLAYER_KEY_SQL, {"pid": player_id}).mappings().first()
+    if not player:
+        raise HTTPException(status_code=404, detail="Player not found")
+
+    games = db.execute(GAMES_SQL, {"id": player["player_id"], "season": season}).mappings().all()
+    return [dict(g) for g in games]
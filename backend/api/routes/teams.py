@@ -5,11 +5,22 @@ from database import get_db
 
 router = APIRouter()
 
+TEAM_BY_ID_SQL = text("SELECT * FROM season_team_stats WHERE team_id = :tid AND season = 2025")
+TEAM_BY_NAME_SQL = text("""
+    SELECT s.* FROM season_team_stats s JOIN teams t ON t.id = s.team_id
+    WHERE t.name = :tid AND s.season = 2025
+""")
+
 @router.get("/")
 def get_teams(db: Session = Depends(get_db)):
-    sql = text("SELECT DISTINCT team_id FROM season_team_stats WHERE season = 2025 ORDER BY team_id")
+    # season_team_stats is keyed on teams.id; the name comes from teams
+    sql = text("""
+        SELECT DISTINCT s.team_id, t.name
+        FROM season_team_stats s LEFT JOIN teams t ON t.id = s.team_id
+        WHERE s.season = 2025 ORDER BY t.name
+    """)
     results = db.execute(sql).fetchall()
-    return [{"team_name": row[0], "team_id": row[0]} for row in results]
+    return [{"team_name": row.name or str(row.team_id), "team_id": row.team_id} for row in results]
 
 # --- THE MISSING ENDPOINT FOR DASHBOARD ---
 @router.get("/leaders/{category}")
@@ -23,27 +34,32 @@ def get_team_leaders(
     # Map frontend metrics to DB columns
     valid_metrics = {
         "off_total_yards": "off_total_yards",
-        "off_points": "off_total_tds", # Approx if points missing
+        "off_points": "off_points",
         "off_passing_yards": "off_total_yards", # Fallback
         "off_rushing_yards": "off_total_yards", # Fallback
         "def_sacks": "def_sacks_made",
-        "def_interceptions": "def_interceptions"
+        "def_interceptions": "def_interceptions",
+        "def_points_allowed": "def_points_allowed",
+        "turnover_margin": "turnover_margin",
+        "off_points_per_game": "off_points_per_game",
+        "def_points_allowed_per_game": "def_points_allowed_per_game"
     }
     
     db_col = valid_metrics.get(metric, "off_total_yards")
 
     sql = text(f"""
-        SELECT team_id, {db_col} as value
-        FROM season_team_stats 
-        WHERE season = :season
-        ORDER BY {db_col} DESC
+        SELECT s.team_id, t.name as team_name, s.{db_col} as value
+        FROM season_team_stats s
+        LEFT JOIN teams t ON t.id = s.team_id
+        WHERE s.season = :season
+        ORDER BY s.{db_col} DESC NULLS LAST
         LIMIT :limit
     """)
     
     try:
         results = db.execute(sql, {"season": season, "limit": limit}).mappings().all()
         return [
-            {"rank": i+1, "team": row["team_id"], "value": row["value"], "season": season}
+            {"rank": i+1, "team": row["team_name"] or row["team_id"], "team_id": row["team_id"], "value": row["value"], "season": season}
             for i, row in enumerate(results)
         ]
     except Exception as e:
@@ -52,7 +68,11 @@ def get_team_leaders(
 
 @router.get("/{team_id}")
 def get_team_stats(team_id: str, db: Session = Depends(get_db)):
-    sql = text("SELECT * FROM season_team_stats WHERE team_id = :tid AND season = 2025")
-    stats = db.execute(sql, {"tid": team_id}).mappings().first()
+    # Accepts the teams.id or the team's name/abbreviation
+    if team_id.isdigit():
+        sql, params = TEAM_BY_ID_SQL, {"tid": int(team_id)}
+    else:
+        sql, params = TEAM_BY_NAME_SQL, {"tid": team_id}
+    stats = db.execute(sql, params).mappings().first()
     if not stats: raise HTTPException(status_code=404, detail="Team not found")
     return dict(stats)
\ No newline at end of file
@@ -0,0 +1,101 @@
+import asyncio
+import contextlib
+import io
+import os
+import sys
+import threading
+import time
+
+import httpx
+import uvicorn
+
+# End-to-end chat latency with and without the template fast path
+# (ANSWER_MODE=llm vs hybrid). Runs the real model service (Flan-T5 + DB)
+# in-process and sends chat messages through the chat router, so each number
+# includes entity resolution, the model-service hop, fact lookup and inference.
+# The answer cache is disabled so every message actually renders.
+# Run from backend/: python bench_answer_mode.py
+
+SERVICE_PORT = 8766
+ROUNDS = 3
+PLAYERS = 5
+
+os.environ["MODEL_SERVICE_URL"] = f"http://127.0.0.1:{SERVICE_PORT}/generate"
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "ml"))
+
+from api.auth import get_current_user  # noqa: E402
+from api.routes import chat  # noqa: E402
+from fastapi import FastAPI  # noqa: E402
+import model_service  # noqa: E402
+from ml.answer_cache import AnswerCache  # noqa: E402
+
+# Stat lookups the fast path can answer, plus free-form ones it must not
+QUESTIONS = [
+    "How many points did {name} score?",
+    "How many touchdowns did {name} have last year?",
+    "How many rushing yards did {name} have?",
+    "How many passing yards did {name} throw for in 2024?",
+    "How many receiving yards did {name} catch?",
+    "Should I start {name} this week?",
+    "Is {name} better at rushing or receiving?",
+]
+
+
+def start_model_service():
+    server = uvicorn.Server(uvicorn.Config(model_service.app, host="127.0.0.1", port=SERVICE_PORT, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def run_mode(app, messages):
+    latencies = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://chat", timeout=60) as client:
+        for msg in messages:
+            start = time.perf_counter()
+            resp = await client.post("/chat/", json={"message": msg})
+            latencies.append(time.perf_counter() - start)
+            assert resp.status_code == 200, resp.text
+    await chat.model_client.aclose()
+    return latencies
+
+
+def run_benchmark():
+    print("⏱️ ANSWER MODE BENCHMARK (end-to-end chat latency)")
+    rag = model_service.rag
+    # Every message must render, otherwise the second mode would just hit the cache
+    sys.modules["rag_system"].answer_cache = AnswerCache(maxsize=0, db_path=None)
+    rag.load()   # the service would otherwise answer 503 while loading in the background
+    start_model_service()
+
+    app = FastAPI()
+    app.include_router(chat.router, prefix="/chat")
+    app.dependency_overrides[get_current_user] = lambda: {"user_id": "bench", "email": "bench@local"}
+
+    names = [name for name, _ in chat.PLAYER_NAME_INDEX.players[:PLAYERS]]
+    if not names:
+        print("❌ No players loaded, is DATABASE_URL set?")
+        return
+    messages = [q.format(name=n) for _ in range(ROUNDS) for n in names for q in QUESTIONS]
+
+    print(f"   {len(messages)} messages, {len(names)} players")
+    print(f"   {'mode':>7}  {'p50 ms':>8}  {'p99 ms':>8}  {'mean ms':>8}  {'skipped':>8}")
+    for mode in ("llm", "hybrid"):
+        rag.answer_mode = mode
+        rag.render_stats.clear()
+        with contextlib.redirect_stdout(io.StringIO()):   # chat logs every message
+            latencies = asyncio.run(run_mode(app, messages))
+        skipped = rag.render_snapshot()["inference_skipped_fraction"]
+        print(f"   {mode:>7}  {percentile(latencies, 50) * 1000:>8.1f}  {percentile(latencies, 99) * 1000:>8.1f}  "
+              f"{sum(latencies) / len(latencies) * 1000:>8.1f}  {skipped:>8.0%}")
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,105 @@
+import statistics
+import sys
+import time
+import numpy as np
+import pandas as pd
+from etl.scoring import STAT_COLUMNS, score_array, score_frame, score_row, weight_vector
+
+# Fantasy scoring throughput on a full season of player-weeks:
+#   apply  - the old ETL path, calculate_fantasy_points via DataFrame.apply(axis=1)
+#   frame  - etl.scoring.score_frame, one vectorized pass over the DataFrame
+#   array  - etl.scoring.score_array on a prepared NumPy matrix
+#   row    - etl.scoring.score_row per dict (the API fast path), for reference
+# Uses the 2025 player-weeks from the local PBP store when there, otherwise a
+# synthetic season of the same size.
+# Run from backend/: python bench_fantasy_scoring.py [--synthetic]
+
+RUNS = 7
+SEASON = 2025
+SYNTHETIC_ROWS = 5600   # ~ offensive player-weeks in one regular season
+
+
+def calculate_fantasy_points(row):
+    """The old per-row PPR calculation from run_etl / fix_all_stats."""
+    pass_pts = (row.get('passing_yards', 0) / 25) + (row.get('passing_tds', 0) * 4) - (row.get('interceptions', 0) * 2)
+    rush_pts = (row.get('rushing_yards', 0) / 10) + (row.get('rushing_tds', 0) * 6)
+    rec_pts = (row.get('receiving_yards', 0) / 10) + (row.get('receiving_tds', 0) * 6) + (row.get('receptions', 0) * 1)
+    fum_pts = (row.get('fumbles_lost', 0) * -2)
+    return round(pass_pts + rush_pts + rec_pts + fum_pts, 2)
+
+
+def season_player_weeks():
+    from etl.pbp_store import read_pbp
+    pbp = read_pbp(SEASON, columns=[
+        'week', 'passer_player_id', 'rusher_player_id', 'receiver_player_id', 'passing_yards', 'rushing_yards',
+        'receiving_yards', 'pass_touchdown', 'rush_touchdown', 'interception', 'fumble_lost', 'complete_pass'
+    ])
+    roles = [
+        ('passer_player_id', {'passing_yards': 'passing_yards', 'pass_touchdown': 'passing_tds', 'interception': 'interceptions'}),
+        ('rusher_player_id', {'rushing_yards': 'rushing_yards', 'rush_touchdown': 'rushing_tds', 'fumble_lost': 'fumbles_lost'}),
+        ('receiver_player_id', {'receiving_yards': 'receiving_yards', 'pass_touchdown': 'receiving_tds', 'complete_pass': 'receptions'}),
+    ]
+    parts = []
+    for id_col, stats in roles:
+        part = pbp.groupby([id_col, 'week'])[list(stats)].sum().rename(columns=stats)
+        parts.append(part.rename_axis(['gsis_id', 'week']))
+    return pd.concat(parts, axis=1).fillna(0).reset_index()
+
+
+def synthetic_player_weeks(rows=SYNTHETIC_ROWS, seed=7):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        'passing_yards': rng.integers(0, 400, rows) * (rng.random(rows) < 0.1),
+        'passing_tds': rng.integers(0, 4, rows),
+        'interceptions': rng.integers(0, 3, rows),
+        'rushing_yards': rng.integers(-5, 150, rows),
+        'rushing_tds': rng.integers(0, 3, rows),
+        'receiving_yards': rng.integers(0, 180, rows),
+        'receiving_tds': rng.integers(0, 3, rows),
+        'receptions': rng.integers(0, 12, rows),
+        'fumbles_lost': rng.integers(0, 2, rows),
+    }).astype(float)
+    df['week'] = rng.integers(1, 19, rows)
+    return df
+
+
+def timed(fn):
+    samples = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), result
+
+
+def run_benchmark(synthetic=False):
+    df = None
+    if not synthetic:
+        try:
+            df = season_player_weeks()
+            source = f"{SEASON} PBP store"
+        except Exception as e:
+            print(f"⚠️ No local {SEASON} play-by-play ({e}), using synthetic player-weeks.")
+    if df is None:
+        df = synthetic_player_weeks()
+        source = "synthetic"
+
+    print(f"⏱️ FANTASY SCORING BENCHMARK ({len(df)} player-weeks, {source}, median of {RUNS})")
+    matrix = df.reindex(columns=STAT_COLUMNS, fill_value=0).to_numpy(dtype=float)
+    records = df.to_dict("records")
+    weight_vector()   # warm the profile cache
+
+    apply_ms, expected = timed(lambda: df.apply(calculate_fantasy_points, axis=1))
+    variants = {
+        "apply": (apply_ms, expected.to_numpy()),
+        "frame": timed(lambda: score_frame(df).to_numpy()),
+        "array": timed(lambda: score_array(matrix)),
+        "row": timed(lambda: np.array([score_row(r) for r in records])),
+    }
+    for label, (ms, result) in variants.items():
+        mismatches = int((np.abs(result - expected.to_numpy()) > 1e-9).sum())
+        print(f"   {label:<6} {ms:9.2f}ms  x{apply_ms / ms:7.1f}  mismatches={mismatches}")
+
+
+if __name__ == "__main__":
+    run_benchmark(synthetic="--synthetic" in sys.argv)
@@ -0,0 +1,52 @@
+import statistics
+import time
+from sqlalchemy import text
+from database import engine, SessionLocal
+from api.routes import leaders
+from etl.leaderboards import CATEGORIES, rebuild_leaderboards
+
+# /leaders latency, live sort vs the precomputed leaderboard_snapshots.
+# One "dashboard load" = every category for one season, like the frontend.
+# "live" forces the old full-season sort, "snapshot" is the primary-key read.
+# Run from backend/: python bench_leaders.py
+
+RUNS = 100
+
+
+def timed(seasons):
+    samples = []
+    db = SessionLocal()
+    try:
+        for i in range(RUNS):
+            season = seasons[i % len(seasons)]
+            start = time.perf_counter()
+            for category in CATEGORIES:
+                leaders.get_leaders(leaders.Response(), category=category, season=season, db=db)
+            samples.append((time.perf_counter() - start) * 1000)
+    finally:
+        db.close()
+    return samples
+
+
+def report(label, samples):
+    p = statistics.quantiles(samples, n=100)
+    print(f"   {label:<20} p50={p[49]:7.2f}ms  p99={p[98]:7.2f}ms")
+
+
+def run_benchmark():
+    print(f"⏱️ LEADERS BENCHMARK ({len(CATEGORIES)} categories per dashboard load, {RUNS} loads)")
+    with engine.begin() as conn:
+        seasons = [r[0] for r in conn.execute(text("SELECT DISTINCT season FROM season_stats ORDER BY season"))]
+        rows = conn.execute(text("SELECT COUNT(*) FROM season_stats")).scalar()
+        rebuild_leaderboards(conn)
+    print(f"   {rows} season_stats rows across seasons {seasons}")
+
+    snapshot = leaders.snapshot_leaders
+    leaders.snapshot_leaders = lambda db, season, category, position, limit: []   # force the live sort
+    report("dashboard [live]", timed(seasons))
+    leaders.snapshot_leaders = snapshot
+    report("dashboard [snapshot]", timed(seasons))
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,88 @@
+import json
+import resource
+import statistics
+import subprocess
+import sys
+import time
+from bs4 import BeautifulSoup, Comment
+from etl.fetch.pfr_page import PfrPage
+
+# Parse-time and peak-memory microbenchmark for one saved PFR week page:
+#   bs4   - the previous path: BeautifulSoup(html.parser), then every HTML
+#           comment re-parsed into a fresh soup until the table id matches,
+#           once per stat table
+#   lxml  - PfrPage: one lxml parse of the page and its commented tables
+# Each variant runs in its own process so peak RSS isn't shared.
+# Run from backend/: python bench_pfr_parse.py [path/to/week.htm]
+
+PAGE = "../PlaceHolder Folder/debug_week_2024_week1.html"
+RUNS = 30
+TABLES = [
+    ["qb_stats", "passing"],
+    ["rush_stats", "rushing", "rushing_and_receiving"],
+    ["rec_stats", "receiving", "rushing_and_receiving"],
+]
+
+
+def bs4_rows(table_soup):
+    rows = []
+    tbody = table_soup.find("tbody")
+    for tr in tbody.find_all("tr") if tbody else []:
+        if "thead" in tr.get("class", []):
+            continue
+        rows.append({c.get("data-stat"): c.get_text().strip() for c in tr.find_all(["th", "td"]) if c.get("data-stat")})
+    return rows
+
+
+def parse_bs4(html):
+    soup = BeautifulSoup(html, "html.parser")
+    out = []
+    for target_ids in TABLES:
+        def find_table(s):
+            for tid in target_ids:
+                t = s.find("table", id=tid)
+                if t: return t
+            return None
+        table_soup = find_table(soup)
+        if not table_soup:
+            for c in soup.find_all(string=lambda t: isinstance(t, Comment)):
+                table_soup = find_table(BeautifulSoup(c, "html.parser"))
+                if table_soup: break
+        out.append(bs4_rows(table_soup) if table_soup else [])
+    return out
+
+
+def parse_lxml(html):
+    page = PfrPage(html)
+    return [page.table_columns(target_ids) for target_ids in TABLES]
+
+
+def run_child(variant, path):
+    html = open(path, encoding="utf-8", errors="ignore").read()
+    fn = parse_bs4 if variant == "bs4" else parse_lxml
+    base_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    samples = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        fn(html)
+        samples.append((time.perf_counter() - start) * 1000)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(json.dumps({"p50": statistics.median(samples), "min": min(samples), "peak_mb": (peak - base_rss) / 1024}))
+
+
+def run_benchmark(path):
+    print(f"⏱️ PFR PAGE PARSE BENCHMARK ({path}, {RUNS} runs, 3 stat tables)")
+    for variant in ("bs4", "lxml"):
+        proc = subprocess.run([sys.executable, __file__, "--child", variant, path], capture_output=True, text=True)
+        if proc.returncode != 0:
+            print(f"❌ {variant}: {proc.stderr.strip().splitlines()[-1]}")
+            continue
+        r = json.loads(proc.stdout.strip().splitlines()[-1])
+        print(f"   {variant:<5} p50={r['p50']:7.2f}ms  min={r['min']:7.2f}ms  peak +{r['peak_mb']:.1f}MB")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 4 and sys.argv[1] == "--child":
+        run_child(sys.argv[2], sys.argv[3])
+    else:
+        run_benchmark(sys.argv[1] if len(sys.argv) > 1 else PAGE)
@@ -0,0 +1,52 @@
+import random
+import statistics
+import time
+from sqlalchemy import text
+from database import engine, SessionLocal
+from api.routes import players
+from etl.percentiles import rebuild_percentiles
+
+# Player profile latency before/after the season_percentiles table.
+# "scan" forces the old path (every 2025 score pulled into Python and
+# counted), "table" is the index seek the ETL now sets up.
+# Run from backend/: python bench_player_profile.py
+
+RUNS = 300
+
+
+def timed(player_ids):
+    samples = []
+    db = SessionLocal()
+    try:
+        for pid in player_ids:
+            start = time.perf_counter()
+            players.get_player_profile(pid, db)
+            samples.append((time.perf_counter() - start) * 1000)
+    finally:
+        db.close()
+    return samples
+
+
+def report(label, samples):
+    p = statistics.quantiles(samples, n=100)
+    print(f"   {label:<18} p50={p[49]:7.2f}ms  p99={p[98]:7.2f}ms")
+
+
+def run_benchmark():
+    print("⏱️ PLAYER PROFILE BENCHMARK")
+    with engine.begin() as conn:
+        ids = [r[0] for r in conn.execute(text("SELECT DISTINCT gsis_id FROM season_stats WHERE season = 2025"))]
+        rows = conn.execute(text("SELECT COUNT(*) FROM season_stats WHERE season = 2025")).scalar()
+        rebuild_percentiles(conn)
+    print(f"   {rows} season_stats rows in 2025")
+    player_ids = [random.choice(ids) for _ in range(RUNS)]
+
+    indexed = players.indexed_percentile
+    players.indexed_percentile = lambda db, score, position="ALL": None   # force the old scan
+    report("profile [scan]", timed(player_ids))
+    players.indexed_percentile = indexed
+    report("profile [table]", timed(player_ids))
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,82 @@
+import random
+import statistics
+import time
+from sqlalchemy import text
+from database import engine
+from api.nlp import player_search
+
+# Compares the old `name ILIKE '%x%'` lookups with the shared player search
+# service (pg_trgm backend and the in-process fallback).
+# Run from backend/: python bench_player_search.py
+
+RUNS = 300
+
+OLD_SEARCH_SQL = text("SELECT * FROM players WHERE name ILIKE :search ORDER BY name ASC LIMIT :limit")
+OLD_FIND_SQL = text("""
+    SELECT p.gsis_id, p.name, p.position, p.team_id, s.fantasy_points
+    FROM players p
+    LEFT JOIN season_stats s ON p.gsis_id = s.gsis_id AND s.season = 2025
+    WHERE p.name ILIKE :name
+    ORDER BY s.fantasy_points DESC NULLS LAST
+    LIMIT 1
+""")
+
+
+def build_queries(names):
+    """Mix of what users type: prefixes, last names and one-letter typos."""
+    queries = []
+    for name in random.sample(names, min(RUNS, len(names))):
+        parts = name.split()
+        kind = random.choice(["prefix", "last", "typo"])
+        if kind == "prefix":
+            queries.append(name[:4])
+        elif kind == "last":
+            queries.append(parts[-1])
+        else:
+            i = random.randrange(1, len(name) - 1)
+            queries.append(name[:i] + name[i + 1:])
+    return queries
+
+
+def timed(fn, queries):
+    samples = []
+    for q in queries:
+        start = time.perf_counter()
+        fn(q)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def report(label, samples):
+    p = statistics.quantiles(samples, n=100)
+    print(f"   {label:<34} p50={p[49]:7.2f}ms  p99={p[98]:7.2f}ms")
+
+
+def run_benchmark():
+    print("⏱️ PLAYER SEARCH BENCHMARK")
+    with engine.connect() as conn:
+        names = [r[0] for r in conn.execute(text("SELECT name FROM players WHERE name IS NOT NULL"))]
+        print(f"   Roster size: {len(names)} players")
+        if len(names) < 3000:
+            print("   ⚠️ Fewer than 3k players, numbers will flatter the old queries.")
+
+        queries = build_queries(names)
+
+        report("old search (ILIKE, name ASC)",
+               timed(lambda q: conn.execute(OLD_SEARCH_SQL, {"search": f"%{q}%", "limit": 10}).all(), queries))
+        report("old find_player (ILIKE + join)",
+               timed(lambda q: conn.execute(OLD_FIND_SQL, {"name": f"%{q}%"}).first(), queries))
+
+        for backend in ("pg_trgm", "memory"):
+            if backend == "pg_trgm" and not player_search.search_index_available():
+                continue
+            player_search._backend = backend
+            player_search.search_players(conn, "warm up")
+            report(f"search_players [{backend}]",
+                   timed(lambda q: player_search.search_players(conn, q, limit=10), queries))
+            report(f"find_player [{backend}]",
+                   timed(lambda q: player_search.find_player(conn, q), queries))
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,99 @@
+import statistics
+import sys
+import time
+import numpy as np
+import pandas as pd
+from etl.team_stats import TEAM_PBP_COLUMNS, aggregate_team_pbp
+
+# Team offense/defense aggregation over one season of play-by-play:
+#   old  - fix_team_stats' previous path: one groupby of every play by defteam,
+#          another by posteam, then a merge (no points / per-game rates)
+#   new  - etl.team_stats.aggregate_team_pbp: plays summed once per game side,
+#          offense and defense folded from that (adds points, turnovers, rates)
+# Uses the 2025 season from the local PBP store when there, otherwise a
+# synthetic season (272 games, ~48k plays).
+# Run from backend/: python bench_team_stats.py [--synthetic]
+
+RUNS = 15
+SEASON = 2025
+
+
+def old_team_stats(pbp):
+    def_stats = pbp.groupby(['defteam', 'season']).agg({
+        'sack': 'sum', 'interception': 'sum', 'fumble_lost': 'sum'
+    }).reset_index().rename(columns={
+        'defteam': 'team_id', 'sack': 'def_sacks_made', 'interception': 'def_interceptions',
+        'fumble_lost': 'def_fumbles_recovered'
+    })
+    off_stats = pbp.groupby(['posteam', 'season']).agg({
+        'yards_gained': 'sum', 'touchdown': 'sum', 'sack': 'sum', 'fumble_lost': 'sum', 'interception': 'sum'
+    }).reset_index().rename(columns={
+        'posteam': 'team_id', 'yards_gained': 'off_total_yards', 'touchdown': 'off_total_tds',
+        'sack': 'off_sacks_allowed', 'fumble_lost': 'off_fumbles_lost', 'interception': 'off_interceptions'
+    })
+    return pd.merge(def_stats, off_stats, on=['team_id', 'season'], how='outer').fillna(0)
+
+
+def synthetic_season(games=272, plays_per_game=176, seed=3):
+    rng = np.random.default_rng(seed)
+    teams = [f"T{i:02d}" for i in range(32)]
+    rows = games * plays_per_game
+    game = np.repeat(np.arange(games), plays_per_game)
+    home = rng.integers(0, 32, games)
+    away = (home + rng.integers(1, 32, games)) % 32
+    home_has_ball = rng.random(rows) < 0.5
+    pos = np.where(home_has_ball, home[game], away[game])
+    dfn = np.where(home_has_ball, away[game], home[game])
+    return pd.DataFrame({
+        'season': SEASON,
+        'game_id': pd.Series(game).map(lambda g: f"{SEASON}_G{g:03d}"),
+        'posteam': np.array(teams)[pos],
+        'defteam': np.array(teams)[dfn],
+        'home_team': np.array(teams)[home[game]],
+        'home_score': rng.integers(0, 45, games)[game].astype(float),
+        'away_score': rng.integers(0, 45, games)[game].astype(float),
+        'yards_gained': rng.integers(-5, 30, rows).astype(float),
+        'touchdown': (rng.random(rows) < 0.03).astype(float),
+        'sack': (rng.random(rows) < 0.02).astype(float),
+        'interception': (rng.random(rows) < 0.01).astype(float),
+        'fumble_lost': (rng.random(rows) < 0.005).astype(float),
+    })
+
+
+def timed(fn, pbp):
+    samples = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        result = fn(pbp)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), result
+
+
+def run_benchmark(synthetic=False):
+    pbp = None
+    if not synthetic:
+        try:
+            from etl.pbp_store import read_pbp
+            pbp = read_pbp(SEASON, columns=TEAM_PBP_COLUMNS)
+            source = f"{SEASON} PBP store"
+        except Exception as e:
+            print(f"⚠️ No local {SEASON} play-by-play ({e}), using a synthetic season.")
+    if pbp is None or pbp.empty or set(TEAM_PBP_COLUMNS) - set(pbp.columns):
+        pbp = synthetic_season()
+        source = "synthetic"
+
+    print(f"⏱️ TEAM STATS BENCHMARK ({len(pbp)} plays, {source}, median of {RUNS})")
+    old_ms, old = timed(old_team_stats, pbp)
+    new_ms, new = timed(aggregate_team_pbp, pbp)
+    print(f"   old  {old_ms:8.2f}ms  {old.shape[1]} columns")
+    print(f"   new  {new_ms:8.2f}ms  {new.shape[1]} columns  x{old_ms / new_ms:.1f}")
+
+    # Parity on the columns both produce
+    merged = old.merge(new, on=['team_id', 'season'], suffixes=('_old', ''))
+    shared = [c for c in old.columns if c not in ('team_id', 'season')]
+    mismatched = [c for c in shared if not np.allclose(merged[f"{c}_old"], merged[c])]
+    print(f"   parity: {len(merged)} teams, {'all shared columns match' if not mismatched else f'mismatch in {mismatched}'}")
+
+
+if __name__ == "__main__":
+    run_benchmark(synthetic="--synthetic" in sys.argv)
@@ -0,0 +1,136 @@
+import json
+from sqlalchemy import text
+from database import engine
+from api.nlp.player_search import FIND_FUZZY_SQL, FIND_SQL, SEARCH_SQL
+from api.routes import analytics, chat, compare, draft, leaders, players, predict, teams
+from etl.leaderboards import CATEGORIES, LOOKUP_SQL as LEADERS_LOOKUP_SQL, STATUS_SQL as LEADERS_STATUS_SQL
+from etl.percentiles import LOOKUP_SQL as PERCENTILE_LOOKUP_SQL
+
+# Query-plan regression check: EXPLAINs the query behind each API route
+# against a seeded database and fails (exit 1) if any of them reads a large
+# table with a sequential scan -- i.e. an index the migrations are supposed
+# to provide is missing or no longer usable by that query.
+# The SQL is imported from the route modules, so the check can't drift from
+# what the API actually runs.
+# "bulk" queries read a whole season on purpose; their plans are printed
+# but don't fail the check.
+# Run from backend/ after seeding + python -m etl.migrate: python check_query_plans.py
+
+LARGE_TABLE_ROWS = 10_000
+
+# (route, query, bind name -> sample_params key where the names differ, bulk)
+ROUTE_QUERIES = [
+    ("GET /players/{id} profile", players.PROFILE_SQL, {"pid": "gsis_id"}, False),
+    ("GET /players/{id} history", players.HISTORY_SQL, {"pid": "gsis_id"}, False),
+    ("GET /players/{id} percentile", PERCENTILE_LOOKUP_SQL, {}, False),
+    ("GET /players/{id}/games key", players.PLAYER_KEY_SQL, {"pid": "gsis_id"}, False),
+    ("GET /players/{id}/games", players.GAMES_SQL, {"id": "player_id"}, False),
+    ("GET /players/?search (pg_trgm)", SEARCH_SQL, {}, False),
+    ("GET /predict lookup", FIND_SQL, {}, False),
+    ("GET /predict lookup (typo)", FIND_FUZZY_SQL, {}, False),
+    ("GET /predict stats", predict.STATS_SQL, {"pid": "gsis_id"}, False),
+    ("GET /compare profile", compare.PROFILE_SQL, {"pid": "player_id"}, False),
+    ("GET /compare", compare.STATS_SQL, {"pid": "player_id"}, False),
+    *[
+        (f"GET /compare-seasons ({table})", analytics.seasons_sql(table), {"pid": "player_id"}, False)
+        for table in sorted(set(analytics.TABLE_MAP.values()))
+    ],
+    ("POST /chat top players", chat.TOP_PLAYERS_SQL, {}, False),
+    ("POST /chat compare stats", chat.COMPARE_STATS_SQL, {"id1": "gsis_id", "id2": "gsis_id"}, False),
+    ("POST /chat compare players", chat.COMPARE_PLAYERS_SQL, {"id1": "gsis_id", "id2": "gsis_id"}, False),
+    ("GET /leaders snapshot", LEADERS_LOOKUP_SQL, {}, False),
+    ("GET /leaders/status", LEADERS_STATUS_SQL, {}, False),
+    ("GET /teams/{id}", teams.TEAM_BY_ID_SQL, {"tid": "team_id"}, False),
+    ("GET /teams/{name}", teams.TEAM_BY_NAME_SQL, {"tid": "team_name"}, False),
+    *[
+        (f"GET /draft ({metric})", draft.draft_sql(metric), {}, True)
+        for metric in sorted(set(draft.METRIC_MAP.values()))
+    ],
+    ("GET /leaders live fallback", leaders.live_sql(CATEGORIES["passing"], "ALL"), {}, True),
+    ("GET /leaders live fallback (position)", leaders.live_sql(CATEGORIES["passing"], "QB"), {}, True),
+]
+
+
+def sample_params(conn):
+    """Real keys from the seeded data, so the planner sees realistic selectivity."""
+    row = conn.execute(text("""
+        SELECT s.gsis_id, s.season, p.player_id, p.name
+        FROM season_stats s JOIN players p ON p.gsis_id = s.gsis_id
+        ORDER BY s.season DESC, s.fantasy_points DESC NULLS LAST LIMIT 1
+    """)).first()
+    if row is None:
+        return None
+    team = conn.execute(text(
+        "SELECT s.team_id, t.name FROM season_team_stats s LEFT JOIN teams t ON t.id = s.team_id LIMIT 1"
+    )).first()
+    week_player = conn.execute(text(
+        "SELECT player_id FROM player_week WHERE season = :season LIMIT 1"), {"season": row.season}
+    ).scalar()
+    q = (row.name or "").lower()[:4]
+    return {
+        "gsis_id": row.gsis_id, "season": int(row.season), "player_id": week_player or row.player_id,
+        "team_id": team.team_id if team else None, "team_name": team.name if team else None,
+        "category": "passing", "position": "ALL", "pos": "QB", "limit": 5, "score": 100.0,
+        "q": q, "prefix": f"{q}%", "contains": f"%{q}%",
+    }
+
+
+def seq_scans(plan):
+    """Every relation the plan reads with a Seq Scan."""
+    found = []
+    if plan.get("Node Type") == "Seq Scan":
+        found.append(plan["Relation Name"])
+    for child in plan.get("Plans", []):
+        found.extend(seq_scans(child))
+    return found
+
+
+def table_rows(conn, names):
+    rows = conn.execute(
+        text("SELECT relname, reltuples FROM pg_class WHERE relname = ANY(:names) AND relkind = 'r'"),
+        {"names": list(names)}
+    ).fetchall()
+    return {r.relname: max(r.reltuples, 0) for r in rows}
+
+
+def run_checks():
+    print(f"🔬 QUERY PLAN CHECK ({len(ROUTE_QUERIES)} route queries, large = {LARGE_TABLE_ROWS:,}+ rows)")
+    failures = []
+    with engine.connect() as conn:
+        conn.execute(text("ANALYZE"))   # fresh row counts, or the planner (and the size check) is guessing
+        params = sample_params(conn)
+        if params is None:
+            print("❌ season_stats/players are empty. Seed the database first.")
+            return 1
+
+        for name, sql, binds, bulk in ROUTE_QUERIES:
+            bound = {**params, **{bind: params[key] for bind, key in binds.items()}}
+            try:
+                raw = conn.execute(text(f"EXPLAIN (FORMAT JSON) {sql.text}"), bound).scalar()
+            except Exception as e:
+                conn.rollback()
+                print(f"   ❌ {name}: EXPLAIN failed ({str(e).splitlines()[0]})")
+                failures.append(name)
+                continue
+            plan = (raw if isinstance(raw, list) else json.loads(raw))[0]["Plan"]
+            scanned = seq_scans(plan)
+            sizes = table_rows(conn, scanned)
+            large = sorted({t for t in scanned if sizes.get(t, 0) >= LARGE_TABLE_ROWS})
+
+            if not large:
+                print(f"   ✅ {name}")
+            elif bulk:
+                print(f"   ℹ️ {name}: seq scan on {', '.join(large)} (reads a whole season)")
+            else:
+                print(f"   ❌ {name}: seq scan on {', '.join(f'{t} (~{int(sizes[t]):,} rows)' for t in large)}")
+                failures.append(name)
+
+    if failures:
+        print(f"❌ {len(failures)} route queries regressed: {', '.join(failures)}")
+        return 1
+    print("✅ Every route query is index-backed.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(run_checks())
@@ -1,5 +1,7 @@
 import os
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.orm import sessionmaker, declarative_base
 from dotenv import load_dotenv
 
@@ -15,6 +17,19 @@ engine = create_engine(DATABASE_URL, pool_pre_ping=True)
 # Create Session Factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async Engine (asyncpg) for the non-blocking chat pipeline.
+# asyncpg doesn't understand libpq's ?sslmode=..., so we hand it over as `ssl`.
+_async_url = make_url(DATABASE_URL).set(drivername="postgresql+asyncpg")
+_async_connect_args = {}
+if "sslmode" in _async_url.query:
+    _async_connect_args["ssl"] = _async_url.query["sslmode"]
+    _async_url = _async_url.difference_update_query(["sslmode"])
+
+async_engine = create_async_engine(
+    _async_url, pool_pre_ping=True, pool_size=10, max_overflow=20, connect_args=_async_connect_args
+)
+AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
+
 # Base class for models (if we need it later)
 Base = declarative_base()
 
@@ -1,3 +1,6 @@
+-- Original design sketch. The live schema is owned by backend/migrations/
+-- (applied with: cd backend && python -m etl.migrate).
+
 -- Teams table
 CREATE TABLE teams (
     team_id SERIAL PRIMARY KEY,
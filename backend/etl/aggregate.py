@@ -1,32 +1,122 @@
+import argparse
 import os
+import time
 from sqlalchemy import create_engine, text
 from dotenv import load_dotenv
+from etl.player_week import refresh_player_week
 
 load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL")
 engine = create_engine(DATABASE_URL)
 
-def run_aggregation():
-    print("🔄 Aggregating Season Stats...")
+# Weekly rows carry integer player_id / team_id / opponent_id, stamped at load
+# time through the player_ids crosswalk (etl/player_ids.py), so nothing here
+# joins on names. Every table written here comes from backend/migrations.
+#
+# Incremental by default: given (season, weeks), only players and teams that
+# appear in those weeks are re-summed (over their whole season) and upserted,
+# so a midseason run costs the same no matter how many seasons are loaded.
+# Loaders pass the player_ids they deleted from those weeks too, so a player
+# a reload dropped is re-summed (or loses a season row with nothing left under it).
+#
+# Usage (from backend/): python -m etl.aggregate [--season 2025 --weeks 7] [--full]
+
+SEASON_TABLES = {
+    "season_passing_stats": "weekly_passing_stats",
+    "season_rushing_stats": "weekly_rushing_stats",
+    "season_receiving_stats": "weekly_receiving_stats",
+}
+
+def player_scope(table, full):
+    """Extra WHERE for a player aggregate: everything, or players in the given weeks / :player_ids."""
+    if full:
+        return ""
+    return f"""AND w.season = :season AND (w.player_id = ANY(:player_ids) OR w.player_id IN (
+                SELECT player_id FROM {table} WHERE season = :season AND week = ANY(:weeks)))"""
+
+def update_all(columns):
+    """ON CONFLICT DO UPDATE SET for every aggregated column: incremental runs rely on each being refreshed."""
+    return ",\n                ".join(f"{c} = EXCLUDED.{c}" for c in columns)
+
+# A player traded mid-season has weekly rows under two teams. The season
+# tables are keyed (player_id, season), so rows are grouped on that key and
+# credited to the team of the player's latest week.
+LATEST_TEAM = "(ARRAY_AGG(w.team_id ORDER BY w.week DESC))[1]"
+
+PASSING_COLS = [
+    "team_id", "games_played", "completions", "attempts", "completion_pct",
+    "passing_yards", "passing_tds", "interceptions", "sacks", "sack_yards",
+    "passer_rating", "qbr", "longest_pass", "first_downs",
+    "fourth_qtr_comebacks", "game_winning_drives",
+]
+RUSHING_COLS = [
+    "team_id", "games_played", "carries", "rushing_yards", "rushing_tds",
+    "yards_per_carry", "rushing_yards_per_game", "longest_rush",
+]
+RECEIVING_COLS = [
+    "team_id", "games_played", "targets", "receptions", "receiving_yards", "receiving_tds",
+    "yards_per_reception", "receptions_per_game", "receiving_yards_per_game", "longest_reception",
+]
+
+def delete_orphans(conn, season_table, weekly_table, full, params):
+    """Season rows (in scope) whose player has no weekly rows left for that season."""
+    scope = "" if full else "AND s.season = :season AND s.player_id = ANY(:player_ids)"
+    return conn.execute(text(f"""
+        DELETE FROM {season_table} s
+        WHERE NOT EXISTS (SELECT 1 FROM {weekly_table} w WHERE w.player_id = s.player_id AND w.season = s.season)
+        {scope}
+    """), params).rowcount
+
+def team_scope(full):
+    """Extra WHERE for the team aggregate: everything, or the teams that played in the given weeks."""
+    if full:
+        return ""
+    return """AND w.season = :season AND side.team_id = ANY(:team_ids)
+                  AND (w.team_id = ANY(:team_ids) OR w.opponent_id = ANY(:team_ids))"""
+
+def affected_teams(conn, season, weeks):
+    """Teams that played (on either side) in the given weeks."""
+    rows = conn.execute(text("""
+        SELECT team_id FROM weekly_passing_stats WHERE season = :season AND week = ANY(:weeks)
+        UNION SELECT opponent_id FROM weekly_passing_stats WHERE season = :season AND week = ANY(:weeks)
+        UNION SELECT team_id FROM weekly_rushing_stats WHERE season = :season AND week = ANY(:weeks)
+        UNION SELECT opponent_id FROM weekly_rushing_stats WHERE season = :season AND week = ANY(:weeks)
+    """), {"season": season, "weeks": weeks}).fetchall()
+    return [r[0] for r in rows if r[0] is not None]
+
+def run_aggregation(season=None, weeks=None, full=False, player_ids=None):
+    full = full or season is None
+    weeks = list(weeks or [])
+    player_ids = sorted(player_ids or [])
+    if not full and not weeks:
+        print("⚠️ No weeks given, nothing to aggregate.")
+        return
+    scope = "all seasons" if full else f"{season} weeks {weeks}"
+    print(f"🔄 Aggregating Season Stats ({scope})...")
+    started = time.perf_counter()
     
     with engine.begin() as conn:
+        params = {} if full else {
+            "season": season, "weeks": weeks, "player_ids": player_ids,
+            "team_ids": affected_teams(conn, season, weeks),
+        }
+
+        # ---------------------------------------------------------
+        # 0. PLAYER-WEEK FACTS (passing + rushing + receiving, one row each)
+        # ---------------------------------------------------------
+        print("   > Updating player_week...")
+        rows = refresh_player_week(conn, None if full else season, weeks)
+        print(f"     {rows} player-weeks")
+
         # ---------------------------------------------------------
         # 1. AGGREGATE PASSING (Player)
         # ---------------------------------------------------------
         print("   > Updating Player Passing Totals...")
-        conn.execute(text("""
-            INSERT INTO season_passing_stats (
-                player_id, team_id, season, games_played,
-                completions, attempts, completion_pct,
-                passing_yards, passing_tds, interceptions,
-                sacks, sack_yards,
-                passer_rating, qbr,
-                longest_pass, first_downs,
-                fourth_qtr_comebacks, game_winning_drives
-            )
+        conn.execute(text(f"""
+            INSERT INTO season_passing_stats (player_id, season, {", ".join(PASSING_COLS)})
             SELECT
-                p.player_id, t.id, w.season, COUNT(DISTINCT w.week),
+                w.player_id, w.season, {LATEST_TEAM}, COUNT(DISTINCT w.week),
                 SUM(w.completions), SUM(w.attempts),
                 ROUND(SUM(w.completions)::numeric / NULLIF(SUM(w.attempts), 0), 4),
                 SUM(w.passing_yards), SUM(w.passing_tds), SUM(w.interceptions),
@@ -35,160 +125,164 @@ def run_aggregation():
                 MAX(w.longest_pass), SUM(w.first_downs),
                 SUM(w.fourth_qtr_comebacks), SUM(w.game_winning_drives)
             FROM weekly_passing_stats w
-            JOIN players p ON p.name = w.player_name
-            JOIN teams t ON t.name = w.team
-            GROUP BY p.player_id, t.id, w.season
+            WHERE w.player_id IS NOT NULL AND w.team_id IS NOT NULL
+            {player_scope("weekly_passing_stats", full)}
+            GROUP BY w.player_id, w.season
             ON CONFLICT (player_id, season) DO UPDATE SET
-                games_played = EXCLUDED.games_played,
-                passing_yards = EXCLUDED.passing_yards,
-                passing_tds = EXCLUDED.passing_tds,
-                interceptions = EXCLUDED.interceptions,
-                passer_rating = EXCLUDED.passer_rating,
-                qbr = EXCLUDED.qbr;
-        """))
+                {update_all(PASSING_COLS)};
+        """), params)
 
         # ---------------------------------------------------------
         # 2. AGGREGATE RUSHING (Player)
         # ---------------------------------------------------------
         print("   > Updating Player Rushing Totals...")
-        conn.execute(text("""
-            INSERT INTO season_rushing_stats (
-                player_id, team_id, season, games_played,
-                carries, rushing_yards, rushing_tds,
-                yards_per_carry, rushing_yards_per_game, longest_rush
-            )
+        conn.execute(text(f"""
+            INSERT INTO season_rushing_stats (player_id, season, {", ".join(RUSHING_COLS)})
             SELECT
-                p.player_id, t.id, w.season, COUNT(DISTINCT w.week),
+                w.player_id, w.season, {LATEST_TEAM}, COUNT(DISTINCT w.week),
                 SUM(w.carries), SUM(w.rushing_yards), SUM(w.rushing_tds),
                 ROUND(SUM(w.rushing_yards)::numeric / NULLIF(SUM(w.carries), 0), 2),
                 ROUND(SUM(w.rushing_yards)::numeric / COUNT(DISTINCT w.week), 1),
                 MAX(w.longest_rush)
             FROM weekly_rushing_stats w
-            JOIN players p ON p.name = w.player_name
-            JOIN teams t ON t.name = w.team
-            GROUP BY p.player_id, t.id, w.season
+            WHERE w.player_id IS NOT NULL AND w.team_id IS NOT NULL
+            {player_scope("weekly_rushing_stats", full)}
+            GROUP BY w.player_id, w.season
             ON CONFLICT (player_id, season) DO UPDATE SET
-                carries = EXCLUDED.carries,
-                rushing_yards = EXCLUDED.rushing_yards,
-                rushing_tds = EXCLUDED.rushing_tds;
-        """))
+                {update_all(RUSHING_COLS)};
+        """), params)
 
         # ---------------------------------------------------------
         # 3. AGGREGATE RECEIVING (Player)
         # ---------------------------------------------------------
         print("   > Updating Player Receiving Totals...")
-        conn.execute(text("""
-            INSERT INTO season_receiving_stats (
-                player_id, team_id, season, games_played,
-                targets, receptions, receiving_yards, receiving_tds,
-                yards_per_reception, receptions_per_game, receiving_yards_per_game,
-                longest_reception
-            )
+        conn.execute(text(f"""
+            INSERT INTO season_receiving_stats (player_id, season, {", ".join(RECEIVING_COLS)})
             SELECT
-                p.player_id, t.id, w.season, COUNT(DISTINCT w.week),
+                w.player_id, w.season, {LATEST_TEAM}, COUNT(DISTINCT w.week),
                 SUM(w.targets), SUM(w.receptions), SUM(w.receiving_yards), SUM(w.receiving_tds),
                 ROUND(SUM(w.receiving_yards)::numeric / NULLIF(SUM(w.receptions), 0), 2),
                 ROUND(SUM(w.receptions)::numeric / COUNT(DISTINCT w.week), 1),
                 ROUND(SUM(w.receiving_yards)::numeric / COUNT(DISTINCT w.week), 1),
                 MAX(w.longest_reception)
             FROM weekly_receiving_stats w
-            JOIN players p ON p.name = w.player_name
-            JOIN teams t ON t.name = w.team
-            GROUP BY p.player_id, t.id, w.season
+            WHERE w.player_id IS NOT NULL AND w.team_id IS NOT NULL
+            {player_scope("weekly_receiving_stats", full)}
+            GROUP BY w.player_id, w.season
             ON CONFLICT (player_id, season) DO UPDATE SET
-                receptions = EXCLUDED.receptions,
-                receiving_yards = EXCLUDED.receiving_yards,
-                receiving_tds = EXCLUDED.receiving_tds;
-        """))
+                {update_all(RECEIVING_COLS)};
+        """), params)
+
+        # Players a reload removed entirely: their season row has nothing left to sum
+        removed = sum(delete_orphans(conn, season_table, weekly_table, full, params)
+                      for season_table, weekly_table in SEASON_TABLES.items())
+        if removed:
+            print(f"     Removed {removed} player season rows with no weekly rows left")
 
         # ---------------------------------------------------------
         # 4. AGGREGATE TEAM STATS (Offense & Defense) - NEW!
         # ---------------------------------------------------------
         print("   > Updating Team Offense & Defense Totals...")
         
-        # We use a CTE (Common Table Expression) to calculate Offense and Defense separately
-        # then join them together to insert into the main table.
-        conn.execute(text("""
+        # One scan per weekly table: every row is counted twice through a
+        # LATERAL (team, is_offense) pair -- for its team's offense and for
+        # its opponent's defense -- and FILTER splits the sums.
+        # This path owns the yard/TD/sack splits; points, fumbles and turnovers
+        # need PBP and belong to fix_team_stats.py (see etl/team_stats.PBP_COLUMNS).
+        conn.execute(text(f"""
             INSERT INTO season_team_stats (
                 team_id, season, 
                 off_games_played, off_passing_yards, off_rushing_yards, off_total_yards, 
                 off_passing_tds, off_rushing_tds, off_interceptions_thrown,
                 def_passing_yards_allowed, def_rushing_yards_allowed, def_total_yards_allowed,
-                def_passing_tds_allowed, def_rushing_tds_allowed, def_sacks_made
+                def_passing_tds_allowed, def_rushing_tds_allowed, def_sacks_made,
+                off_yards_per_game, def_yards_allowed_per_game
             )
-            WITH team_offense AS (
-                -- Sum up stats for the team's OWN players
+            WITH passing AS (
                 SELECT 
-                    t.id as team_id, w.season,
-                    COUNT(DISTINCT w.week) as games,
-                    SUM(w.passing_yards) as pass_yds,
-                    SUM(w.passing_tds) as pass_tds,
-                    SUM(w.interceptions) as ints,
-                    SUM(w.sacks) as sacks_allowed -- Sacks allowed BY offense
+                    side.team_id, w.season,
+                    COUNT(DISTINCT w.week) FILTER (WHERE side.is_offense) as games,
+                    SUM(w.passing_yards) FILTER (WHERE side.is_offense) as pass_yds,
+                    SUM(w.passing_tds) FILTER (WHERE side.is_offense) as pass_tds,
+                    SUM(w.interceptions) FILTER (WHERE side.is_offense) as ints,
+                    COUNT(DISTINCT w.week) FILTER (WHERE NOT side.is_offense) as def_games,
+                    SUM(w.passing_yards) FILTER (WHERE NOT side.is_offense) as pass_yds_allowed,
+                    SUM(w.passing_tds) FILTER (WHERE NOT side.is_offense) as pass_tds_allowed,
+                    SUM(w.sacks) FILTER (WHERE NOT side.is_offense) as sacks_made -- Sacks made BY defense
                 FROM weekly_passing_stats w
-                JOIN teams t ON t.name = w.team
-                GROUP BY t.id, w.season
+                CROSS JOIN LATERAL (VALUES (w.team_id, TRUE), (w.opponent_id, FALSE)) AS side(team_id, is_offense)
+                WHERE side.team_id IS NOT NULL {team_scope(full)}
+                GROUP BY side.team_id, w.season
             ),
-            team_rushing_offense AS (
-                 SELECT 
-                    t.id as team_id, w.season,
-                    SUM(w.rushing_yards) as rush_yds,
-                    SUM(w.rushing_tds) as rush_tds
-                FROM weekly_rushing_stats w
-                JOIN teams t ON t.name = w.team
-                GROUP BY t.id, w.season
-            ),
-            team_defense_pass AS (
-                -- Sum up stats where this team was the OPPONENT
+            rushing AS (
                 SELECT 
-                    t.id as team_id, w.season,
-                    SUM(w.passing_yards) as pass_yds_allowed,
-                    SUM(w.passing_tds) as pass_tds_allowed,
-                    SUM(w.sacks) as sacks_made -- Sacks made BY defense
-                FROM weekly_passing_stats w
-                JOIN teams t ON t.name = w.opponent -- JOIN ON OPPONENT
-                GROUP BY t.id, w.season
+                    side.team_id, w.season,
+                    SUM(w.rushing_yards) FILTER (WHERE side.is_offense) as rush_yds,
+                    SUM(w.rushing_tds) FILTER (WHERE side.is_offense) as rush_tds,
+                    SUM(w.rushing_yards) FILTER (WHERE NOT side.is_offense) as rush_yds_allowed,
+                    SUM(w.rushing_tds) FILTER (WHERE NOT side.is_offense) as rush_tds_allowed
+                FROM weekly_rushing_stats w
+                CROSS JOIN LATERAL (VALUES (w.team_id, TRUE), (w.opponent_id, FALSE)) AS side(team_id, is_offense)
+                WHERE side.team_id IS NOT NULL {team_scope(full)}
+                GROUP BY side.team_id, w.season
             ),
-            team_defense_rush AS (
+            totals AS (
                 SELECT 
-                    t.id as team_id, w.season,
-                    SUM(w.rushing_yards) as rush_yds_allowed,
-                    SUM(w.rushing_tds) as rush_tds_allowed
-                FROM weekly_rushing_stats w
-                JOIN teams t ON t.name = w.opponent -- JOIN ON OPPONENT
-                GROUP BY t.id, w.season
+                    p.*, r.rush_yds, r.rush_tds, r.rush_yds_allowed, r.rush_tds_allowed,
+                    (COALESCE(p.pass_yds,0) + COALESCE(r.rush_yds,0)) as total_yards,
+                    (COALESCE(p.pass_yds_allowed,0) + COALESCE(r.rush_yds_allowed,0)) as total_allowed
+                FROM passing p
+                LEFT JOIN rushing r ON p.team_id = r.team_id AND p.season = r.season
+                WHERE p.games > 0 -- teams with their own passing rows, as before
             )
             SELECT 
-                o.team_id, o.season,
-                o.games,
-                o.pass_yds,
-                ro.rush_yds,
-                (COALESCE(o.pass_yds,0) + COALESCE(ro.rush_yds,0)) as total_yards,
-                o.pass_tds,
-                ro.rush_tds,
-                o.ints,
+                team_id, season,
+                games,
+                pass_yds,
+                rush_yds,
+                total_yards,
+                pass_tds,
+                rush_tds,
+                ints,
                 
-                dp.pass_yds_allowed,
-                dr.rush_yds_allowed,
-                (COALESCE(dp.pass_yds_allowed,0) + COALESCE(dr.rush_yds_allowed,0)) as total_allowed,
-                dp.pass_tds_allowed,
-                dr.rush_tds_allowed,
-                dp.sacks_made
+                pass_yds_allowed,
+                rush_yds_allowed,
+                total_allowed,
+                pass_tds_allowed,
+                rush_tds_allowed,
+                sacks_made,
+
+                ROUND(total_yards::numeric / games, 1),
+                ROUND(total_allowed::numeric / NULLIF(def_games, 0), 1)
                 
-            FROM team_offense o
-            LEFT JOIN team_rushing_offense ro ON o.team_id = ro.team_id AND o.season = ro.season
-            LEFT JOIN team_defense_pass dp ON o.team_id = dp.team_id AND o.season = dp.season
-            LEFT JOIN team_defense_rush dr ON o.team_id = dr.team_id AND o.season = dr.season
+            FROM totals
             
             ON CONFLICT (team_id, season) DO UPDATE SET
+                off_games_played = EXCLUDED.off_games_played,
                 off_total_yards = EXCLUDED.off_total_yards,
                 off_passing_yards = EXCLUDED.off_passing_yards,
                 off_rushing_yards = EXCLUDED.off_rushing_yards,
+                off_passing_tds = EXCLUDED.off_passing_tds,
+                off_rushing_tds = EXCLUDED.off_rushing_tds,
+                off_interceptions_thrown = EXCLUDED.off_interceptions_thrown,
+                def_passing_yards_allowed = EXCLUDED.def_passing_yards_allowed,
+                def_rushing_yards_allowed = EXCLUDED.def_rushing_yards_allowed,
                 def_total_yards_allowed = EXCLUDED.def_total_yards_allowed,
-                def_sacks_made = EXCLUDED.def_sacks_made;
-        """))
+                def_passing_tds_allowed = EXCLUDED.def_passing_tds_allowed,
+                def_rushing_tds_allowed = EXCLUDED.def_rushing_tds_allowed,
+                def_sacks_made = EXCLUDED.def_sacks_made,
+                off_yards_per_game = EXCLUDED.off_yards_per_game,
+                def_yards_allowed_per_game = EXCLUDED.def_yards_allowed_per_game;
+        """), params)
 
-    print("✅ Season Aggregation Complete!")
+    print(f"✅ Season Aggregation Complete! ({time.perf_counter() - started:.2f}s)")
 
 if __name__ == "__main__":
-    run_aggregation()
\ No newline at end of file
+    from etl.backfill import parse_weeks
+    from etl.config import CURRENT_SEASON, CURRENT_WEEK
+    parser = argparse.ArgumentParser(description="Aggregate weekly stats into season tables")
+    parser.add_argument("--season", type=int, default=CURRENT_SEASON)
+    parser.add_argument("--weeks", default=str(CURRENT_WEEK), help="e.g. 7, 1-18 or 3,4,7")
+    parser.add_argument("--full", action="store_true", help="rebuild every season from scratch")
+    args = parser.parse_args()
+    run_aggregation(args.season, parse_weeks(args.weeks), full=args.full)
\ No newline at end of file
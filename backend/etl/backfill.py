@@ -0,0 +1,110 @@
+# backend/etl/backfill.py
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from etl.fetch.pfr_week import fetch_week_tables
+from etl.fetch.http import REQUESTS_PER_MINUTE
+from etl.transform.passing import normalize_passing
+from etl.transform.rushing import normalize_rushing
+from etl.transform.receiving import normalize_receiving
+
+# Backfills a range of PFR weeks. Downloads run one at a time on the main
+# thread, paced only by the per-host token bucket in etl/fetch/http.py.
+# Transforming, writing data/clean CSVs and loading the DB happen on worker
+# threads while the next page downloads, so a cold backfill runs at the host's
+# request limit. Cached weeks don't wait on the limiter at all.
+#
+# Usage (from backend/): python -m etl.backfill 2024 --weeks 1-18
+
+CLEAN_DIR = Path("data/clean")
+
+STAGES = {
+    "passing": (normalize_passing, "weekly_passing_stats"),
+    "rushing": (normalize_rushing, "weekly_rushing_stats"),
+    "receiving": (normalize_receiving, "weekly_receiving_stats"),
+}
+
+def process_week(season: int, week: int, tables: dict, load: bool = True):
+    """Transform + save + load one downloaded week. Returns (rows per table, player_ids the load removed)."""
+    CLEAN_DIR.mkdir(parents=True, exist_ok=True)
+    counts = {}
+    removed = set()
+    for kind, df in tables.items():
+        if df is None or df.empty:
+            counts[kind] = 0
+            continue
+        normalize, table_name = STAGES[kind]
+        clean = normalize(df, season, week)
+        path = CLEAN_DIR / f"{season}_week{week}_{kind}.csv"
+        clean.to_csv(path, index=False)
+        if load:
+            from etl.load_stats import load_csv   # connects on import, so only when loading
+            removed |= load_csv(path, table_name)
+        counts[kind] = len(clean)
+    return counts, removed
+
+def backfill(season: int, weeks, workers: int = 3, load: bool = True):
+    print(f"🚚 BACKFILL: {season} weeks {weeks[0]}-{weeks[-1]} "
+          f"({REQUESTS_PER_MINUTE:.0f} req/min to PFR, {workers} processing workers)")
+    started = time.perf_counter()
+    download_seconds = 0.0
+    failed = []
+    removed = set()   # player_ids whose old rows the loads deleted
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {}
+        for week in weeks:
+            # 1. DOWNLOAD (rate limited, cached pages return immediately)
+            t0 = time.perf_counter()
+            try:
+                tables = fetch_week_tables(season, week)
+            except Exception as e:
+                print(f"❌ Week {week} download failed: {e}")
+                failed.append(week)
+                continue
+            download_seconds += time.perf_counter() - t0
+
+            # 2. TRANSFORM + LOAD in the background while the next week downloads
+            futures[week] = pool.submit(process_week, season, week, tables, load)
+
+        for week, future in futures.items():
+            try:
+                counts, week_removed = future.result()
+                removed |= week_removed
+                print(f"   ✅ Week {week}: {counts}")
+            except Exception as e:
+                print(f"❌ Week {week} processing failed: {e}")
+                failed.append(week)
+
+    elapsed = time.perf_counter() - started
+    done = len(weeks) - len(failed)
+    rate = done / (elapsed / 60) if elapsed else 0.0
+    print(f"🏁 {done}/{len(weeks)} weeks in {elapsed:.1f}s ({rate:.1f} weeks/min, "
+          f"{download_seconds:.1f}s waiting on downloads)")
+    if failed:
+        print(f"⚠️ Failed weeks: {sorted(failed)}")
+
+    # 3. Re-aggregate only the players/teams in the weeks we just loaded,
+    #    plus the players those weeks used to have
+    loaded = [w for w in weeks if w not in failed]
+    if load and loaded:
+        from etl.aggregate import run_aggregation   # connects on import, so only when loading
+        run_aggregation(season, loaded, player_ids=removed)
+    return failed
+
+def parse_weeks(value: str):
+    if "-" in value:
+        start, end = value.split("-")
+        return list(range(int(start), int(end) + 1))
+    return [int(w) for w in value.split(",")]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backfill PFR weekly stats")
+    parser.add_argument("season", type=int)
+    parser.add_argument("--weeks", default="1-18", help="e.g. 1-18 or 3,4,7")
+    parser.add_argument("--workers", type=int, default=3)
+    parser.add_argument("--no-load", action="store_true", help="only write data/clean CSVs")
+    args = parser.parse_args()
+    failed = backfill(args.season, parse_weeks(args.weeks), workers=args.workers, load=not args.no_load)
+    raise SystemExit(1 if failed else 0)
@@ -0,0 +1,124 @@
+# backend/etl/bulk_load.py
+import io
+import time
+import pandas as pd
+from sqlalchemy import inspect, text
+
+# Bulk DataFrame -> Postgres loader used by every ETL entry point.
+# Rows go over the wire with COPY FROM STDIN (CSV), in chunks, instead of
+# one INSERT per row / batch that to_sql generates:
+#   mode="append"  - COPY straight into the table
+#   mode="reload"  - TRUNCATE + COPY, keeping the migrated schema and its indexes
+#   mode="upsert"  - COPY into a temp staging table, then one
+#                    INSERT ... SELECT ... ON CONFLICT (key_cols) DO UPDATE
+#                    (key_cols must match a unique index from backend/migrations)
+# Everything runs on the caller's connection/transaction, so a load commits
+# (or rolls back) together with the deletes and state updates around it.
+# The target table must already exist (python -m etl.migrate); a missing one
+# is an error rather than a table guessed from the frame's dtypes.
+
+CHUNK_ROWS = 50_000
+MODES = ("append", "reload", "upsert")
+INTEGER_TYPES = {"smallint", "integer", "bigint"}
+
+
+def _q(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+def table_exists(conn, table_name):
+    return inspect(conn).has_table(table_name)
+
+
+def require_table(conn, table_name):
+    """Tables come from backend/migrations; loaders never invent a schema from a frame."""
+    if not table_exists(conn, table_name):
+        raise RuntimeError(f"Table {table_name} does not exist. Run `python -m etl.migrate` from backend/ first.")
+
+
+def _column_types(conn, table_name):
+    rows = conn.execute(
+        text("""
+            SELECT column_name, data_type FROM information_schema.columns
+            WHERE table_schema = current_schema() AND table_name = :t
+        """),
+        {"t": table_name}
+    ).fetchall()
+    return {r.column_name: r.data_type for r in rows}
+
+
+def _conform(df, column_types):
+    """
+    Keeps only columns the table has and turns whole-number floats into ints
+    for integer columns (pandas makes them float as soon as a NaN shows up,
+    and COPY won't read "3.0" into a BIGINT).
+    """
+    dropped = [c for c in df.columns if c not in column_types]
+    if dropped:
+        print(f"   ⚠️ No column for {', '.join(map(str, dropped[:10]))}{' ...' if len(dropped) > 10 else ''} (not loaded)")
+    df = df[[c for c in df.columns if c in column_types]]
+    for col in df.columns:
+        if column_types[col] in INTEGER_TYPES and pd.api.types.is_float_dtype(df[col]):
+            df = df.assign(**{col: df[col].round().astype("Int64")})
+    return df
+
+
+def _copy(conn, df, table_name):
+    """Streams df into table_name with COPY ... FROM STDIN, CHUNK_ROWS at a time."""
+    columns = ", ".join(_q(c) for c in df.columns)
+    sql = f"COPY {_q(table_name)} ({columns}) FROM STDIN WITH (FORMAT csv, NULL '\\N')"
+    cursor = conn.connection.cursor()
+    try:
+        for start in range(0, len(df), CHUNK_ROWS):
+            buf = io.StringIO()
+            df.iloc[start:start + CHUNK_ROWS].to_csv(buf, index=False, header=False, na_rep="\\N")
+            buf.seek(0)
+            cursor.copy_expert(sql, buf)
+    finally:
+        cursor.close()
+
+
+def _merge(conn, df, table_name, key_cols):
+    stage = f"_stage_{table_name}"
+    conn.execute(text(f"DROP TABLE IF EXISTS {_q(stage)}"))
+    conn.execute(text(f"CREATE TEMP TABLE {_q(stage)} (LIKE {_q(table_name)} INCLUDING DEFAULTS) ON COMMIT DROP"))
+    _copy(conn, df, stage)
+
+    cols = ", ".join(_q(c) for c in df.columns)
+    keys = ", ".join(_q(c) for c in key_cols)
+    updates = ", ".join(f"{_q(c)} = EXCLUDED.{_q(c)}" for c in df.columns if c not in key_cols)
+    # DISTINCT ON: ON CONFLICT can't touch the same target row twice in one statement
+    conn.execute(text(f"""
+        INSERT INTO {_q(table_name)} ({cols})
+        SELECT DISTINCT ON ({keys}) {cols} FROM {_q(stage)}
+        ON CONFLICT ({keys}) DO {'UPDATE SET ' + updates if updates else 'NOTHING'}
+    """))
+    conn.execute(text(f"DROP TABLE {_q(stage)}"))
+
+
+def bulk_load(conn, df, table_name, mode="append", key_cols=None):
+    """
+    Loads df into table_name on `conn` and reports rows/sec. Returns rows loaded.
+    The table must already exist: its schema (keys, indexes) comes from backend/migrations.
+    """
+    if mode not in MODES:
+        raise ValueError(f"unknown bulk_load mode {mode!r} (one of {', '.join(MODES)})")
+    started = time.perf_counter()
+    df = df.reset_index(drop=True)
+
+    require_table(conn, table_name)
+    if mode == "reload":
+        conn.execute(text(f"TRUNCATE {_q(table_name)}"))
+    df = _conform(df, _column_types(conn, table_name))
+
+    if mode == "upsert":
+        if not key_cols:
+            raise ValueError("upsert needs key_cols")
+        _merge(conn, df, table_name, key_cols)
+    else:
+        _copy(conn, df, table_name)
+
+    elapsed = time.perf_counter() - started
+    rate = len(df) / elapsed if elapsed else 0.0
+    print(f"   📦 {table_name}: {len(df)} rows {mode} in {elapsed:.2f}s ({rate:,.0f} rows/s)")
+    return len(df)
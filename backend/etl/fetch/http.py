@@ -1,7 +1,10 @@
 # backend/etl/fetch/http.py
+import os
 import requests
 import time
 import random
+import threading
+from urllib.parse import urlparse
 
 # 1. Define "Disguise" Headers
 # This tells the website: "I am a Windows 10 PC using Chrome, not a python script."
@@ -13,25 +16,85 @@ HEADERS = {
     "Upgrade-Insecure-Requests": "1",
 }
 
-# 2. Add delays to be polite
-REQUEST_DELAY = 4  # Seconds to wait between requests (PFR asks for at least 3s)
+# 2. Stay inside PFR's crawl budget (they ask for at least 3s between requests).
+# One token bucket per host, shared by every thread, replaces the fixed
+# sleep before each request: cached pages don't spend a token at all.
+REQUESTS_PER_MINUTE = float(os.getenv("PFR_REQUESTS_PER_MINUTE", "12"))
+MAX_RETRIES = 4
+BACKOFF_BASE = 5      # seconds, doubled per retry
+BACKOFF_CAP = 120
+
+class TokenBucket:
+    """Blocking token bucket: `rate` tokens per second, at most `capacity` saved up."""
+
+    def __init__(self, rate: float, capacity: float = 1):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Takes one token, sleeping until one is available. Returns the seconds waited."""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        # The token is already ours (balance may be negative), later callers queue up behind us
+        if wait:
+            time.sleep(wait)
+        return wait
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+def limiter_for(url: str) -> TokenBucket:
+    host = urlparse(url).netloc
+    with _limiters_lock:
+        if host not in _limiters:
+            _limiters[host] = TokenBucket(REQUESTS_PER_MINUTE / 60)
+        return _limiters[host]
+
+def _backoff(attempt: int, response=None) -> float:
+    retry_after = response.headers.get("Retry-After") if response is not None else None
+    if retry_after and retry_after.isdigit():
+        return min(BACKOFF_CAP, float(retry_after))
+    # Exponential with full jitter: 0-5s, 0-10s, 0-20s, ...
+    return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt))
+
+def fetch(url: str, headers: dict = None) -> requests.Response:
+    """
+    Fetches a URL with a browser-like User-Agent and returns the response.
+    Extra headers (e.g. If-None-Match) are sent as-is, so a 304 comes back untouched.
+    429s, 5xx and connection errors are retried with backoff, up to MAX_RETRIES times.
+    """
+    limiter = limiter_for(url)
+    for attempt in range(MAX_RETRIES + 1):
+        limiter.acquire()
+        print(f"    ☁️ Fetching: {url} ...")
+        response = None
+        try:
+            response = requests.get(url, headers={**HEADERS, **(headers or {})}, timeout=15)
+            if response.status_code != 429 and response.status_code < 500:
+                response.raise_for_status() # Raise error if 403 (Forbidden) or 404
+                return response
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            print(f"    ⚠️ Network error: {e}")
+
+        if attempt == MAX_RETRIES:
+            if response is not None:
+                response.raise_for_status()
+            raise requests.exceptions.RetryError(f"Gave up on {url} after {MAX_RETRIES} retries")
+
+        delay = _backoff(attempt, response)
+        status = response.status_code if response is not None else "network"
+        print(f"    ⏳ {status}, retrying in {delay:.0f}s ({attempt + 1}/{MAX_RETRIES})...")
+        time.sleep(delay)
 
 def get(url: str) -> str:
     """
     Fetches the HTML content of a URL with a browser-like User-Agent.
     """
-    print(f"    ☁️ Fetching: {url} ...")
-    time.sleep(REQUEST_DELAY + random.random()) # Sleep 4-5 seconds
-    
-    try:
-        response = requests.get(url, headers=HEADERS, timeout=15)
-        response.raise_for_status() # Raise error if 403 (Forbidden) or 404
-        return response.text
-        
-    except requests.exceptions.HTTPError as e:
-        if response.status_code == 429:
-            print("    ⏳ Rate limited! Waiting 30 seconds...")
-            time.sleep(30)
-            return get(url) # Retry once
-        else:
-            raise e
\ No newline at end of file
+    return fetch(url).text
\ No newline at end of file
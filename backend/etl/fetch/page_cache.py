@@ -0,0 +1,97 @@
+# backend/etl/fetch/page_cache.py
+import hashlib
+import json
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+from . import http
+
+# Raw HTML cache for PFR pages, under data/raw/html:
+#   index/<sha1(url)>.json   -> url, etag, last_modified, fetched_at, sha256
+#   objects/<sha256>.html    -> the page body (content-addressed, identical pages stored once)
+# A page younger than its TTL is served from disk without touching the network.
+# An older one is revalidated with If-None-Match / If-Modified-Since, so an
+# unchanged page costs a 304 instead of a full download.
+
+CACHE_DIR = Path(os.getenv("PFR_CACHE_DIR", "data/raw/html"))
+PAGE_TTL = float(os.getenv("PFR_PAGE_TTL_HOURS", "12")) * 3600
+
+
+def season_is_final(season, today=None):
+    """A season's pages stop changing once the playoffs are over (March)."""
+    today = today or datetime.now()
+    return (today.year, today.month) >= (season + 1, 3)
+
+
+def _index_path(url):
+    return CACHE_DIR / "index" / f"{hashlib.sha1(url.encode()).hexdigest()}.json"
+
+
+def _object_path(digest):
+    return CACHE_DIR / "objects" / f"{digest}.html"
+
+
+def _read(url):
+    index = _index_path(url)
+    if not index.exists():
+        return None, None
+    meta = json.loads(index.read_text())
+    body_path = _object_path(meta["sha256"])
+    if not body_path.exists():
+        return None, None
+    return meta, body_path.read_text(encoding="utf-8")
+
+
+def _write(url, body, etag=None, last_modified=None):
+    digest = hashlib.sha256(body.encode("utf-8")).hexdigest()
+    body_path = _object_path(digest)
+    if not body_path.exists():
+        body_path.parent.mkdir(parents=True, exist_ok=True)
+        body_path.write_text(body, encoding="utf-8")
+    meta = {
+        "url": url,
+        "etag": etag,
+        "last_modified": last_modified,
+        "fetched_at": time.time(),
+        "sha256": digest,
+    }
+    index = _index_path(url)
+    index.parent.mkdir(parents=True, exist_ok=True)
+    index.write_text(json.dumps(meta))
+    return meta
+
+
+def get_cached(url, ttl=PAGE_TTL):
+    """
+    Returns the page HTML, from disk when possible.
+    ttl=None means the page never goes stale (finished seasons).
+    """
+    meta, body = _read(url)
+
+    # 1. FRESH HIT: no network at all
+    if meta and (ttl is None or time.time() - meta["fetched_at"] < ttl):
+        print(f"    💾 Cached: {url}")
+        return body
+
+    # 2. STALE HIT: ask the server whether it changed
+    headers = {}
+    if meta:
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+
+    response = http.fetch(url, headers=headers)
+    if response.status_code == 304 and meta:
+        _write(url, body, meta.get("etag"), meta.get("last_modified"))   # bump fetched_at
+        return body
+
+    # 3. MISS / CHANGED: store the new body
+    _write(url, response.text, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+    return response.text
+
+
+def get_week_page(url, season):
+    """Weekly pages of finished seasons are cached forever, the current season for PAGE_TTL."""
+    return get_cached(url, ttl=None if season_is_final(season) else PAGE_TTL)
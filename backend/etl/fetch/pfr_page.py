@@ -0,0 +1,100 @@
+# backend/etl/fetch/pfr_page.py
+import lxml.etree
+import lxml.html
+import pandas as pd
+
+def stat_or_zero(df, column):
+    """A stat column with missing cells (or a missing column) read as "0", for row filters."""
+    if column not in df.columns:
+        return pd.Series("0", index=df.index)
+    return df[column].fillna("0")
+
+class PfrPage:
+    """
+    One PFR page, parsed once with lxml.
+    PFR hides most stat tables inside HTML comments, so we also parse every
+    comment that contains a <table> (once) and index all tables by id.
+    Tables in the live DOM win over commented-out copies, same as before.
+    """
+
+    def __init__(self, html: str):
+        self.root = lxml.html.fromstring(html)
+        self.dom_tables = {t.get("id"): t for t in self.root.iter("table") if t.get("id")}
+        self.comment_tables = {}
+        for comment in self.root.iter(lxml.etree.Comment):
+            text_val = comment.text or ""
+            if "<table" not in text_val:
+                continue
+            for fragment in lxml.html.fragments_fromstring(text_val):
+                if not hasattr(fragment, "iter"):
+                    continue   # stray text between tags
+                for t in fragment.iter("table"):
+                    if t.get("id"):
+                        self.comment_tables.setdefault(t.get("id"), t)
+
+    def find_table(self, target_ids):
+        """First matching id in the live DOM, then in the comments."""
+        for tables in (self.dom_tables, self.comment_tables):
+            for tid in target_ids:
+                if tid in tables:
+                    return tables[tid]
+        return None
+
+    def table_columns(self, target_ids):
+        """
+        Reads a table's body rows by `data-stat` into columns:
+        {stat: [value per row]}, plus a pfr_player_id column.
+        Returns None if the page has no such table.
+        """
+        table = self.find_table(target_ids)
+        if table is None:
+            return None
+
+        tbody = next(table.iter("tbody"), None)
+        if tbody is None:
+            return {}
+
+        columns = {}
+        n_rows = 0
+        for tr in tbody.iter("tr"):
+            if "thead" in (tr.get("class") or "").split():
+                continue
+
+            seen = False
+            for cell in tr.iter("th", "td"):
+                stat_name = cell.get("data-stat")
+                if not stat_name:
+                    continue
+                seen = True
+                self._set(columns, stat_name, n_rows, cell.text_content().strip())
+
+                # Extract PFR ID
+                if stat_name == "player":
+                    pfr_id = cell.get("data-append-csv")
+                    link = next(cell.iter("a"), None)
+                    if not pfr_id and link is not None:
+                        pfr_id = link.get("href").split("/")[-1].replace(".htm", "")
+                    self._set(columns, "pfr_player_id", n_rows, pfr_id)
+
+            if not seen:
+                continue   # no data-stat cells at all (spacer rows)
+            n_rows += 1
+            for values in columns.values():
+                if len(values) < n_rows:
+                    values.append(None)
+
+        return columns
+
+    @staticmethod
+    def _set(columns, stat_name, row, value):
+        values = columns.setdefault(stat_name, [None] * row)
+        if len(values) > row:
+            values[row] = value   # repeated data-stat in one row: last one wins, like the old dicts
+        else:
+            values.append(value)
+
+    def table_frame(self, target_ids):
+        columns = self.table_columns(target_ids)
+        if columns is None:
+            return None
+        return pd.DataFrame(columns)
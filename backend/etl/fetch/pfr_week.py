@@ -0,0 +1,21 @@
+# backend/etl/fetch/pfr_week.py
+from .page_cache import get_week_page
+from .pfr_page import PfrPage
+from .pfr_urls import weekly_passing_url
+from .pfr_weekly import parse_passing_week
+from .pfr_rushing import parse_rushing_week
+from .pfr_receiving import parse_receiving_week
+
+def fetch_week_tables(season: int, week: int) -> dict:
+    """
+    Fetch passing, rushing and receiving stats for one week.
+    PFR puts all three tables on the same page, so we download (or read from
+    the cache) and parse it once (comments included) instead of once per stat type.
+    """
+    html = get_week_page(weekly_passing_url(season, week), season)
+    page = PfrPage(html)
+    return {
+        "passing": parse_passing_week(page, season, week),
+        "rushing": parse_rushing_week(page, season, week),
+        "receiving": parse_receiving_week(page, season, week),
+    }
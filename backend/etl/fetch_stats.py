@@ -2,7 +2,9 @@ import requests
 
 # backend/etl/fetch_stats.py
 import pandas as pd
+from io import StringIO
 from pathlib import Path
+from etl.fetch.page_cache import get_week_page
 
 BASE_URL = "https://www.pro-football-reference.com/years/{season}/week_{week}.htm"
 RAW_DIR = Path("data/raw")
@@ -12,7 +14,7 @@ RAW_DIR.mkdir(parents=True, exist_ok=True)
 def fetch_week(season: int, week: int) -> dict:
     url = BASE_URL.format(season=season, week=week)
 
-    tables = pd.read_html(url)
+    tables = pd.read_html(StringIO(get_week_page(url, season)))
     return {
         "passing": tables[0],
         "rushing": tables[1],
@@ -0,0 +1,110 @@
+import time
+from sqlalchemy import text
+
+# Top-N leaderboards per (season, category, position), materialized at the end
+# of every ETL run so /leaders is a primary-key range read instead of sorting
+# the whole season_stats x players join on every dashboard load.
+# position 'ALL' is the overall board. The latest refresh is kept in
+# leaderboard_refreshes (one row) so the API can report how old the boards are.
+# Both tables live in migrations/0004_etl_tables.sql.
+
+TOP_N = 25
+
+# category -> season_stats column (same mapping /leaders always used)
+CATEGORIES = {
+    "passing": "passing_yards",
+    "rushing": "rushing_yards",
+    "receiving": "receiving_yards",
+    "fantasy": "fantasy_points",
+}
+
+_values = ",\n                ".join(f"('{cat}', COALESCE(s.{col}, 0))" for cat, col in CATEGORIES.items())
+
+# NULL stats count as 0, same as the old live query; ties broken by name
+REBUILD_SQL = text(f"""
+    INSERT INTO leaderboard_snapshots (season, category, position, rank, gsis_id, name, team_id, value, headshot_url)
+    WITH long AS (
+        SELECT s.season, c.category, COALESCE(p.position, 'UNK') AS position,
+               s.gsis_id, p.name, p.team_id, p.headshot_url, c.value
+        FROM season_stats s
+        JOIN players p ON s.gsis_id = p.gsis_id
+        CROSS JOIN LATERAL (VALUES
+                {_values}
+        ) AS c(category, value)
+    ),
+    scoped AS (
+        SELECT season, category, 'ALL' AS position, gsis_id, name, team_id, headshot_url, value FROM long
+        UNION ALL
+        SELECT season, category, position, gsis_id, name, team_id, headshot_url, value FROM long
+    ),
+    ranked AS (
+        SELECT *, ROW_NUMBER() OVER (PARTITION BY season, category, position ORDER BY value DESC, name) AS rnk
+        FROM scoped
+    )
+    SELECT season, category, position, rnk, gsis_id, name, team_id, value, headshot_url
+    FROM ranked
+    WHERE rnk <= :top_n
+""")
+
+LOOKUP_SQL = text("""
+    SELECT rank, name, team_id, value, headshot_url
+    FROM leaderboard_snapshots
+    WHERE season = :season AND category = :category AND position = :position
+    ORDER BY rank
+    LIMIT :limit
+""")
+
+# Refresh age, and whether season_stats were reloaded after it (etl_state is bumped on every load)
+STATUS_SQL = text("""
+    SELECT r.refreshed_at, r.duration_ms, r.row_count,
+           EXTRACT(EPOCH FROM now() - r.refreshed_at) AS age_s,
+           (SELECT MAX(updated_at) FROM etl_state) > r.refreshed_at AS data_newer
+    FROM leaderboard_refreshes r
+    ORDER BY r.refreshed_at DESC
+    LIMIT 1
+""")
+
+
+def rebuild_leaderboards(conn, top_n=TOP_N):
+    """Recomputes every board. Runs inside the caller's transaction, so readers keep the old boards until commit."""
+    started = time.perf_counter()
+    conn.execute(text("DELETE FROM leaderboard_snapshots"))
+    count = conn.execute(REBUILD_SQL, {"top_n": top_n}).rowcount
+    duration_ms = (time.perf_counter() - started) * 1000
+    # leaderboard_status only reads the latest refresh, so don't let the log grow with every run
+    conn.execute(text("DELETE FROM leaderboard_refreshes"))
+    conn.execute(
+        text("INSERT INTO leaderboard_refreshes (duration_ms, row_count) VALUES (:ms, :n)"),
+        {"ms": duration_ms, "n": count}
+    )
+    print(f"🏆 Leaderboards rebuilt: {count} rows in {duration_ms:.0f}ms.")
+    return count
+
+
+def lookup_leaders(conn, season, category, position="ALL", limit=5):
+    return conn.execute(
+        LOOKUP_SQL, {"season": season, "category": category, "position": position, "limit": limit}
+    ).mappings().all()
+
+
+def leaderboard_status(conn):
+    """Last refresh time, how long it took, its age and whether newer stats are waiting. None if never built."""
+    row = conn.execute(STATUS_SQL).mappings().first()
+    if not row:
+        return None
+    return {
+        "refreshed_at": row["refreshed_at"].isoformat(),
+        "refresh_ms": round(row["duration_ms"], 1),
+        "rows": row["row_count"],
+        "age_seconds": round(float(row["age_s"]), 1),
+        "stale": bool(row["data_newer"]),
+    }
+
+
+if __name__ == "__main__":
+    import os
+    import sys
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from etl.config import engine
+    with engine.begin() as conn:
+        rebuild_leaderboards(conn)
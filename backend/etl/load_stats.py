@@ -3,9 +3,10 @@ import supabase
 import os
 import pandas as pd
 from sqlalchemy import create_engine, text
-from sqlalchemy.exc import ProgrammingError
 from pathlib import Path
 from dotenv import load_dotenv
+from etl.bulk_load import bulk_load, require_table
+from etl.player_ids import stamp_keys
 
 load_dotenv()
 
@@ -13,36 +14,18 @@ DATABASE_URL = os.getenv("DATABASE_URL")
 engine = create_engine(DATABASE_URL)
 CLEAN_DIR = Path("data/clean")
 
-def sync_players(df):
-    if "pfr_player_id" not in df.columns or "player_name" not in df.columns:
-        return
-
-    players_to_sync = df[["pfr_player_id", "player_name"]].drop_duplicates().dropna()
-    
-    with engine.begin() as conn:
-        for _, row in players_to_sync.iterrows():
-            name = row["player_name"]
-            exists = conn.execute(
-                text("SELECT player_id FROM players WHERE name = :name"), 
-                {"name": name}
-            ).fetchone()
-            
-            if not exists:
-                print(f"Creating new player: {name}")
-                conn.execute(
-                    text("INSERT INTO players (name, position, team_id) VALUES (:name, 'Unknown', NULL)"),
-                    {"name": name}
-                )
-
 def load_csv(path: Path, table_name: str):
+    """
+    Swaps one week of a weekly table. Returns the player_ids whose old rows
+    were deleted, so aggregation can also fix players the new week dropped.
+    """
     df = pd.read_csv(path)
-    if df.empty: return
-
-    sync_players(df)
+    if df.empty: return set()
 
     # 1. Prepare Schema (The Target List)
     valid_cols = [
-        "season", "week", "pfr_player_id", "player_name", "team", "opponent",
+        "season", "week", "player_id", "team_id", "opponent_id",
+        "pfr_player_id", "player_name", "team", "opponent",
         # Passing
         "passing_yards", "passing_tds", "interceptions", 
         "completions", "attempts", "passer_rating",
@@ -59,29 +42,26 @@ def load_csv(path: Path, table_name: str):
         if col not in df.columns:
             pass 
 
-    # 3. Cleanup Old Data
+    # 3. Swap the week in one transaction: resolve ids, clear old rows, COPY the new ones
     season = int(df["season"].iloc[0])
     week = int(df["week"].iloc[0])
-    print(f"🧹 Clearing {table_name}: Season {season} Week {week}...")
-    
-    try:
-        with engine.begin() as conn:
-            conn.execute(
-                text(f"DELETE FROM {table_name} WHERE season = :s AND week = :w"),
-                {"s": season, "w": week}
-            )
-    except ProgrammingError as e:
-        if "does not exist" in str(e):
-            print(f"⚠️ Table '{table_name}' not found. It will be created now.")
-        else:
-            raise e
+    removed = set()
+    with engine.begin() as conn:
+        df = stamp_keys(conn, df)
 
-    # 4. Filter and Load
-    cols_to_load = [c for c in valid_cols if c in df.columns]
-    df_clean = df[cols_to_load]
+        # 4. Filter
+        cols_to_load = [c for c in valid_cols if c in df.columns]
+        df_clean = df[cols_to_load]
 
-    df_clean.to_sql(table_name, engine, if_exists="append", index=False, method="multi")
+        require_table(conn, table_name)
+        print(f"🧹 Clearing {table_name}: Season {season} Week {week}...")
+        removed = {r[0] for r in conn.execute(
+            text(f"DELETE FROM {table_name} WHERE season = :s AND week = :w RETURNING player_id"),
+            {"s": season, "w": week}
+        ) if r[0] is not None}
+        bulk_load(conn, df_clean, table_name)
     print(f"✅ Loaded {path} ({len(df_clean)} rows)")
+    return removed
 
 if __name__ == "__main__":
     for file in CLEAN_DIR.glob("*passing*.csv"):
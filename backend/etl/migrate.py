@@ -0,0 +1,86 @@
+# backend/etl/migrate.py
+import hashlib
+import sys
+from pathlib import Path
+from sqlalchemy import text
+from etl.publish import ensure_partitioned
+
+# Versioned schema migrations. Every file in backend/migrations/ named
+# NNNN_description.sql runs once, in order, and is recorded in
+# schema_migrations with a checksum. Migrations own the DDL (tables, keys,
+# indexes); the seed scripts and loaders only TRUNCATE / COPY / upsert into
+# that schema, so a reseed no longer drops the indexes the routes rely on.
+#
+# Files are written to be re-runnable (IF NOT EXISTS everywhere) so they can
+# be applied on top of a database the old to_sql scripts already created.
+#
+# Usage (from backend/): python -m etl.migrate            # apply pending
+#                        python -m etl.migrate --status   # list applied / pending
+
+MIGRATIONS_DIR = Path(__file__).resolve().parent.parent / "migrations"
+
+CREATE_SQL = text("""
+    CREATE TABLE IF NOT EXISTS schema_migrations (
+        version TEXT PRIMARY KEY,
+        name TEXT NOT NULL,
+        checksum TEXT NOT NULL,
+        applied_at TIMESTAMPTZ NOT NULL DEFAULT now()
+    )
+""")
+
+
+def migration_files():
+    """[(version, name, path)] in version order."""
+    files = []
+    for path in sorted(MIGRATIONS_DIR.glob("*.sql")):
+        version, _, name = path.stem.partition("_")
+        files.append((version, name, path))
+    return files
+
+
+def _checksum(path):
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def applied_migrations(conn):
+    conn.execute(CREATE_SQL)
+    return {r.version: r.checksum for r in conn.execute(text("SELECT version, checksum FROM schema_migrations"))}
+
+
+def apply_migrations(conn):
+    """Applies every pending migration inside the caller's transaction. Returns the versions applied."""
+    # Serialize with any other process migrating at the same time
+    conn.execute(text("SELECT pg_advisory_xact_lock(hashtext('schema_migrations'))"))
+    applied = applied_migrations(conn)
+
+    # A season_stats left over from to_sql is converted before 0001 can add to it
+    ensure_partitioned(conn, "season_stats")
+
+    done = []
+    for version, name, path in migration_files():
+        checksum = _checksum(path)
+        if version in applied:
+            if applied[version] != checksum:
+                print(f"⚠️ Migration {path.name} changed after it was applied (not re-run).")
+            continue
+        print(f"🧱 Applying migration {path.name}...")
+        # exec_driver_sql: the files are plain SQL, no bind parameters to parse
+        conn.exec_driver_sql(path.read_text())
+        conn.execute(
+            text("INSERT INTO schema_migrations (version, name, checksum) VALUES (:v, :n, :c)"),
+            {"v": version, "n": name, "c": checksum}
+        )
+        done.append(version)
+    return done
+
+
+if __name__ == "__main__":
+    from etl.config import engine
+    with engine.begin() as conn:
+        if "--status" in sys.argv:
+            applied = applied_migrations(conn)
+            for version, name, path in migration_files():
+                print(f"   {'✅' if version in applied else '⏳'} {path.name}")
+        else:
+            done = apply_migrations(conn)
+            print(f"✅ Schema up to date ({len(done)} migrations applied).")
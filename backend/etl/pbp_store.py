@@ -0,0 +1,130 @@
+# backend/etl/pbp_store.py
+import argparse
+import io
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+import requests
+from etl.fetch.page_cache import season_is_final
+
+# Local copy of the nflverse play-by-play files, under data/pbp:
+#   season=2025/week=7/part-0.parquet   -> every column, one partition per week
+#   _synced/2025.json                   -> when the season was last downloaded
+# Each season is downloaded once; finished seasons are never re-downloaded and
+# the current one only after PBP_STORE_TTL_HOURS. Readers go through pyarrow
+# datasets, so they only touch the season/week directories they ask for and
+# only decode the columns they name.
+#
+# Usage (from backend/): python -m etl.pbp_store 2023 2024 2025 [--force]
+
+STORE_DIR = Path(os.getenv("PBP_STORE_DIR", "data/pbp"))
+STORE_TTL = float(os.getenv("PBP_STORE_TTL_HOURS", "12")) * 3600
+PBP_URL = "https://github.com/nflverse/nflverse-data/releases/download/pbp/play_by_play_{}.parquet"
+
+
+def _marker_path(season):
+    return STORE_DIR / "_synced" / f"{season}.json"
+
+
+def _season_dir(season):
+    return STORE_DIR / f"season={season}"
+
+
+def is_synced(season, ttl=STORE_TTL):
+    """True if the season is on disk and doesn't need a fresh download."""
+    marker = _marker_path(season)
+    if not marker.exists() or not _season_dir(season).exists():
+        return False
+    if season_is_final(season):
+        return True
+    return time.time() - json.loads(marker.read_text())["synced_at"] < ttl
+
+
+def sync_season(season, force=False):
+    """
+    Downloads one season's PBP parquet and rewrites its week partitions.
+    Returns the number of plays stored (0 if the local copy was still fresh).
+    If the download fails but an older copy exists, we keep using it.
+    """
+    if not force and is_synced(season):
+        return 0
+
+    url = PBP_URL.format(season)
+    print(f"📥 Syncing {season} play-by-play to {STORE_DIR}...")
+    try:
+        response = requests.get(url, timeout=120)
+        response.raise_for_status()
+    except requests.RequestException as e:
+        if _season_dir(season).exists():
+            print(f"   ⚠️ Download failed ({e}), using the local {season} copy.")
+            return 0
+        raise
+
+    table = pq.read_table(io.BytesIO(response.content))
+
+    # 1. Write to a scratch dir, then swap, so readers never see half a season
+    scratch = STORE_DIR / f"_tmp_season={season}"
+    shutil.rmtree(scratch, ignore_errors=True)
+    ds.write_dataset(
+        table.drop_columns(["season"]), scratch / "week", format="parquet",
+        partitioning=ds.partitioning(flavor="hive", schema=table.select(["week"]).schema),
+        basename_template="part-{i}.parquet",
+    )
+    shutil.rmtree(_season_dir(season), ignore_errors=True)
+    (scratch / "week").rename(_season_dir(season))
+    shutil.rmtree(scratch, ignore_errors=True)
+
+    # 2. Remember when we synced
+    marker = _marker_path(season)
+    marker.parent.mkdir(parents=True, exist_ok=True)
+    marker.write_text(json.dumps({
+        "url": url,
+        "synced_at": time.time(),
+        "rows": table.num_rows,
+        "bytes": len(response.content),
+    }))
+    print(f"   ✅ Stored {table.num_rows} plays for {season}.")
+    return table.num_rows
+
+
+def pbp_dataset():
+    return ds.dataset(STORE_DIR, format="parquet", partitioning="hive",
+                      exclude_invalid_files=True, ignore_prefixes=["_", "."])
+
+
+def read_pbp(seasons, columns=None, weeks=None, filter=None):
+    """
+    Reads plays for the given season(s) from the local store as a DataFrame,
+    syncing any season that isn't on disk yet.
+    `columns` limits what gets decoded; `weeks` and `filter` (a pyarrow
+    expression, e.g. ds.field("play_type") == "pass") are pushed down so
+    other partitions and non-matching row groups are skipped.
+    """
+    if isinstance(seasons, int):
+        seasons = [seasons]
+    for season in seasons:
+        sync_season(season)
+
+    expr = ds.field("season").isin(seasons)
+    if weeks is not None:
+        expr = expr & ds.field("week").isin(list(weeks))
+    if filter is not None:
+        expr = expr & filter
+
+    dataset = pbp_dataset()
+    if columns is not None:
+        columns = [c for c in columns if c in dataset.schema.names]
+    return dataset.to_table(columns=columns, filter=expr).to_pandas()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sync nflverse play-by-play into the local parquet store")
+    parser.add_argument("seasons", type=int, nargs="+")
+    parser.add_argument("--force", action="store_true", help="re-download even if the local copy is fresh")
+    args = parser.parse_args()
+    for season in args.seasons:
+        sync_season(season, force=args.force)
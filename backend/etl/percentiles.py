@@ -0,0 +1,66 @@
+from sqlalchemy import text
+
+# Fantasy-point distribution per season, overall ('ALL') and per position.
+# One row per distinct score with how many rows score at or below it, so the
+# profile endpoint can rank any score with a single index seek instead of
+# pulling every season_stats row into Python.
+# The table and its (season, position, fantasy_points) key live in
+# migrations/0004_etl_tables.sql.
+
+# NULL points count as 0, same as the profile endpoint always did
+REBUILD_SQL = text("""
+    INSERT INTO season_percentiles (season, position, fantasy_points, at_or_below, total)
+    WITH scores AS (
+        SELECT s.season,
+               COALESCE(p.position, 'UNK') AS position,
+               COALESCE(s.fantasy_points, 0) AS fantasy_points
+        FROM season_stats s
+        LEFT JOIN players p ON p.gsis_id = s.gsis_id
+    ),
+    grouped AS (
+        SELECT season, 'ALL' AS position, fantasy_points, COUNT(*) AS n
+        FROM scores GROUP BY season, fantasy_points
+        UNION ALL
+        SELECT season, position, fantasy_points, COUNT(*) AS n
+        FROM scores GROUP BY season, position, fantasy_points
+    )
+    SELECT season, position, fantasy_points,
+           SUM(n) OVER (PARTITION BY season, position ORDER BY fantasy_points),
+           SUM(n) OVER (PARTITION BY season, position)
+    FROM grouped
+""")
+
+# How many rows score strictly below :score, and how many rows there are
+LOOKUP_SQL = text("""
+    SELECT
+        (SELECT at_or_below FROM season_percentiles
+         WHERE season = :season AND position = :position AND fantasy_points < :score
+         ORDER BY fantasy_points DESC LIMIT 1) AS below,
+        (SELECT total FROM season_percentiles
+         WHERE season = :season AND position = :position LIMIT 1) AS total
+""")
+
+
+def rebuild_percentiles(conn):
+    """Recomputes the whole table. Runs inside the caller's transaction."""
+    conn.execute(text("DELETE FROM season_percentiles"))
+    conn.execute(REBUILD_SQL)
+    count = conn.execute(text("SELECT COUNT(*) FROM season_percentiles")).scalar()
+    print(f"📊 Percentile table rebuilt: {count} rows.")
+
+
+def lookup_percentile(conn, season, score, position="ALL"):
+    """Returns (rows below score, total rows) or None if the season isn't built."""
+    row = conn.execute(LOOKUP_SQL, {"season": season, "position": position, "score": score}).first()
+    if not row or not row.total:
+        return None
+    return (row.below or 0), row.total
+
+
+if __name__ == "__main__":
+    import os
+    import sys
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from etl.config import engine
+    with engine.begin() as conn:
+        rebuild_percentiles(conn)
@@ -0,0 +1,169 @@
+# backend/etl/player_ids.py
+from sqlalchemy import text
+
+# player_ids: one row per player (keyed by players.player_id) with every
+# outside id we know for them. The weekly loaders resolve PFR ids through it
+# and stamp integer keys onto each row (player_id, team_id, opponent_id), so
+# aggregates and routes join on indexed integers instead of names.
+#
+# A PFR id we have never seen is linked to an existing player only when
+# exactly one unlinked player has that name and no other new id in the same
+# week shares it; otherwise it gets a new players row. Once linked, the name
+# is never consulted again for that id.
+#
+# player_ids and the weekly key columns/indexes are defined by the migrations
+# (0001, 0002, 0004); nothing here creates schema.
+#
+# Usage (from backend/): python -m etl.migrate && python -m etl.player_ids   # link, stamp existing weekly rows
+
+WEEKLY_TABLES = ["weekly_passing_stats", "weekly_rushing_stats", "weekly_receiving_stats"]
+EXTERNAL_IDS = ["gsis_id", "espn_id", "sleeper_id", "yahoo_id"]
+
+# One statement for the whole week: known ids, name links and new players.
+# CTEs all see the pre-statement snapshot, so new rows only flow through the
+# CTE outputs (player ids for new players are drawn up front with nextval).
+RESOLVE_SQL = text("""
+    WITH candidates AS (
+        SELECT DISTINCT ON (pfr_id) pfr_id, name
+        FROM unnest(CAST(:pfr_ids AS text[]), CAST(:names AS text[])) AS c(pfr_id, name)
+    ),
+    known AS (
+        SELECT c.pfr_id, x.player_id
+        FROM candidates c JOIN player_ids x ON x.pfr_id = c.pfr_id
+    ),
+    unknown AS (
+        SELECT c.* FROM candidates c
+        WHERE NOT EXISTS (SELECT 1 FROM known k WHERE k.pfr_id = c.pfr_id)
+    ),
+    unlinked AS (
+        SELECT p.player_id, p.name FROM players p
+        WHERE NOT EXISTS (SELECT 1 FROM player_ids x WHERE x.player_id = p.player_id AND x.pfr_id IS NOT NULL)
+    ),
+    unique_names AS (
+        SELECT name FROM unknown GROUP BY name HAVING COUNT(*) = 1
+    ),
+    by_name AS (
+        -- The name must be unique on both sides, or two new ids would claim one player
+        SELECT u.pfr_id, u.name, MIN(l.player_id) AS player_id
+        FROM unknown u
+        JOIN unique_names n ON n.name = u.name
+        JOIN unlinked l ON l.name = u.name
+        GROUP BY u.pfr_id, u.name
+        HAVING COUNT(*) = 1
+    ),
+    fresh AS (
+        SELECT u.pfr_id, u.name, nextval(pg_get_serial_sequence('players', 'player_id'))::int AS player_id
+        FROM unknown u
+        WHERE NOT EXISTS (SELECT 1 FROM by_name b WHERE b.pfr_id = u.pfr_id)
+    ),
+    new_players AS (
+        INSERT INTO players (player_id, name, position, team_id)
+        SELECT player_id, name, 'Unknown', NULL FROM fresh
+        RETURNING player_id
+    ),
+    linked AS (
+        INSERT INTO player_ids (player_id, pfr_id, name)
+        SELECT player_id, pfr_id, name FROM by_name
+        UNION ALL
+        SELECT player_id, pfr_id, name FROM fresh
+        ON CONFLICT (player_id) DO UPDATE SET pfr_id = EXCLUDED.pfr_id, updated_at = now()
+        RETURNING player_id
+    )
+    SELECT pfr_id, player_id, 'known' AS how FROM known
+    UNION ALL SELECT pfr_id, player_id, 'name' FROM by_name
+    UNION ALL SELECT pfr_id, player_id, 'new' FROM fresh
+""")
+
+
+def resolve_players(conn, df):
+    """
+    Maps every pfr_player_id in the frame to players.player_id, creating
+    players/crosswalk rows as needed. Returns {pfr_id: player_id}.
+    A constant number of round trips no matter how many players the week has.
+    """
+    if "pfr_player_id" not in df.columns or "player_name" not in df.columns:
+        return {}
+    candidates = df[["pfr_player_id", "player_name"]].dropna().drop_duplicates("pfr_player_id")
+    if candidates.empty:
+        return {}
+
+    # Serialize concurrent loads (backfill workers) so two weeks can't both create the same player
+    conn.execute(text("SELECT pg_advisory_xact_lock(hashtext('resolve_players'))"))
+    rows = conn.execute(RESOLVE_SQL, {
+        "pfr_ids": candidates["pfr_player_id"].tolist(),
+        "names": candidates["player_name"].tolist(),
+    }).fetchall()
+
+    created = [r.pfr_id for r in rows if r.how == "new"]
+    if created:
+        print(f"Creating {len(created)} new players: {', '.join(created[:10])}{' ...' if len(created) > 10 else ''}")
+    return {r.pfr_id: r.player_id for r in rows}
+
+
+def team_ids(conn):
+    """{team name/abbreviation as the weekly CSVs spell it: teams.id}"""
+    return {r.name: r.id for r in conn.execute(text("SELECT id, name FROM teams"))}
+
+
+def stamp_keys(conn, df):
+    """Adds player_id, team_id and opponent_id columns to a weekly frame."""
+    player_map = resolve_players(conn, df)
+    if player_map:
+        df["player_id"] = df["pfr_player_id"].map(player_map).astype("Int64")
+    teams = team_ids(conn)
+    if "team" in df.columns:
+        df["team_id"] = df["team"].map(teams).astype("Int64")
+    if "opponent" in df.columns:
+        df["opponent_id"] = df["opponent"].map(teams).astype("Int64")
+    return df
+
+
+def link_external_ids(conn):
+    """Copies gsis/espn/sleeper/yahoo ids from players into the crosswalk, for whichever of them players has."""
+    columns = {r[0] for r in conn.execute(text(
+        "SELECT column_name FROM information_schema.columns "
+        "WHERE table_schema = current_schema() AND table_name = 'players'"
+    ))}
+    ids = [c for c in EXTERNAL_IDS if c in columns]
+    if "player_id" not in columns:
+        return 0
+    select_ids = "".join(f", p.{c}::text" for c in ids)
+    insert_cols = "".join(f", {c}" for c in ids)
+    updates = "".join(f", {c} = COALESCE(EXCLUDED.{c}, player_ids.{c})" for c in ids)
+    result = conn.execute(text(f"""
+        INSERT INTO player_ids (player_id, name{insert_cols})
+        SELECT p.player_id, p.name{select_ids} FROM players p
+        ON CONFLICT (player_id) DO UPDATE SET name = EXCLUDED.name{updates}, updated_at = now()
+    """))
+    return result.rowcount
+
+
+def stamp_existing(conn, table_name):
+    """Backfills key columns on rows loaded before the crosswalk existed."""
+    conn.execute(text(f"""
+        UPDATE {table_name} w SET player_id = x.player_id
+        FROM player_ids x
+        WHERE w.player_id IS NULL AND x.pfr_id = w.pfr_player_id
+    """))
+    conn.execute(text(f"""
+        UPDATE {table_name} w SET team_id = t.id
+        FROM teams t WHERE w.team_id IS NULL AND t.name = w.team
+    """))
+    conn.execute(text(f"""
+        UPDATE {table_name} w SET opponent_id = t.id
+        FROM teams t WHERE w.opponent_id IS NULL AND t.name = w.opponent
+    """))
+
+
+if __name__ == "__main__":
+    import pandas as pd
+    from etl.config import engine
+    with engine.begin() as conn:
+        linked = link_external_ids(conn)
+        print(f"🔗 Crosswalk: {linked} players linked to outside ids.")
+        for table in WEEKLY_TABLES:
+            # Resolve every PFR id already loaded, then stamp the rows
+            df = pd.read_sql(text(f"SELECT DISTINCT pfr_player_id, player_name FROM {table}"), conn)
+            resolve_players(conn, df)
+            stamp_existing(conn, table)
+            print(f"   ✅ Stamped keys on {table}.")
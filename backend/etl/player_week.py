@@ -0,0 +1,97 @@
+# backend/etl/player_week.py
+from sqlalchemy import text
+
+# player_week: one row per (player_id, season, week) with every passing,
+# rushing and receiving column side by side. The three weekly PFR tables are
+# folded into it by the aggregation step, so per-player reads (compare, game
+# logs) are one primary-key range scan instead of a UNION ALL over three
+# tables, and season-wide reads (draft) hit the (season, week) index.
+#
+# Refreshed per (season, weeks): those weeks are deleted and rebuilt in the
+# same transaction, so a corrected or re-scraped week never leaves stale rows.
+# The table (columns = STAT_COLS) is defined in migrations/0004_etl_tables.sql.
+#
+# Usage (from backend/): python -m etl.migrate && python -m etl.player_week   # rebuild every season
+
+PASSING_COLS = [
+    "completions", "attempts", "passing_yards", "passing_tds", "interceptions",
+    "sacks", "sack_yards", "passer_rating", "qbr", "longest_pass", "first_downs",
+    "fourth_qtr_comebacks", "game_winning_drives",
+]
+RUSHING_COLS = ["carries", "rushing_yards", "rushing_tds", "longest_rush"]
+RECEIVING_COLS = ["targets", "receptions", "receiving_yards", "receiving_tds", "longest_reception"]
+
+# Duplicate rows for the same player-week are summed, except these (MAX)
+MAX_COLS = {"passer_rating", "qbr", "longest_pass", "longest_rush", "longest_reception"}
+
+SOURCES = {
+    "passing": ("weekly_passing_stats", PASSING_COLS),
+    "rushing": ("weekly_rushing_stats", RUSHING_COLS),
+    "receiving": ("weekly_receiving_stats", RECEIVING_COLS),
+}
+
+STAT_COLS = PASSING_COLS + RUSHING_COLS + RECEIVING_COLS
+
+
+def _source_cte(name, table, columns, week_filter):
+    sums = ",\n                ".join(
+        f"{'MAX' if c in MAX_COLS else 'SUM'}(w.{c}) AS {c}" for c in columns
+    )
+    return f"""{name} AS (
+            SELECT
+                w.player_id, w.season, w.week,
+                MAX(w.team_id) AS team_id, MAX(w.opponent_id) AS opponent_id,
+                {sums}
+            FROM {table} w
+            WHERE w.player_id IS NOT NULL {week_filter}
+            GROUP BY w.player_id, w.season, w.week
+        )"""
+
+
+def refresh_sql(full):
+    """DELETE + INSERT for the scope: every season, or (:season, :weeks)."""
+    week_filter = "" if full else "AND w.season = :season AND w.week = ANY(:weeks)"
+    ctes = ",\n        ".join(
+        _source_cte(name, table, columns, week_filter) for name, (table, columns) in SOURCES.items()
+    )
+    picks = ",\n            ".join(
+        f"{name}.{c}" for name, (_, columns) in SOURCES.items() for c in columns
+    )
+    delete = "DELETE FROM player_week" if full else \
+        "DELETE FROM player_week WHERE season = :season AND week = ANY(:weeks)"
+    insert = f"""
+        WITH {ctes}
+        INSERT INTO player_week (
+            player_id, season, week, team_id, opponent_id,
+            {", ".join(STAT_COLS)},
+            total_yards, total_tds
+        )
+        SELECT
+            player_id, season, week,   -- USING merges the keys across the three sides
+            COALESCE(passing.team_id, rushing.team_id, receiving.team_id),
+            COALESCE(passing.opponent_id, rushing.opponent_id, receiving.opponent_id),
+            {picks},
+            COALESCE(passing.passing_yards, 0) + COALESCE(rushing.rushing_yards, 0) + COALESCE(receiving.receiving_yards, 0),
+            COALESCE(passing.passing_tds, 0) + COALESCE(rushing.rushing_tds, 0) + COALESCE(receiving.receiving_tds, 0)
+        FROM passing
+        FULL JOIN rushing USING (player_id, season, week)
+        FULL JOIN receiving USING (player_id, season, week)
+    """
+    return text(delete), text(insert)
+
+
+def refresh_player_week(conn, season=None, weeks=None):
+    """Rebuilds player_week for the given weeks of a season (every season if season is None)."""
+    full = season is None
+    params = {} if full else {"season": season, "weeks": list(weeks)}
+    delete, insert = refresh_sql(full)
+    conn.execute(delete, params)
+    return conn.execute(insert, params).rowcount
+
+
+if __name__ == "__main__":
+    from etl.config import engine
+    with engine.begin() as conn:
+        rows = refresh_player_week(conn)
+        conn.execute(text("ANALYZE player_week"))
+    print(f"✅ player_week rebuilt: {rows} player-weeks.")
@@ -0,0 +1,104 @@
+# backend/etl/publish.py
+import time
+from sqlalchemy import text
+from etl.bulk_load import _column_types, bulk_load, require_table, table_exists
+
+# Publishes a whole season at once. season_stats is LIST-partitioned by season
+# (season_stats_2025, season_stats_2024, ... plus a default partition), so a
+# full reload never DELETEs from the live table:
+#   1. build  - COPY the new season into season_stats_2025_new, index it,
+#               add CHECK (season = 2025) so ATTACH doesn't have to scan it
+#   2. swap   - one short transaction: detach + drop the old partition,
+#               rename the new one, attach it
+# Readers see either the old season or the new one, never an empty or half
+# loaded one, and the old rows go away with DROP TABLE instead of leaving
+# dead tuples for vacuum.
+
+LOCK_TIMEOUT = "5s"   # don't queue behind a long read and block everyone behind us
+
+
+def _partition(table_name, season):
+    return f"{table_name}_{season}"
+
+
+def is_partitioned(conn, table_name):
+    return bool(conn.execute(
+        text("SELECT 1 FROM pg_partitioned_table pt JOIN pg_class c ON c.oid = pt.partrelid "
+             "WHERE c.relname = :t AND c.relnamespace = current_schema()::regnamespace"),
+        {"t": table_name}
+    ).scalar())
+
+
+def has_partition(conn, table_name, season):
+    return table_exists(conn, _partition(table_name, season))
+
+
+def ensure_partitioned(conn, table_name="season_stats", key_cols=("gsis_id", "season", "team_id")):
+    """
+    One-time conversion of a plain table (as to_sql / the seed scripts make it)
+    into a table partitioned by season, one partition per season in it.
+    LIKE only copies columns and defaults, so the unique key the upserts rely
+    on is rebuilt here. Runs in the caller's transaction.
+    """
+    if not table_exists(conn, table_name) or is_partitioned(conn, table_name):
+        return
+    print(f"🧱 Converting {table_name} to season partitions...")
+    legacy = f"{table_name}_legacy"
+    conn.execute(text(f"ALTER TABLE {table_name} RENAME TO {legacy}"))
+    conn.execute(text(f"CREATE TABLE {table_name} (LIKE {legacy} INCLUDING DEFAULTS) PARTITION BY LIST (season)"))
+    conn.execute(text(f"CREATE TABLE {table_name}_default PARTITION OF {table_name} DEFAULT"))
+    seasons = [r[0] for r in conn.execute(text(f"SELECT DISTINCT season FROM {legacy} WHERE season IS NOT NULL"))]
+    for season in seasons:
+        conn.execute(text(f"CREATE TABLE {_partition(table_name, int(season))} "
+                          f"PARTITION OF {table_name} FOR VALUES IN ({int(season)})"))
+
+    # fix_all_stats never wrote team_id; the key needs every column
+    for col in key_cols:
+        conn.execute(text(f"ALTER TABLE {table_name} ADD COLUMN IF NOT EXISTS {col} TEXT"))
+    old_cols = _column_types(conn, legacy)
+    copied = ", ".join(old_cols)
+    # to_sql never enforced the key: one row per key, or the unique index can't be built
+    distinct_on = ", ".join(c for c in key_cols if c in old_cols)
+    conn.execute(text(f"INSERT INTO {table_name} ({copied}) "
+                      f"SELECT DISTINCT ON ({distinct_on}) {copied} FROM {legacy}"))
+
+    # No CASCADE: a view or foreign key on the old table should stop the conversion, not vanish
+    conn.execute(text(f"DROP TABLE {legacy}"))
+    conn.execute(text(f"CREATE UNIQUE INDEX IF NOT EXISTS ux_{table_name}_{'_'.join(key_cols)} "
+                      f"ON {table_name} ({', '.join(key_cols)})"))
+
+
+def publish_season(engine, df, season, table_name="season_stats", index_cols=("gsis_id", "season", "team_id")):
+    """Builds `season` into a staging partition and swaps it in. Returns rows published."""
+    season = int(season)
+    live = _partition(table_name, season)
+    staging = f"{live}_new"
+    started = time.perf_counter()
+
+    # 1. BUILD (nothing the API reads is touched yet)
+    with engine.begin() as conn:
+        require_table(conn, table_name)
+        ensure_partitioned(conn, table_name)
+
+        conn.execute(text(f"DROP TABLE IF EXISTS {staging}"))
+        conn.execute(text(f"CREATE TABLE {staging} (LIKE {table_name} INCLUDING DEFAULTS)"))
+        rows = bulk_load(conn, df.assign(season=season), staging)
+        conn.execute(text(f"ALTER TABLE {staging} ADD CONSTRAINT {staging}_season CHECK (season IS NOT NULL AND season = {season})"))
+        # Same unique key the incremental upserts use, so ATTACH adopts it instead of building one
+        cols = ", ".join(index_cols)
+        conn.execute(text(f"CREATE UNIQUE INDEX ON {staging} ({cols})"))
+        conn.execute(text(f"ANALYZE {staging}"))
+
+    # 2. SWAP (one short transaction)
+    with engine.begin() as conn:
+        conn.execute(text(f"SET LOCAL lock_timeout = '{LOCK_TIMEOUT}'"))
+        if table_exists(conn, live):
+            conn.execute(text(f"ALTER TABLE {table_name} DETACH PARTITION {live}"))
+            conn.execute(text(f"DROP TABLE {live}"))
+        # Rows for this season that landed in the default partition would block ATTACH
+        conn.execute(text(f"DELETE FROM {table_name}_default WHERE season = {season}"))
+        conn.execute(text(f"ALTER TABLE {staging} RENAME TO {live}"))
+        conn.execute(text(f"ALTER TABLE {table_name} ATTACH PARTITION {live} FOR VALUES IN ({season})"))
+
+    print(f"   🔁 Published {rows} {table_name} rows for {season} in {time.perf_counter() - started:.2f}s")
+    return rows
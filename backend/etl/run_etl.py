@@ -1,5 +1,7 @@
 import pandas as pd
 from sqlalchemy import create_engine, text
+import argparse
+import hashlib
 import os
 import sys
 
@@ -7,55 +9,45 @@ import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from dotenv import load_dotenv
 load_dotenv()
+from etl.state import bump_data_version, get_week_checkpoints, get_week_players, save_week_checkpoints
+from etl.percentiles import rebuild_percentiles
+from etl.leaderboards import rebuild_leaderboards
+from etl.pbp_store import read_pbp
+from etl.scoring import score_frame
+from etl.bulk_load import bulk_load
+from etl.publish import has_partition, publish_season
+from etl.migrate import apply_migrations
 DATABASE_URL = os.getenv("DATABASE_URL")
+SEASON = 2025
+KEY_COLS = ['gsis_id', 'season', 'team_id']
 
-def calculate_fantasy_points(row):
-    """Standard PPR Fantasy Calculation"""
-    pass_pts = (row.get('passing_yards', 0) / 25) + (row.get('passing_tds', 0) * 4) - (row.get('interceptions', 0) * 2)
-    rush_pts = (row.get('rushing_yards', 0) / 10) + (row.get('rushing_tds', 0) * 6)
-    rec_pts = (row.get('receiving_yards', 0) / 10) + (row.get('receiving_tds', 0) * 6) + (row.get('receptions', 0) * 1)
-    fum_pts = (row.get('fumbles_lost', 0) * -2)
-    return round(pass_pts + rush_pts + rec_pts + fum_pts, 2)
+def week_hashes(df_pbp):
+    """
+    {week: (content_hash, row_count)} for every week in the PBP frame.
+    Row hashes are sorted first so nflverse re-ordering plays doesn't count as a change.
+    """
+    hashes = {}
+    for week, plays in df_pbp.groupby('week'):
+        row_hashes = pd.util.hash_pandas_object(plays, index=False).sort_values().values
+        hashes[int(week)] = (hashlib.sha256(row_hashes.tobytes()).hexdigest(), len(plays))
+    return hashes
 
-def run_pipeline():
-    print("🚀 STARTING WEEKLY UPDATE (SURGICAL SWAP)...")
-    
-    if not DATABASE_URL:
-        print("❌ Error: DATABASE_URL not found.")
-        return
+def affected_players(df_pbp, weeks):
+    """Every player id with a pass, rush or target in the given weeks."""
+    plays = df_pbp[df_pbp['week'].isin(weeks)]
+    ids = pd.concat([plays['passer_player_id'], plays['rusher_player_id'], plays['receiver_player_id']])
+    return set(ids.dropna())
 
-    engine = create_engine(DATABASE_URL)
-
-    # --- STEP 1: FETCH STATS (Raw 2025 PBP) ---
-    print("📥 Downloading Raw 2025 Play-by-Play Data...")
-    # We use PARQUET (faster/stable) instead of the old broken CSV libraries
-    PBP_URL = "https://github.com/nflverse/nflverse-data/releases/download/pbp/play_by_play_2025.parquet"
-    
-    try:
-        cols = [
-            'season', 'week', 'passer_player_id', 'passer_player_name', 'rusher_player_id', 'rusher_player_name',
-            'receiver_player_id', 'receiver_player_name', 'passing_yards', 'rushing_yards', 'receiving_yards',
-            'pass_touchdown', 'rush_touchdown', 'interception', 'fumble_lost', 'sack', 'complete_pass', 'posteam'
-        ]
-        df_pbp = pd.read_parquet(PBP_URL, columns=cols)
-    except Exception as e:
-        print(f"❌ Stats Download Failed: {e}")
-        return
+def aggregate_season(df_pbp, df_roster, ids=None):
+    """
+    Season totals per (player, team). With `ids`, only those players are
+    aggregated, so a weekly run only touches the players who played that week.
+    """
+    def role_plays(id_col):
+        return df_pbp if ids is None else df_pbp[df_pbp[id_col].isin(ids)]
 
-    # --- STEP 2: FETCH ROSTER (Fix UNK Positions) ---
-    print("📥 Downloading Official 2025 Roster...")
-    ROSTER_URL = "https://github.com/nflverse/nflverse-data/releases/download/rosters/roster_2025.parquet"
-    try:
-        roster_cols = ['gsis_id', 'position', 'full_name']
-        df_roster = pd.read_parquet(ROSTER_URL, columns=roster_cols)
-    except:
-        df_roster = pd.DataFrame(columns=['gsis_id', 'position', 'full_name'])
-
-    # --- STEP 3: AGGREGATE ---
-    print("⚙️  Calculating 2025 Stats...")
-    
     # Passing
-    pass_stats = df_pbp.groupby(['passer_player_id', 'passer_player_name', 'posteam', 'season']).agg({
+    pass_stats = role_plays('passer_player_id').groupby(['passer_player_id', 'passer_player_name', 'posteam', 'season']).agg({
         'passing_yards': 'sum', 'pass_touchdown': 'sum', 'interception': 'sum', 'sack': 'sum'
     }).reset_index().rename(columns={
         'passer_player_id': 'gsis_id', 'passer_player_name': 'player_name', 'posteam': 'team_id',
@@ -63,7 +55,7 @@ def run_pipeline():
     })
     
     # Rushing
-    rush_stats = df_pbp.groupby(['rusher_player_id', 'rusher_player_name', 'posteam', 'season']).agg({
+    rush_stats = role_plays('rusher_player_id').groupby(['rusher_player_id', 'rusher_player_name', 'posteam', 'season']).agg({
         'rushing_yards': 'sum', 'rush_touchdown': 'sum', 'fumble_lost': 'sum'
     }).reset_index().rename(columns={
         'rusher_player_id': 'gsis_id', 'rusher_player_name': 'player_name', 'posteam': 'team_id',
@@ -71,7 +63,7 @@ def run_pipeline():
     })
     
     # Receiving
-    rec_stats = df_pbp.groupby(['receiver_player_id', 'receiver_player_name', 'posteam', 'season']).agg({
+    rec_stats = role_plays('receiver_player_id').groupby(['receiver_player_id', 'receiver_player_name', 'posteam', 'season']).agg({
         'receiving_yards': 'sum', 'pass_touchdown': 'sum', 'complete_pass': 'sum'
     }).reset_index().rename(columns={
         'receiver_player_id': 'gsis_id', 'receiver_player_name': 'player_name', 'posteam': 'team_id',
@@ -79,39 +71,175 @@ def run_pipeline():
     })
     
     # Merge
-    merged = pd.merge(pass_stats, rush_stats, on=['gsis_id', 'season', 'team_id'], how='outer', suffixes=('_p', '_r'))
+    merged = pd.merge(pass_stats, rush_stats, on=KEY_COLS, how='outer', suffixes=('_p', '_r'))
     merged['player_name'] = merged['player_name_p'].combine_first(merged['player_name_r'])
     merged = merged.drop(columns=['player_name_p', 'player_name_r'])
     
-    merged = pd.merge(merged, rec_stats, on=['gsis_id', 'season', 'team_id'], how='outer', suffixes=('', '_rec'))
+    merged = pd.merge(merged, rec_stats, on=KEY_COLS, how='outer', suffixes=('', '_rec'))
     merged['player_name'] = merged['player_name'].combine_first(merged['player_name_rec'])
     merged = merged.drop(columns=['player_name_rec'])
     
     merged = merged.fillna(0)
     
-    # --- STEP 4: ENRICH (Roster Merge) ---
+    # Enrich (Roster Merge)
     final_df = pd.merge(merged, df_roster, on='gsis_id', how='left')
     final_df['position'] = final_df['position'].fillna('UNK')
     final_df['player_name'] = final_df['full_name'].combine_first(final_df['player_name'])
     final_df = final_df.drop(columns=['full_name'])
     
-    final_df['fantasy_points'] = final_df.apply(calculate_fantasy_points, axis=1)
-    final_df = final_df[final_df['fantasy_points'] != 0]
+    final_df['fantasy_points'] = score_frame(final_df)
+    return final_df[final_df['fantasy_points'] != 0]
+
+def changed_rows(new_df, old_df):
+    """Rows of new_df that are missing from old_df or differ from it (stats compared at 2dp)."""
+    if old_df.empty:
+        return new_df
+    cols = [c for c in new_df.columns if c in old_df.columns]
+    def normalized(df):
+        df = df[cols].copy()
+        for c in df.columns:
+            if pd.api.types.is_numeric_dtype(df[c]):
+                df[c] = df[c].astype(float).round(2)
+            else:
+                df[c] = df[c].astype(str)
+        return df
+    both = normalized(new_df).merge(normalized(old_df).drop_duplicates(), on=cols, how='left', indicator=True)
+    return new_df[(both['_merge'] == 'left_only').values]
 
-    # --- STEP 5: THE SURGICAL SWAP (Crucial Change) ---
-    print(f"💾 Saving {len(final_df)} updated 2025 records...")
+def upsert_players(conn, new_df, ids):
+    """
+    Replaces season_stats rows for the affected players, writing only rows
+    that actually changed (COPY + ON CONFLICT on gsis_id/season/team_id),
+    inside the caller's transaction.
+    """
+    ids = list(ids)
+    old_df = pd.read_sql(
+        text("SELECT * FROM season_stats WHERE season = :season AND gsis_id = ANY(:ids)"),
+        conn, params={"season": SEASON, "ids": ids}
+    )
+    to_write = changed_rows(new_df, old_df)
+
+    # Player/team rows that no longer exist (e.g. a stat correction moved a play)
+    new_keys = set(map(tuple, new_df[KEY_COLS].astype(str).values))
+    stale = old_df[[k not in new_keys for k in map(tuple, old_df[KEY_COLS].astype(str).values)]]
+    stale = stale[KEY_COLS].drop_duplicates()
+
+    if not stale.empty:
+        conn.execute(
+            text("""
+                DELETE FROM season_stats
+                WHERE (gsis_id, season, team_id) IN (
+                    SELECT * FROM unnest(CAST(:gsis_ids AS text[]), CAST(:seasons AS int[]), CAST(:team_ids AS text[]))
+                )
+            """),
+            {"gsis_ids": stale['gsis_id'].tolist(), "seasons": stale['season'].astype(int).tolist(),
+             "team_ids": stale['team_id'].tolist()}
+        )
+    if not to_write.empty:
+        bulk_load(conn, to_write, 'season_stats', mode='upsert', key_cols=KEY_COLS)
+    return len(to_write), len(stale)
+
+def run_pipeline(full_refresh=False):
+    print("🚀 STARTING WEEKLY UPDATE (INCREMENTAL)...")
     
+    if not DATABASE_URL:
+        print("❌ Error: DATABASE_URL not found.")
+        return
+
+    engine = create_engine(DATABASE_URL)
+
+    # --- STEP 1: FETCH STATS (Raw 2025 PBP) ---
+    # Synced into the local parquet store (data/pbp) at most every PBP_STORE_TTL_HOURS,
+    # then read back with only the columns we aggregate.
+    print("📥 Loading Raw 2025 Play-by-Play Data...")
+    try:
+        cols = [
+            'season', 'week', 'passer_player_id', 'passer_player_name', 'rusher_player_id', 'rusher_player_name',
+            'receiver_player_id', 'receiver_player_name', 'passing_yards', 'rushing_yards', 'receiving_yards',
+            'pass_touchdown', 'rush_touchdown', 'interception', 'fumble_lost', 'sack', 'complete_pass', 'posteam'
+        ]
+        df_pbp = read_pbp(SEASON, columns=cols)
+    except Exception as e:
+        print(f"❌ Stats Download Failed: {e}")
+        return
+
+    # --- STEP 2: CHECKPOINTS (Skip Unchanged Weeks) ---
+    hashes = week_hashes(df_pbp)
     with engine.connect() as conn:
-        # 1. Delete ONLY 2025 data (Keep 2023/2024 safe)
-        print("   -> Removing old 2025 data...")
-        conn.execute(text("DELETE FROM season_stats WHERE season = 2025"))
+        apply_migrations(conn)   # schema (keys, indexes) before anything is written
+        saved = get_week_checkpoints(conn, SEASON)
+        published = has_partition(conn, 'season_stats', SEASON)
+        conn.commit()
+
+    # Nothing to patch yet: build the season from scratch and publish it whole
+    if not saved or not published:
+        full_refresh = True
+
+    if full_refresh:
+        changed_weeks = sorted(hashes)
+    else:
+        changed_weeks = sorted(w for w, (h, _) in hashes.items() if saved.get(w) != h)
+    if not changed_weeks:
+        print("✅ No PBP weeks changed since the last run. Nothing to do.")
+        return
+    print(f"🔎 Changed weeks: {changed_weeks} ({len(hashes) - len(changed_weeks)} unchanged, skipped)")
+
+    # --- STEP 3: FETCH ROSTER (Fix UNK Positions) ---
+    print("📥 Downloading Official 2025 Roster...")
+    ROSTER_URL = "https://github.com/nflverse/nflverse-data/releases/download/rosters/roster_2025.parquet"
+    try:
+        roster_cols = ['gsis_id', 'position', 'full_name']
+        df_roster = pd.read_parquet(ROSTER_URL, columns=roster_cols)
+    except:
+        df_roster = pd.DataFrame(columns=['gsis_id', 'position', 'full_name'])
+
+    # --- STEP 4: AGGREGATE (Only Players From Changed Weeks) ---
+    # Players in the new PBP for those weeks, plus the ones the last load saw
+    # there: a player whose only play was corrected away must lose it too.
+    ids = None
+    if not full_refresh:
+        with engine.connect() as conn:
+            ids = affected_players(df_pbp, changed_weeks) | get_week_players(conn, SEASON, changed_weeks)
+    if ids is None:
+        print("⚙️  Calculating 2025 Stats (full refresh)...")
+    else:
+        print(f"⚙️  Recalculating 2025 Stats for {len(ids)} affected players...")
+    final_df = aggregate_season(df_pbp, df_roster, ids)
+
+    # --- STEP 5: SAVE (Swap or Upsert) ---
+    if full_refresh:
+        # 0. Build 2025 off to the side and swap its partition in (2023/2024 untouched)
+        print(f"💾 Publishing {len(final_df)} fresh 2025 records...")
+        publish_season(engine, final_df, SEASON)
+
+    with engine.connect() as conn:
+        if not full_refresh:
+            # 1. Rewrite only the rows that changed
+            written, removed = upsert_players(conn, final_df, ids)
+            print(f"💾 Upserted {written} changed records, removed {removed} stale ones "
+                  f"({len(final_df) - written} unchanged).")
+
+        # 2. Remember what we loaded, in the same transaction as the data
+        save_week_checkpoints(conn, SEASON, {
+            w: (*hashes[w], affected_players(df_pbp, [w])) for w in changed_weeks
+        })
+
+        # 3. Tell the model service's answer cache the stats changed
+        bump_data_version(conn, SEASON)
+        conn.commit()
+
+        # 4. Re-rank every season for the player profile percentiles
+        rebuild_percentiles(conn)
+        conn.commit()
+
+        # 5. Re-materialize the /leaders boards
+        rebuild_leaderboards(conn)
         conn.commit()
-        
-        # 2. Append NEW 2025 data
-        print("   -> Inserting fresh 2025 data...")
-        final_df.to_sql('season_stats', engine, if_exists='append', index=False)
         
     print("✅ WEEKLY UPDATE COMPLETE. History preserved.")
 
 if __name__ == "__main__":
-    run_pipeline()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Weekly 2025 season_stats update")
+    parser.add_argument("--full", action="store_true", help="ignore week checkpoints and rebuild the whole season")
+    args = parser.parse_args()
+    run_pipeline(full_refresh=args.full)
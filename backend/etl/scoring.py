@@ -0,0 +1,105 @@
+# backend/etl/scoring.py
+import json
+import os
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+
+# Fantasy scoring, shared by the ETL (whole DataFrames at once) and the API
+# (one stats dict at a time). A profile is just points per unit of each stat.
+#
+# SCORING_PROFILE picks the default: "ppr", "half_ppr", "standard", or a path
+# to a league JSON file that overrides a base profile, e.g.
+#   {"base": "half_ppr", "passing_tds": 6, "interceptions": -1}
+
+STAT_COLUMNS = [
+    'passing_yards', 'passing_tds', 'interceptions',
+    'rushing_yards', 'rushing_tds',
+    'receiving_yards', 'receiving_tds', 'receptions',
+    'fumbles_lost',
+]
+
+PPR = {
+    'passing_yards': 1 / 25, 'passing_tds': 4, 'interceptions': -2,
+    'rushing_yards': 1 / 10, 'rushing_tds': 6,
+    'receiving_yards': 1 / 10, 'receiving_tds': 6, 'receptions': 1,
+    'fumbles_lost': -2,
+}
+
+PROFILES = {
+    "ppr": PPR,
+    "half_ppr": {**PPR, 'receptions': 0.5},
+    "standard": {**PPR, 'receptions': 0},
+}
+
+DEFAULT_PROFILE = os.getenv("SCORING_PROFILE", "ppr")
+
+
+@lru_cache(maxsize=32)
+def _load_named(spec):
+    if spec in PROFILES:
+        return PROFILES[spec]
+    with open(spec) as f:
+        custom = json.load(f)
+    return _merge(custom)
+
+
+def _merge(custom):
+    base = PROFILES[custom.get("base", "ppr")]
+    unknown = set(custom) - set(STAT_COLUMNS) - {"base"}
+    if unknown:
+        raise ValueError(f"Unknown scoring stats: {sorted(unknown)}")
+    return {**base, **{k: v for k, v in custom.items() if k != "base"}}
+
+
+def load_profile(profile=None):
+    """Profile name, path to a league JSON file, or a dict of overrides -> {stat: points}."""
+    profile = profile or DEFAULT_PROFILE
+    if isinstance(profile, dict):
+        return _merge(profile)
+    return _load_named(profile)
+
+
+def weight_vector(profile=None):
+    """Points per unit as an array in STAT_COLUMNS order."""
+    weights = load_profile(profile)
+    return np.array([weights[c] for c in STAT_COLUMNS], dtype=float)
+
+
+def score_array(stats, profile=None):
+    """
+    Scores a 2-D array whose columns are STAT_COLUMNS, one row per player(-week).
+    One matrix-vector product for the whole array.
+    """
+    points = np.nan_to_num(np.asarray(stats, dtype=float)) @ weight_vector(profile)
+    return np.round(points, 2)
+
+
+def score_frame(df, profile=None):
+    """Fantasy points for every row of a DataFrame. Missing stat columns count as 0."""
+    stats = df.reindex(columns=STAT_COLUMNS, fill_value=0)
+    return pd.Series(score_array(stats.to_numpy(dtype=float, na_value=0), profile), index=df.index)
+
+
+def score_row(stats, profile=None):
+    """Scalar fast path for one stats dict (API rows). None/missing count as 0."""
+    weights = load_profile(profile)
+    total = 0.0
+    for stat, points in weights.items():
+        value = stats.get(stat)
+        if value:
+            total += float(value) * points
+    return round(total, 2)
+
+
+def score_stats(stats, profile=None):
+    """
+    Points for an API stats row: the ETL's stored fantasy_points when present,
+    otherwise scored from the raw stats.
+    """
+    if not stats: return 0.0
+    try:
+        if stats.get('fantasy_points'): return float(stats.get('fantasy_points'))
+        return score_row(stats, profile)
+    except (TypeError, ValueError):
+        return 0.0
@@ -43,3 +43,65 @@ def update_state(season, week, source="pfr"):
             {"season": season, "week": week, "s": source}
         )
     print(f"ETL state updated: season {season}, week {week}")
+
+
+def bump_data_version(conn, season, source="nflverse"):
+    """
+    Marks that season_stats were reloaded. The model service's answer cache
+    keys on MAX(etl_state.updated_at), so this invalidates cached answers.
+    Runs on the caller's connection so it commits with the data itself.
+    """
+    result = conn.execute(
+        text("UPDATE etl_state SET last_season=:season, updated_at=now() WHERE source=:s"),
+        {"season": season, "s": source}
+    )
+    if result.rowcount == 0:
+        conn.execute(
+            text("""
+                INSERT INTO etl_state (source, last_season, last_week, updated_at)
+                VALUES (:s, :season, 0, now())
+            """),
+            {"season": season, "s": source}
+        )
+
+
+# ---------------------------------------------------------
+# PER-WEEK CHECKPOINTS (incremental ETL)
+# ---------------------------------------------------------
+def get_week_checkpoints(conn, season, source="nflverse_pbp"):
+    """Returns {week: content_hash} for every week already loaded."""
+    rows = conn.execute(
+        text("SELECT week, content_hash FROM etl_week_checkpoints WHERE source=:s AND season=:season"),
+        {"s": source, "season": season}
+    ).fetchall()
+    return {r.week: r.content_hash for r in rows}
+
+
+def get_week_players(conn, season, weeks, source="nflverse_pbp"):
+    """Player ids the last load saw in those weeks (so players a correction removed still get recomputed)."""
+    rows = conn.execute(
+        text("""
+            SELECT DISTINCT unnest(player_ids) AS player_id FROM etl_week_checkpoints
+            WHERE source=:s AND season=:season AND week = ANY(:weeks)
+        """),
+        {"s": source, "season": season, "weeks": list(weeks)}
+    ).fetchall()
+    return {r.player_id for r in rows}
+
+
+def save_week_checkpoints(conn, season, checkpoints, source="nflverse_pbp"):
+    """checkpoints: {week: (content_hash, row_count, player_ids)}. Runs in the caller's transaction."""
+    for week, (content_hash, row_count, player_ids) in checkpoints.items():
+        conn.execute(
+            text("""
+                INSERT INTO etl_week_checkpoints (source, season, week, content_hash, row_count, player_ids, updated_at)
+                VALUES (:s, :season, :week, :hash, :rows, :ids, now())
+                ON CONFLICT (source, season, week)
+                DO UPDATE SET content_hash = EXCLUDED.content_hash,
+                              row_count = EXCLUDED.row_count,
+                              player_ids = EXCLUDED.player_ids,
+                              updated_at = now()
+            """),
+            {"s": source, "season": season, "week": week, "hash": content_hash, "rows": row_count,
+             "ids": sorted(player_ids)}
+        )
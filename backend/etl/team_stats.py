@@ -0,0 +1,127 @@
+# backend/etl/team_stats.py
+import numpy as np
+import pandas as pd
+
+# Team offense/defense splits from play-by-play in one pass.
+# Each play is mapped to an integer "side" slot -- (game, home or away team
+# has the ball) -- and every stat is summed into those slots with one
+# np.bincount over the plays. The offense split is then the ~570 slots folded
+# by the team with the ball and the defense split the same slots folded by
+# the other team, so the PBP is only walked once and never grouped on strings.
+
+TEAM_PBP_COLUMNS = [
+    'season', 'game_id', 'posteam', 'defteam', 'home_team', 'home_score', 'away_score',
+    'yards_gained', 'touchdown', 'sack', 'interception', 'fumble_lost',
+]
+
+PLAY_STATS = ['yards_gained', 'touchdown', 'sack', 'interception', 'fumble_lost']
+
+# side sums -> (offense column, defense column)
+SPLITS = {
+    'yards_gained': ('off_total_yards', 'def_yards_allowed'),
+    'touchdown': ('off_total_tds', 'def_tds_allowed'),
+    'sack': ('off_sacks_allowed', 'def_sacks_made'),
+    'interception': ('off_interceptions', 'def_interceptions'),
+    'fumble_lost': ('off_fumbles_lost', 'def_fumbles_recovered'),
+    'points': ('off_points', 'def_points_allowed'),
+    'turnovers': ('off_turnovers', 'def_takeaways'),
+}
+
+# nflverse abbreviations that Pro-Football-Reference (and so teams.name) spells differently
+PFR_ABBREVIATIONS = {
+    'KC': 'KAN', 'GB': 'GNB', 'NE': 'NWE', 'NO': 'NOR',
+    'SF': 'SFO', 'TB': 'TAM', 'LV': 'LVR', 'LA': 'LAR',
+}
+
+# Yards per game come from etl/aggregate.py (off_yards_per_game, def_yards_allowed_per_game)
+PER_GAME = ['off_points', 'off_turnovers', 'def_points_allowed', 'def_takeaways']
+
+# The season_team_stats columns this module owns. etl/aggregate.py writes the
+# passing/rushing yard, TD and sack splits from the weekly PFR tables; the PBP
+# upsert only touches what the weekly tables can't produce, so neither writer
+# overwrites the other.
+PBP_COLUMNS = [
+    'games_played',
+    'off_total_tds', 'off_interceptions', 'off_fumbles_lost', 'off_sacks_allowed', 'off_points', 'off_turnovers',
+    'def_yards_allowed', 'def_tds_allowed', 'def_interceptions', 'def_fumbles_recovered',
+    'def_points_allowed', 'def_takeaways', 'turnover_margin',
+    'off_points_per_game', 'off_turnovers_per_game', 'def_points_allowed_per_game', 'def_takeaways_per_game',
+]
+
+
+def _floats(pbp, name):
+    return pbp[name].to_numpy(dtype=float, na_value=0.0)
+
+
+def game_sides(pbp):
+    """
+    One slot per (game, home or away team has the ball): summed stats, final
+    score, and the PBP row each slot's season / offense / defense is read from.
+    Only game_id is factorized over every play; team names are read for the
+    ~570 slot rows alone.
+    """
+    game_codes, _ = pd.factorize(pbp['game_id'])
+    is_home = (pbp['posteam'] == pbp['home_team']).to_numpy(dtype=bool, na_value=False)
+    keep = (pbp['posteam'].notna() & pbp['defteam'].notna()).to_numpy() & (game_codes >= 0)
+
+    n_slots = (game_codes.max() + 1) * 2 + 1 if len(pbp) else 1
+    side = np.where(keep, game_codes * 2 + is_home, n_slots - 1)   # dropped plays land in a spare slot
+
+    # 1. ONE PASS over the plays
+    slots = {
+        stat: np.bincount(side, weights=np.nan_to_num(_floats(pbp, stat)), minlength=n_slots)
+        for stat in PLAY_STATS
+    }
+
+    # 2. Who had the ball in each slot (constant within a slot, so any row will do)
+    first_row = np.full(n_slots, -1)
+    first_row[side[::-1]] = np.arange(len(side))[::-1]
+    used = first_row >= 0
+    used[-1] = False
+    rows = first_row[used]
+
+    slots = {stat: values[used] for stat, values in slots.items()}
+    slots['points'] = np.nan_to_num(np.where(is_home[rows], _floats(pbp, 'home_score')[rows], _floats(pbp, 'away_score')[rows]))
+    slots['turnovers'] = slots['interception'] + slots['fumble_lost']
+    return slots, pbp.iloc[rows][['season', 'posteam', 'defteam']].reset_index(drop=True)
+
+
+def aggregate_team_pbp(pbp):
+    """Season offense + defense (+ points, turnovers, per-game rates) per team from PBP rows."""
+    slots, owners = game_sides(pbp)
+
+    # 3. Fold the slots both ways: (season, team) -> one integer per team-season
+    team_codes, team_names = pd.factorize(pd.concat([owners['posteam'], owners['defteam']], ignore_index=True))
+    season_codes, season_values = pd.factorize(owners['season'])
+    n_teams = len(team_names)
+    n_keys = n_teams * len(season_values)
+    off_key = season_codes * n_teams + team_codes[:len(owners)]
+    def_key = season_codes * n_teams + team_codes[len(owners):]
+
+    columns = {'games_played': np.bincount(off_key, minlength=n_keys)}   # one slot per game played
+    for stat, (off, d) in SPLITS.items():
+        columns[off] = np.bincount(off_key, weights=slots[stat], minlength=n_keys)
+        columns[d] = np.bincount(def_key, weights=slots[stat], minlength=n_keys)
+    columns['turnover_margin'] = columns['def_takeaways'] - columns['off_turnovers']
+    games_played = np.maximum(columns['games_played'], 1)
+    for col in PER_GAME:
+        columns[f'{col}_per_game'] = np.round(columns[col] / games_played, 1)
+
+    present = (columns['games_played'] > 0) | (np.bincount(def_key, minlength=n_keys) > 0)
+    idx = np.flatnonzero(present)
+    return pd.DataFrame({
+        'team_id': np.asarray(team_names)[idx % n_teams],
+        'season': np.asarray(season_values)[idx // n_teams],
+        **{name: values[idx] for name, values in columns.items()},
+    })
+
+
+def with_team_ids(team_stats, team_map):
+    """
+    Swaps the PBP abbreviations in team_id for teams.id (team_map: {name: id}),
+    trying the name as-is and then its PFR spelling. Returns (frame, unmatched abbreviations).
+    """
+    abbreviations = team_stats['team_id']
+    ids = abbreviations.map(team_map).fillna(abbreviations.map(PFR_ABBREVIATIONS).map(team_map))
+    unmatched = sorted(abbreviations[ids.isna()].unique())
+    return team_stats.assign(team_id=ids.astype('Int64'))[ids.notna()], unmatched
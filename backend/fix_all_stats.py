@@ -2,25 +2,23 @@ import pandas as pd
 import numpy as np
 from database import engine
 from sqlalchemy import text
-
-def calculate_fantasy_points(row):
-    """Standard PPR Fantasy Calculation"""
-    pass_pts = (row.get('passing_yards', 0) / 25) + (row.get('passing_tds', 0) * 4) - (row.get('interceptions', 0) * 2)
-    rush_pts = (row.get('rushing_yards', 0) / 10) + (row.get('rushing_tds', 0) * 6)
-    rec_pts = (row.get('receiving_yards', 0) / 10) + (row.get('receiving_tds', 0) * 6) + (row.get('receptions', 0) * 1)
-    fum_pts = (row.get('fumbles_lost', 0) * -2)
-    return round(pass_pts + rush_pts + rec_pts + fum_pts, 2)
+from etl.bulk_load import bulk_load
+from etl.migrate import apply_migrations
+from etl.pbp_store import read_pbp
+from etl.state import bump_data_version
+from etl.leaderboards import rebuild_leaderboards
+from etl.percentiles import rebuild_percentiles
+from etl.scoring import score_frame
 
 def run_fix():
     print("🚑 STARTING ROBUST DATA REPAIR (2023-2025)...")
     
     YEARS = [2023, 2024, 2025]
-    BASE_URL = "https://github.com/nflverse/nflverse-data/releases/download/pbp/play_by_play_{}.csv.gz"
     
     all_stats = []
 
     for year in YEARS:
-        print(f"\n📥 Downloading {year} Data...")
+        print(f"\n📥 Loading {year} Data...")
         try:
             # Load specific columns to save memory & ensure accuracy
             cols = [
@@ -28,7 +26,7 @@ def run_fix():
                 'receiver_player_id', 'receiver_player_name', 'passing_yards', 'rushing_yards', 'receiving_yards',
                 'pass_touchdown', 'rush_touchdown', 'interception', 'fumble_lost', 'sack', 'complete_pass'
             ]
-            df = pd.read_csv(BASE_URL.format(year), compression='gzip', usecols=lambda c: c in cols, low_memory=False)
+            df = read_pbp(year, columns=cols)
             
             # --- 1. PASSING STATS ---
             # Group by Passer ID. Sum 'pass_touchdown' for TDs.
@@ -85,7 +83,7 @@ def run_fix():
             merged = merged.fillna(0)
 
             # --- 5. CALCULATE FANTASY ---
-            merged['fantasy_points'] = merged.apply(calculate_fantasy_points, axis=1)
+            merged['fantasy_points'] = score_frame(merged)
             merged = merged[merged['fantasy_points'] != 0] # Clean garbage
 
             # --- 🕵️‍♂️ SPY MODE: Verify Christian McCaffrey ---
@@ -116,7 +114,16 @@ def run_fix():
         final_df = final_df[final_cols]
         
         print(f"\n💾 Overwriting database with {len(final_df)} clean rows...")
-        final_df.to_sql('season_stats', engine, if_exists='replace', index=False)
+        with engine.begin() as conn:
+            apply_migrations(conn)
+            bulk_load(conn, final_df, 'season_stats', mode='reload')
+            bump_data_version(conn, max(YEARS))   # invalidates cached chat answers
+
+        # 7. REFRESH SNAPSHOTS (/leaders and profile percentiles read these, not season_stats)
+        print("🏆 Rebuilding leaderboards & percentiles...")
+        with engine.begin() as conn:
+            rebuild_percentiles(conn)
+            rebuild_leaderboards(conn)
         print("✅ DATABASE REPAIR COMPLETE.")
 
 if __name__ == "__main__":
@@ -1,6 +1,7 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from api.routes import players, teams, leaders, chat, predict 
+from ml.model_client import model_client
 
 app = FastAPI()
 
@@ -24,4 +25,9 @@ app.include_router(predict.router, prefix="/predict", tags=["ML Predictions"]) #
 # 3. HEALTH CHECK
 @app.get("/")
 def read_root():
-    return {"status": "NFL Analytics Brain is Online 🧠"}
\ No newline at end of file
+    return {"status": "NFL Analytics Brain is Online 🧠"}
+
+# 4. SHUTDOWN (close pooled model-service connections)
+@app.on_event("shutdown")
+async def close_model_client():
+    await model_client.aclose()
\ No newline at end of file
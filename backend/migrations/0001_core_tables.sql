@@ -0,0 +1,257 @@
+-- 0001: tables the seed scripts and loaders write into.
+-- Until now these were created by to_sql from whatever frame arrived first.
+-- CREATE ... IF NOT EXISTS plus ADD COLUMN IF NOT EXISTS, so an existing
+-- database keeps its rows and only gains what it is missing.
+
+-- Players (roster seeds + players created by the weekly loaders)
+CREATE TABLE IF NOT EXISTS players (
+    player_id SERIAL PRIMARY KEY,
+    gsis_id TEXT,
+    name TEXT,
+    position TEXT,
+    team_id TEXT,
+    headshot_url TEXT,
+    espn_id TEXT,
+    sleeper_id TEXT,
+    yahoo_id TEXT
+);
+ALTER TABLE players
+    ADD COLUMN IF NOT EXISTS gsis_id TEXT,
+    ADD COLUMN IF NOT EXISTS headshot_url TEXT,
+    ADD COLUMN IF NOT EXISTS espn_id TEXT,
+    ADD COLUMN IF NOT EXISTS sleeper_id TEXT,
+    ADD COLUMN IF NOT EXISTS yahoo_id TEXT;
+DO $$ BEGIN
+    -- Roster-seeded tables have no integer key; give every row one
+    IF NOT EXISTS (SELECT 1 FROM information_schema.columns
+                   WHERE table_schema = current_schema() AND table_name = 'players' AND column_name = 'player_id') THEN
+        ALTER TABLE players ADD COLUMN player_id SERIAL;
+    END IF;
+    IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conrelid = 'players'::regclass AND contype = 'p') THEN
+        ALTER TABLE players ADD PRIMARY KEY (player_id);
+    END IF;
+END $$;
+
+-- Season totals per (player, team), one LIST partition per season (see etl/publish.py)
+CREATE TABLE IF NOT EXISTS season_stats (
+    gsis_id TEXT,
+    season INTEGER,
+    team_id TEXT,
+    player_name TEXT,
+    position TEXT,
+    passing_yards NUMERIC,
+    passing_tds NUMERIC,
+    interceptions NUMERIC,
+    sacks_taken NUMERIC,
+    passing_epa NUMERIC,
+    rushing_yards NUMERIC,
+    rushing_tds NUMERIC,
+    fumbles_lost NUMERIC,
+    rushing_epa NUMERIC,
+    receptions NUMERIC,
+    receiving_yards NUMERIC,
+    receiving_tds NUMERIC,
+    receiving_epa NUMERIC,
+    wopr NUMERIC,
+    target_share NUMERIC,
+    fantasy_points NUMERIC
+) PARTITION BY LIST (season);
+CREATE TABLE IF NOT EXISTS season_stats_default PARTITION OF season_stats DEFAULT;
+ALTER TABLE season_stats
+    ADD COLUMN IF NOT EXISTS team_id TEXT,
+    ADD COLUMN IF NOT EXISTS player_name TEXT,
+    ADD COLUMN IF NOT EXISTS position TEXT,
+    ADD COLUMN IF NOT EXISTS sacks_taken NUMERIC,
+    ADD COLUMN IF NOT EXISTS passing_epa NUMERIC,
+    ADD COLUMN IF NOT EXISTS fumbles_lost NUMERIC,
+    ADD COLUMN IF NOT EXISTS rushing_epa NUMERIC,
+    ADD COLUMN IF NOT EXISTS receptions NUMERIC,
+    ADD COLUMN IF NOT EXISTS receiving_epa NUMERIC,
+    ADD COLUMN IF NOT EXISTS wopr NUMERIC,
+    ADD COLUMN IF NOT EXISTS target_share NUMERIC,
+    ADD COLUMN IF NOT EXISTS fantasy_points NUMERIC;
+
+-- Team offense/defense splits (etl/aggregate.py from weekly tables, fix_team_stats.py from PBP),
+-- both keyed on teams.id
+CREATE TABLE IF NOT EXISTS season_team_stats (
+    team_id INTEGER NOT NULL,
+    season INTEGER NOT NULL,
+    games_played NUMERIC,
+    off_games_played NUMERIC,
+    off_passing_yards NUMERIC,
+    off_rushing_yards NUMERIC,
+    off_total_yards NUMERIC,
+    off_passing_tds NUMERIC,
+    off_rushing_tds NUMERIC,
+    off_total_tds NUMERIC,
+    off_interceptions_thrown NUMERIC,
+    off_interceptions NUMERIC,
+    off_fumbles_lost NUMERIC,
+    off_sacks_allowed NUMERIC,
+    off_turnovers NUMERIC,
+    off_points NUMERIC,
+    def_passing_yards_allowed NUMERIC,
+    def_rushing_yards_allowed NUMERIC,
+    def_total_yards_allowed NUMERIC,
+    def_yards_allowed NUMERIC,
+    def_passing_tds_allowed NUMERIC,
+    def_rushing_tds_allowed NUMERIC,
+    def_tds_allowed NUMERIC,
+    def_sacks_made NUMERIC,
+    def_interceptions NUMERIC,
+    def_fumbles_recovered NUMERIC,
+    def_takeaways NUMERIC,
+    def_points_allowed NUMERIC,
+    turnover_margin NUMERIC,
+    off_yards_per_game NUMERIC,
+    off_points_per_game NUMERIC,
+    off_total_yards_per_game NUMERIC,
+    off_turnovers_per_game NUMERIC,
+    def_yards_allowed_per_game NUMERIC,
+    def_points_allowed_per_game NUMERIC,
+    def_takeaways_per_game NUMERIC,
+    PRIMARY KEY (team_id, season)
+);
+ALTER TABLE season_team_stats
+    ADD COLUMN IF NOT EXISTS games_played NUMERIC,
+    ADD COLUMN IF NOT EXISTS off_total_tds NUMERIC,
+    ADD COLUMN IF NOT EXISTS off_interceptions NUMERIC,
+    ADD COLUMN IF NOT EXISTS off_fumbles_lost NUMERIC,
+    ADD COLUMN IF NOT EXISTS off_sacks_allowed NUMERIC,
+    ADD COLUMN IF NOT EXISTS off_turnovers NUMERIC,
+    ADD COLUMN IF NOT EXISTS off_points NUMERIC,
+    ADD COLUMN IF NOT EXISTS def_yards_allowed NUMERIC,
+    ADD COLUMN IF NOT EXISTS def_tds_allowed NUMERIC,
+    ADD COLUMN IF NOT EXISTS def_interceptions NUMERIC,
+    ADD COLUMN IF NOT EXISTS def_fumbles_recovered NUMERIC,
+    ADD COLUMN IF NOT EXISTS def_takeaways NUMERIC,
+    ADD COLUMN IF NOT EXISTS def_points_allowed NUMERIC,
+    ADD COLUMN IF NOT EXISTS turnover_margin NUMERIC,
+    ADD COLUMN IF NOT EXISTS off_yards_per_game NUMERIC,
+    ADD COLUMN IF NOT EXISTS off_points_per_game NUMERIC,
+    ADD COLUMN IF NOT EXISTS off_total_yards_per_game NUMERIC,
+    ADD COLUMN IF NOT EXISTS off_turnovers_per_game NUMERIC,
+    ADD COLUMN IF NOT EXISTS def_yards_allowed_per_game NUMERIC,
+    ADD COLUMN IF NOT EXISTS def_points_allowed_per_game NUMERIC,
+    ADD COLUMN IF NOT EXISTS def_takeaways_per_game NUMERIC;
+DO $$
+DECLARE
+    key_type TEXT;
+BEGIN
+    -- The old fix_team_stats wrote abbreviations ('KC') next to aggregate.py's integer ids
+    SELECT data_type INTO key_type FROM information_schema.columns
+    WHERE table_schema = current_schema() AND table_name = 'season_team_stats' AND column_name = 'team_id';
+    IF key_type = 'text' THEN
+        IF to_regclass('teams') IS NOT NULL THEN
+            -- An id-keyed row for the same team-season wins; the rest are re-keyed
+            DELETE FROM season_team_stats s USING teams t
+            WHERE t.name = s.team_id
+              AND EXISTS (SELECT 1 FROM season_team_stats k WHERE k.team_id = t.id::text AND k.season = s.season);
+            UPDATE season_team_stats s SET team_id = t.id::text FROM teams t WHERE t.name = s.team_id;
+        END IF;
+        DELETE FROM season_team_stats WHERE team_id !~ '^[0-9]+$';   -- unmapped: fix_team_stats rebuilds them
+    END IF;
+    IF key_type <> 'integer' THEN
+        ALTER TABLE season_team_stats ALTER COLUMN team_id TYPE INTEGER USING team_id::text::numeric::integer;
+    END IF;
+    IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conrelid = 'season_team_stats'::regclass AND contype IN ('p', 'u')) THEN
+        ALTER TABLE season_team_stats ADD PRIMARY KEY (team_id, season);
+    END IF;
+END $$;
+
+-- Team defense from the seed scripts
+CREATE TABLE IF NOT EXISTS team_season_stats (
+    team_id TEXT NOT NULL,
+    season INTEGER NOT NULL,
+    def_sacks_made NUMERIC,
+    def_interceptions NUMERIC,
+    def_fumbles_recovered NUMERIC,
+    PRIMARY KEY (team_id, season)
+);
+
+-- nflverse weekly player stats from the seed scripts
+CREATE TABLE IF NOT EXISTS weekly_stats (
+    gsis_id TEXT,
+    season INTEGER,
+    week INTEGER,
+    team_id TEXT,
+    completions NUMERIC,
+    attempts NUMERIC,
+    passing_yards NUMERIC,
+    passing_tds NUMERIC,
+    interceptions NUMERIC,
+    sacks NUMERIC,
+    passing_epa NUMERIC,
+    carries NUMERIC,
+    rushing_yards NUMERIC,
+    rushing_tds NUMERIC,
+    rushing_epa NUMERIC,
+    targets NUMERIC,
+    receptions NUMERIC,
+    receiving_yards NUMERIC,
+    receiving_tds NUMERIC,
+    receiving_epa NUMERIC,
+    wopr NUMERIC,
+    target_share NUMERIC,
+    air_yards_share NUMERIC,
+    fantasy_points NUMERIC
+);
+
+-- PFR weekly tables (etl/load_stats.py); keys are stamped through player_ids
+CREATE TABLE IF NOT EXISTS weekly_passing_stats (
+    season INTEGER NOT NULL,
+    week INTEGER NOT NULL,
+    player_id INTEGER,
+    team_id INTEGER,
+    opponent_id INTEGER,
+    pfr_player_id TEXT,
+    player_name TEXT,
+    team TEXT,
+    opponent TEXT,
+    completions NUMERIC,
+    attempts NUMERIC,
+    passing_yards NUMERIC,
+    passing_tds NUMERIC,
+    interceptions NUMERIC,
+    sacks NUMERIC,
+    sack_yards NUMERIC,
+    passer_rating NUMERIC,
+    qbr NUMERIC,
+    longest_pass NUMERIC,
+    first_downs NUMERIC,
+    fourth_qtr_comebacks NUMERIC,
+    game_winning_drives NUMERIC
+);
+
+CREATE TABLE IF NOT EXISTS weekly_rushing_stats (
+    season INTEGER NOT NULL,
+    week INTEGER NOT NULL,
+    player_id INTEGER,
+    team_id INTEGER,
+    opponent_id INTEGER,
+    pfr_player_id TEXT,
+    player_name TEXT,
+    team TEXT,
+    opponent TEXT,
+    carries NUMERIC,
+    rushing_yards NUMERIC,
+    rushing_tds NUMERIC,
+    longest_rush NUMERIC
+);
+
+CREATE TABLE IF NOT EXISTS weekly_receiving_stats (
+    season INTEGER NOT NULL,
+    week INTEGER NOT NULL,
+    player_id INTEGER,
+    team_id INTEGER,
+    opponent_id INTEGER,
+    pfr_player_id TEXT,
+    player_name TEXT,
+    team TEXT,
+    opponent TEXT,
+    targets NUMERIC,
+    receptions NUMERIC,
+    receiving_yards NUMERIC,
+    receiving_tds NUMERIC,
+    longest_reception NUMERIC
+);
@@ -0,0 +1,73 @@
+-- 0002: the indexes the API routes read through.
+-- Reload scripts TRUNCATE + COPY into these tables now, so the indexes
+-- survive a reseed instead of being dropped with the table.
+
+-- The old to_sql seeds never enforced one row per gsis_id. Extra rows nothing
+-- points at are dropped (lowest player_id kept); if a duplicate is referenced
+-- by stats, stop with a message instead of guessing which player is right.
+DO $$
+DECLARE
+    ref TEXT;
+    left_over BIGINT;
+BEGIN
+    CREATE TEMP TABLE players_dupes AS
+    SELECT player_id FROM (
+        SELECT player_id, ROW_NUMBER() OVER (PARTITION BY gsis_id ORDER BY player_id) AS n
+        FROM players WHERE gsis_id IS NOT NULL
+    ) ranked
+    WHERE n > 1;
+
+    FOREACH ref IN ARRAY ARRAY[
+        'player_ids', 'player_week', 'weekly_passing_stats', 'weekly_rushing_stats', 'weekly_receiving_stats',
+        'season_passing_stats', 'season_rushing_stats', 'season_receiving_stats'
+    ] LOOP
+        IF to_regclass(ref) IS NOT NULL THEN
+            EXECUTE 'DELETE FROM players_dupes d USING ' || quote_ident(ref) || ' r WHERE r.player_id = d.player_id';
+        END IF;
+    END LOOP;
+
+    DELETE FROM players p USING players_dupes d WHERE p.player_id = d.player_id;
+    DROP TABLE players_dupes;
+
+    SELECT COUNT(*) INTO left_over FROM (
+        SELECT gsis_id FROM players WHERE gsis_id IS NOT NULL GROUP BY gsis_id HAVING COUNT(*) > 1
+    ) dupes;
+    IF left_over > 0 THEN
+        RAISE EXCEPTION USING
+            MESSAGE = left_over || ' gsis_ids have several players rows that stats still point at; merge them before migrating',
+            HINT = 'SELECT gsis_id, array_agg(player_id) FROM players GROUP BY gsis_id HAVING COUNT(*) > 1';
+    END IF;
+END $$;
+
+-- Profile, chat and predict look players up by gsis_id; compare/draft by player_id (the PK)
+CREATE UNIQUE INDEX IF NOT EXISTS players_gsis_id ON players (gsis_id);
+
+-- Profile/chat/predict: WHERE gsis_id = :pid [AND season = ...].
+-- Also the ON CONFLICT key of the run_etl upsert (etl/publish.ensure_partitioned uses the same name).
+CREATE UNIQUE INDEX IF NOT EXISTS ux_season_stats_gsis_id_season_team_id
+    ON season_stats (gsis_id, season, team_id);
+-- Leaderboards, percentiles and the live leaders fallback: one season by points
+CREATE INDEX IF NOT EXISTS season_stats_season_points ON season_stats (season, fantasy_points DESC);
+
+-- Teams list/leaders: WHERE season = ... (team_id, season is the PK)
+CREATE INDEX IF NOT EXISTS season_team_stats_season ON season_team_stats (season);
+
+-- Seed tables
+CREATE INDEX IF NOT EXISTS weekly_stats_gsis_season_week ON weekly_stats (gsis_id, season, week);
+
+-- PFR weekly tables: the per-week DELETE in load_stats, aggregate scoping,
+-- and the integer keys the weekly loaders stamp (etl/player_ids.stamp_keys)
+CREATE INDEX IF NOT EXISTS weekly_passing_stats_season_week ON weekly_passing_stats (season, week);
+CREATE INDEX IF NOT EXISTS weekly_passing_stats_player_season ON weekly_passing_stats (player_id, season);
+CREATE INDEX IF NOT EXISTS weekly_passing_stats_team_season ON weekly_passing_stats (team_id, season);
+CREATE INDEX IF NOT EXISTS weekly_passing_stats_opponent_season ON weekly_passing_stats (opponent_id, season);
+
+CREATE INDEX IF NOT EXISTS weekly_rushing_stats_season_week ON weekly_rushing_stats (season, week);
+CREATE INDEX IF NOT EXISTS weekly_rushing_stats_player_season ON weekly_rushing_stats (player_id, season);
+CREATE INDEX IF NOT EXISTS weekly_rushing_stats_team_season ON weekly_rushing_stats (team_id, season);
+CREATE INDEX IF NOT EXISTS weekly_rushing_stats_opponent_season ON weekly_rushing_stats (opponent_id, season);
+
+CREATE INDEX IF NOT EXISTS weekly_receiving_stats_season_week ON weekly_receiving_stats (season, week);
+CREATE INDEX IF NOT EXISTS weekly_receiving_stats_player_season ON weekly_receiving_stats (player_id, season);
+CREATE INDEX IF NOT EXISTS weekly_receiving_stats_team_season ON weekly_receiving_stats (team_id, season);
+CREATE INDEX IF NOT EXISTS weekly_receiving_stats_opponent_season ON weekly_receiving_stats (opponent_id, season);
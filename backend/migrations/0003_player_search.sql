@@ -0,0 +1,19 @@
+-- 0003: indexes behind api/nlp/player_search (name prefix, substring and typo lookups).
+-- These used to be created by the API on its first search request.
+
+-- Prefix search: lower(name) LIKE with a trailing wildcard
+CREATE INDEX IF NOT EXISTS idx_players_name_prefix ON players (lower(name) text_pattern_ops);
+
+-- Substring / fuzzy search needs pg_trgm. Managed databases may not let this
+-- role install it; then the API falls back to its in-process index instead
+-- of the migration failing.
+DO $$ BEGIN
+    BEGIN
+        CREATE EXTENSION IF NOT EXISTS pg_trgm;
+    EXCEPTION WHEN insufficient_privilege OR undefined_file THEN
+        RAISE NOTICE USING MESSAGE = 'pg_trgm not installed (' || SQLERRM || '), player search will run in-process';
+    END;
+    IF EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm') THEN
+        EXECUTE 'CREATE INDEX IF NOT EXISTS idx_players_name_trgm ON players USING gin (lower(name) gin_trgm_ops)';
+    END IF;
+END $$;
@@ -0,0 +1,157 @@
+-- 0004: the ETL's own tables, previously created on every call by the
+-- modules that write them, plus season_team_stats cleanup.
+
+-- off_total_yards_per_game duplicated off_yards_per_game (etl/aggregate.py owns yards per game)
+ALTER TABLE season_team_stats DROP COLUMN IF EXISTS off_total_yards_per_game;
+
+-- Player season totals (etl/aggregate.py), one row per (player, season).
+-- A player traded mid-season is credited to the team of their latest week.
+CREATE TABLE IF NOT EXISTS season_passing_stats (
+    player_id INTEGER NOT NULL,
+    season INTEGER NOT NULL,
+    team_id INTEGER,
+    games_played INTEGER,
+    completions NUMERIC,
+    attempts NUMERIC,
+    completion_pct NUMERIC,
+    passing_yards NUMERIC,
+    passing_tds NUMERIC,
+    interceptions NUMERIC,
+    sacks NUMERIC,
+    sack_yards NUMERIC,
+    passer_rating NUMERIC,
+    qbr NUMERIC,
+    longest_pass NUMERIC,
+    first_downs NUMERIC,
+    fourth_qtr_comebacks NUMERIC,
+    game_winning_drives NUMERIC,
+    PRIMARY KEY (player_id, season)
+);
+
+CREATE TABLE IF NOT EXISTS season_rushing_stats (
+    player_id INTEGER NOT NULL,
+    season INTEGER NOT NULL,
+    team_id INTEGER,
+    games_played INTEGER,
+    carries NUMERIC,
+    rushing_yards NUMERIC,
+    rushing_tds NUMERIC,
+    yards_per_carry NUMERIC,
+    rushing_yards_per_game NUMERIC,
+    longest_rush NUMERIC,
+    PRIMARY KEY (player_id, season)
+);
+
+CREATE TABLE IF NOT EXISTS season_receiving_stats (
+    player_id INTEGER NOT NULL,
+    season INTEGER NOT NULL,
+    team_id INTEGER,
+    games_played INTEGER,
+    targets NUMERIC,
+    receptions NUMERIC,
+    receiving_yards NUMERIC,
+    receiving_tds NUMERIC,
+    yards_per_reception NUMERIC,
+    receptions_per_game NUMERIC,
+    receiving_yards_per_game NUMERIC,
+    longest_reception NUMERIC,
+    PRIMARY KEY (player_id, season)
+);
+
+-- Incremental ETL checkpoints (etl/state.py): one row per loaded PBP week,
+-- with the players it contained so a corrected week also fixes players it lost
+CREATE TABLE IF NOT EXISTS etl_week_checkpoints (
+    source TEXT NOT NULL,
+    season INTEGER NOT NULL,
+    week INTEGER NOT NULL,
+    content_hash TEXT NOT NULL,
+    row_count INTEGER NOT NULL,
+    player_ids TEXT[],
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    PRIMARY KEY (source, season, week)
+);
+ALTER TABLE etl_week_checkpoints ADD COLUMN IF NOT EXISTS player_ids TEXT[];
+
+-- Fantasy-point distribution for the profile percentile (etl/percentiles.py).
+-- The primary key is the (season, position, fantasy_points) index the lookup seeks on.
+CREATE TABLE IF NOT EXISTS season_percentiles (
+    season INTEGER NOT NULL,
+    position TEXT NOT NULL,
+    fantasy_points DOUBLE PRECISION NOT NULL,
+    at_or_below INTEGER NOT NULL,
+    total INTEGER NOT NULL,
+    PRIMARY KEY (season, position, fantasy_points)
+);
+
+-- Materialized /leaders boards (etl/leaderboards.py) and the latest refresh (one row)
+CREATE TABLE IF NOT EXISTS leaderboard_snapshots (
+    season INTEGER NOT NULL,
+    category TEXT NOT NULL,
+    position TEXT NOT NULL,
+    rank INTEGER NOT NULL,
+    gsis_id TEXT,
+    name TEXT,
+    team_id TEXT,
+    value DOUBLE PRECISION NOT NULL,
+    headshot_url TEXT,
+    PRIMARY KEY (season, category, position, rank)
+);
+CREATE TABLE IF NOT EXISTS leaderboard_refreshes (
+    refreshed_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    duration_ms DOUBLE PRECISION NOT NULL,
+    row_count INTEGER NOT NULL
+);
+-- Older databases logged every refresh; only the latest one is ever read
+DELETE FROM leaderboard_refreshes
+WHERE refreshed_at < (SELECT MAX(refreshed_at) FROM leaderboard_refreshes);
+
+-- Player id crosswalk (etl/player_ids.py): players.player_id -> PFR / gsis / espn / sleeper / yahoo ids
+CREATE TABLE IF NOT EXISTS player_ids (
+    player_id INTEGER PRIMARY KEY,
+    pfr_id TEXT UNIQUE,
+    gsis_id TEXT UNIQUE,
+    espn_id TEXT,
+    sleeper_id TEXT,
+    yahoo_id TEXT,
+    name TEXT NOT NULL,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+CREATE INDEX IF NOT EXISTS player_ids_espn_id ON player_ids (espn_id);
+CREATE INDEX IF NOT EXISTS player_ids_sleeper_id ON player_ids (sleeper_id);
+CREATE INDEX IF NOT EXISTS player_ids_yahoo_id ON player_ids (yahoo_id);
+
+-- Player-week facts (etl/player_week.py): passing, rushing and receiving side
+-- by side. Compare / game logs read one player by PK, draft reads one season.
+CREATE TABLE IF NOT EXISTS player_week (
+    player_id INTEGER NOT NULL,
+    season INTEGER NOT NULL,
+    week INTEGER NOT NULL,
+    team_id INTEGER,
+    opponent_id INTEGER,
+    completions NUMERIC,
+    attempts NUMERIC,
+    passing_yards NUMERIC,
+    passing_tds NUMERIC,
+    interceptions NUMERIC,
+    sacks NUMERIC,
+    sack_yards NUMERIC,
+    passer_rating NUMERIC,
+    qbr NUMERIC,
+    longest_pass NUMERIC,
+    first_downs NUMERIC,
+    fourth_qtr_comebacks NUMERIC,
+    game_winning_drives NUMERIC,
+    carries NUMERIC,
+    rushing_yards NUMERIC,
+    rushing_tds NUMERIC,
+    longest_rush NUMERIC,
+    targets NUMERIC,
+    receptions NUMERIC,
+    receiving_yards NUMERIC,
+    receiving_tds NUMERIC,
+    longest_reception NUMERIC,
+    total_yards NUMERIC NOT NULL DEFAULT 0,
+    total_tds NUMERIC NOT NULL DEFAULT 0,
+    PRIMARY KEY (player_id, season, week)
+);
+CREATE INDEX IF NOT EXISTS player_week_season_week ON player_week (season, week);
@@ -0,0 +1,141 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from sqlalchemy import text
+from database import engine
+from ml.backends import MODEL_NAME, RAG_BACKEND
+
+# Flan-T5 runs with do_sample=False and the prompt embeds the DB fact, so the
+# same prompt always gives the same answer until the ETL reloads the stats.
+# Entries are keyed on (model + backend + data version, generation kwargs,
+# normalized prompt): torch, int8 and onnx don't produce identical text, so a
+# restart on another RAG_BACKEND must not serve the old backend's disk rows.
+
+CACHE_SIZE = int(os.getenv("ANSWER_CACHE_SIZE", "2048"))
+CACHE_TTL = float(os.getenv("ANSWER_CACHE_TTL", "86400"))        # seconds
+CACHE_DB = os.getenv("ANSWER_CACHE_DB")                           # optional SQLite file, e.g. data/answer_cache.db
+VERSION_CHECK_INTERVAL = float(os.getenv("ANSWER_CACHE_VERSION_CHECK", "60"))
+
+
+def normalize_prompt(prompt):
+    """Case, spacing and trailing punctuation don't change what the user asked."""
+    prompt = re.sub(r"\s+", " ", prompt.lower()).strip()
+    return re.sub(r"[?!.\s]+$", "", prompt)
+
+
+def get_data_version():
+    """Last time the ETL touched etl_state. Every stats reload moves this forward."""
+    with engine.connect() as conn:
+        version = conn.execute(text("SELECT MAX(updated_at) FROM etl_state")).scalar()
+    return str(version)
+
+
+class AnswerCache:
+    """
+    Two tiers: an in-process LRU with TTL, and an optional SQLite file that
+    survives restarts and is shared by every model-service worker.
+    """
+
+    def __init__(self, maxsize=CACHE_SIZE, ttl=CACHE_TTL, db_path=CACHE_DB, version_fn=get_data_version,
+                 model_tag=f"{MODEL_NAME}/{RAG_BACKEND}"):
+        self.maxsize = maxsize
+        self.model_tag = model_tag
+        self.ttl = ttl
+        self.version_fn = version_fn
+        self.version = None
+        self.version_checked = 0.0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()    # key -> (expires_at, answer)
+        self._lock = threading.Lock()
+        self._db = None
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS answers (key TEXT PRIMARY KEY, version TEXT, answer TEXT, expires_at REAL)"
+            )
+            self._db.commit()
+
+    def _current_version(self):
+        now = time.monotonic()
+        if self.version is None or now - self.version_checked > VERSION_CHECK_INTERVAL:
+            try:
+                version = f"{self.model_tag}@{self.version_fn()}"
+            except Exception as e:
+                print(f"⚠️ Answer cache: could not read data version ({e})")
+                version = self.version or f"{self.model_tag}@unknown"
+            if version != self.version:
+                # New stats: everything cached so far describes the old data.
+                # Disk rows from this version (written before a restart) stay valid.
+                with self._lock:
+                    self._entries.clear()
+                    if self._db is not None:
+                        self._db.execute("DELETE FROM answers WHERE version != ?", (version,))
+                        self._db.commit()
+                self.version = version
+            self.version_checked = now
+        return self.version
+
+    def _key(self, prompt, gen_kwargs):
+        raw = json.dumps([self._current_version(), sorted(gen_kwargs.items()), normalize_prompt(prompt)])
+        return hashlib.sha1(raw.encode()).hexdigest()
+
+    def get(self, prompt, gen_kwargs, count=True):
+        """count=False keeps lookups that aren't answers (e.g. facts) out of the hit rate."""
+        key = self._key(prompt, gen_kwargs)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > now:
+                self._entries.move_to_end(key)
+                self.hits += count
+                return entry[1]
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT answer, expires_at FROM answers WHERE key = ?", (key,)
+                ).fetchone()
+                if row and row[1] > now:
+                    self._remember(key, row[0], row[1])
+                    self.hits += count
+                    return row[0]
+
+            self.misses += count
+            return None
+
+    def put(self, prompt, gen_kwargs, answer):
+        key = self._key(prompt, gen_kwargs)
+        version = self.version
+        expires_at = time.time() + self.ttl
+        with self._lock:
+            self._remember(key, answer, expires_at)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO answers (key, version, answer, expires_at) VALUES (?, ?, ?, ?)",
+                    (key, version, answer, expires_at),
+                )
+                self._db.commit()
+
+    def _remember(self, key, answer, expires_at):
+        self._entries[key] = (expires_at, answer)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+            "data_version": self.version,
+        }
+
+
+answer_cache = AnswerCache()
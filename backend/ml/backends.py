@@ -0,0 +1,66 @@
+import os
+from pathlib import Path
+
+# Inference backends for the RAG model. All of them return a regular HF
+# text2text-generation pipeline, so RAGEngine doesn't care which one it got.
+#   torch - fp32 PyTorch eager (the original setup)
+#   int8  - PyTorch with dynamic int8 quantization of the Linear layers
+#   onnx  - ONNX Runtime export (encoder + decoder with KV cache) via optimum
+# transformers/torch are imported inside the loaders: importing them alone
+# takes seconds, and the model service should bind its port before that.
+MODEL_NAME = "google/flan-t5-small"
+RAG_BACKEND = os.getenv("RAG_BACKEND", "torch")
+ONNX_DIR = Path(os.getenv("RAG_ONNX_DIR", Path(__file__).parent / "onnx" / "flan-t5-small"))
+
+
+def load_torch():
+    from transformers import pipeline
+    return pipeline("text2text-generation", model=MODEL_NAME)
+
+
+def load_int8():
+    import torch
+    from transformers import pipeline, AutoTokenizer, AutoModelForSeq2SeqLM
+    tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME)
+    model = AutoModelForSeq2SeqLM.from_pretrained(MODEL_NAME)
+    # Weights are stored as int8, activations are quantized on the fly. No calibration data needed.
+    model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    return pipeline("text2text-generation", model=model, tokenizer=tokenizer)
+
+
+def load_onnx():
+    from optimum.onnxruntime import ORTModelForSeq2SeqLM
+    from transformers import pipeline, AutoTokenizer
+
+    # 1. EXPORT ONCE (a few seconds), later boots load the cached .onnx files
+    if not (ONNX_DIR / "config.json").exists():
+        print(f"📦 Exporting {MODEL_NAME} to ONNX ({ONNX_DIR})...")
+        model = ORTModelForSeq2SeqLM.from_pretrained(MODEL_NAME, export=True, use_cache=True)
+        tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME)
+        model.save_pretrained(ONNX_DIR)
+        tokenizer.save_pretrained(ONNX_DIR)
+
+    # 2. LOAD
+    model = ORTModelForSeq2SeqLM.from_pretrained(ONNX_DIR, use_cache=True)
+    tokenizer = AutoTokenizer.from_pretrained(ONNX_DIR)
+    return pipeline("text2text-generation", model=model, tokenizer=tokenizer)
+
+
+BACKENDS = {
+    "torch": load_torch,
+    "int8": load_int8,
+    "onnx": load_onnx,
+}
+
+
+def load_pipeline(backend=None):
+    """Loads the generation pipeline for `backend` (default: RAG_BACKEND env var)."""
+    backend = backend or RAG_BACKEND
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown RAG_BACKEND '{backend}', expected one of {sorted(BACKENDS)}")
+    try:
+        return BACKENDS[backend]()
+    except ImportError as e:
+        # onnx needs `pip install optimum[onnxruntime]`; don't take the service down over it
+        print(f"⚠️ Backend '{backend}' unavailable ({e}), falling back to torch")
+        return load_torch()
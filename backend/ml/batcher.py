@@ -0,0 +1,152 @@
+import asyncio
+import os
+import time
+from collections import Counter, deque
+
+# How many prompts go into one generate call, and how long the first prompt
+# in a batch may wait for company. Flan-T5-small on CPU handles 8-16 prompts
+# in roughly the time of 2-3 single calls.
+MAX_BATCH_SIZE = int(os.getenv("MODEL_BATCH_SIZE", "8"))
+MAX_WAIT_MS = float(os.getenv("MODEL_BATCH_WAIT_MS", "10"))
+
+
+class BatchMetrics:
+    """Rolling batch-size and queue-wait stats for the /metrics endpoint."""
+
+    def __init__(self, window=1000):
+        self.requests = 0
+        self.batches = 0
+        self.batch_sizes = Counter()
+        self.queue_waits = deque(maxlen=window)   # seconds, most recent requests
+        self.batch_seconds = deque(maxlen=window)
+
+    def record(self, size, waits, run_seconds):
+        self.requests += size
+        self.batches += 1
+        self.batch_sizes[size] += 1
+        self.queue_waits.extend(waits)
+        self.batch_seconds.append(run_seconds)
+
+    @staticmethod
+    def _percentile(values, pct):
+        if not values:
+            return 0.0
+        ordered = sorted(values)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+    def snapshot(self):
+        return {
+            "requests": self.requests,
+            "batches": self.batches,
+            "avg_batch_size": round(self.requests / self.batches, 2) if self.batches else 0.0,
+            "batch_size_histogram": dict(sorted(self.batch_sizes.items())),
+            "queue_wait_ms": {
+                "p50": round(self._percentile(self.queue_waits, 50) * 1000, 2),
+                "p99": round(self._percentile(self.queue_waits, 99) * 1000, 2),
+            },
+            "batch_run_ms": {
+                "p50": round(self._percentile(self.batch_seconds, 50) * 1000, 2),
+                "p99": round(self._percentile(self.batch_seconds, 99) * 1000, 2),
+            },
+        }
+
+
+class MicroBatcher:
+    """
+    Collects concurrent prompts for up to `max_wait_ms` or `max_batch_size`
+    prompts, runs them through one `run_batch(prompts, **gen_kwargs)` call and
+    hands each caller its own result. Prompts are only batched together when
+    they share generation kwargs (TradeBot and stat answers use different
+    max_length). The model runs in a worker thread so the event loop keeps
+    accepting requests while a batch is generating. `concurrency` is how many
+    batches may generate at once (1 for a single in-process model).
+    """
+
+    def __init__(self, run_batch, max_batch_size=MAX_BATCH_SIZE, max_wait_ms=MAX_WAIT_MS, concurrency=1):
+        self.run_batch = run_batch
+        self.concurrency = max(1, concurrency)
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max_wait_ms / 1000
+        self.metrics = BatchMetrics()
+        self._queue = None
+        self._slots = None
+        self._running = set()   # in-flight batch tasks (keeps them from being GC'd)
+        self._worker = None
+
+    def start(self):
+        if self._worker is None:
+            self._queue = asyncio.Queue()
+            self._slots = asyncio.Semaphore(self.concurrency)
+            self._worker = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+    async def submit(self, prompt, **gen_kwargs):
+        self.start()
+        future = asyncio.get_running_loop().create_future()
+        key = tuple(sorted(gen_kwargs.items()))
+        await self._queue.put((key, prompt, future, time.perf_counter()))
+        return await future
+
+    async def _collect(self):
+        """Blocks for the first prompt, then gathers more until the batch is full or the wait is over."""
+        batch = [await self._queue.get()]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        while True:
+            batch = await self._collect()
+
+            # 1. GROUP BY GENERATION SETTINGS (one generate call per group)
+            groups = {}
+            for item in batch:
+                groups.setdefault(item[0], []).append(item)
+
+            for key, items in groups.items():
+                # A caller that gave up (client disconnect) doesn't need a slot
+                items = [item for item in items if not item[2].done()]
+                if not items:
+                    continue
+                # With a worker pool several batches run at once, one per free worker
+                await self._slots.acquire()
+                task = asyncio.create_task(self._execute(key, items))
+                self._running.add(task)
+                task.add_done_callback(self._running.discard)
+
+    async def _execute(self, key, items):
+        try:
+            started = time.perf_counter()
+            waits = [started - item[3] for item in items]
+
+            # 2. RUN THE BATCH OFF THE EVENT LOOP
+            try:
+                results = await asyncio.to_thread(self.run_batch, [item[1] for item in items], **dict(key))
+            except Exception as e:
+                for item in items:
+                    if not item[2].done():
+                        item[2].set_exception(e)
+                return
+
+            # 3. FAN RESULTS BACK OUT
+            self.metrics.record(len(items), waits, time.perf_counter() - started)
+            for item, result in zip(items, results):
+                if not item[2].done():
+                    item[2].set_result(result)
+        finally:
+            self._slots.release()
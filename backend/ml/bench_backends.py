@@ -0,0 +1,99 @@
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+# Compares the RAG inference backends (ml/backends.py) on CPU: generation
+# throughput in tokens/sec, peak RSS, and how many answers match the fp32
+# torch baseline word for word. Each backend runs in its own process so the
+# RSS numbers don't include the previous backend's weights.
+# Run from backend/: python ml/bench_backends.py [torch int8 onnx]
+
+BACKENDS = ["torch", "int8", "onnx"]
+ROUNDS = 3
+
+# Same prompt shape RAGEngine.build_prompt produces
+FACTS = [
+    ("In 2025, Saquon Barkley scored 315.4 fantasy points.", "How many points did Saquon score?"),
+    ("In 2025, Josh Allen threw for 3731 yards and 28 touchdowns.", "How many yards did Josh Allen throw for?"),
+    ("In 2024, Derrick Henry rushed for 1921 yards and 16 touchdowns.", "How many rushing yards did Henry have last year?"),
+    ("In 2025, Ja'Marr Chase caught 1412 receiving yards and 11 touchdowns.", "Did Chase have a good receiving year?"),
+    ("In 2025, Christian McCaffrey scored 14 total touchdowns (10 rushing, 4 receiving, 0 passing).", "How many TDs did CMC score?"),
+    ("In 2023, Lamar Jackson threw for 3678 yards and 24 touchdowns.", "How did Lamar pass in 2023?"),
+]
+PROMPTS = [
+    f"Fact: {fact}\nQuestion: {q}\nTask: Write a complete natural sentence using the Fact above. Include the player name and year."
+    for fact, q in FACTS
+]
+GEN_KWARGS = {"max_length": 80, "repetition_penalty": 1.2, "do_sample": False}
+
+
+def peak_rss_mb():
+    # ru_maxrss is KB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_backend(name):
+    """Child process: load one backend, generate every prompt, print JSON."""
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from ml.backends import load_pipeline
+
+    start = time.perf_counter()
+    pipe = load_pipeline(name)
+    load_seconds = time.perf_counter() - start
+
+    pipe(PROMPTS[0], **GEN_KWARGS)   # warm-up
+
+    answers = []
+    tokens = 0
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        answers = [out['generated_text'] for out in pipe(PROMPTS, batch_size=1, **GEN_KWARGS)]
+        tokens += sum(len(pipe.tokenizer(a)['input_ids']) for a in answers)
+    elapsed = time.perf_counter() - start
+
+    print(json.dumps({
+        "backend": name,
+        "load_s": load_seconds,
+        "tokens_per_s": tokens / elapsed,
+        "ms_per_answer": elapsed / (ROUNDS * len(PROMPTS)) * 1000,
+        "peak_rss_mb": peak_rss_mb(),
+        "answers": answers,
+    }))
+
+
+def run_benchmark(backends):
+    print(f"⏱️ RAG BACKEND BENCHMARK ({len(PROMPTS)} prompts x {ROUNDS} rounds, CPU)")
+    results = []
+    for name in backends:
+        proc = subprocess.run([sys.executable, __file__, "--child", name], capture_output=True, text=True)
+        lines = [l for l in proc.stdout.splitlines() if l.startswith("{")]
+        if proc.returncode != 0 or not lines:
+            print(f"❌ {name}: {proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else 'no output'}")
+            continue
+        results.append(json.loads(lines[-1]))
+
+    baseline = next((r for r in results if r["backend"] == "torch"), None)
+    print(f"   {'backend':>7}  {'load s':>7}  {'tok/s':>7}  {'ms/ans':>7}  {'peak MB':>8}  {'parity':>7}")
+    for r in results:
+        parity = "-"
+        if baseline:
+            same = sum(a == b for a, b in zip(r["answers"], baseline["answers"]))
+            parity = f"{same}/{len(PROMPTS)}"
+        print(f"   {r['backend']:>7}  {r['load_s']:>7.1f}  {r['tokens_per_s']:>7.1f}  {r['ms_per_answer']:>7.0f}  "
+              f"{r['peak_rss_mb']:>8.0f}  {parity:>7}")
+
+    if baseline:
+        for r in results:
+            for prompt_answer, base_answer in zip(r["answers"], baseline["answers"]):
+                if prompt_answer != base_answer:
+                    print(f"   ↳ {r['backend']}: '{prompt_answer}' vs torch: '{base_answer}'")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3 and sys.argv[1] == "--child":
+        run_backend(sys.argv[2])
+    else:
+        run_benchmark(sys.argv[1:] or BACKENDS)
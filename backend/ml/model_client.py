@@ -0,0 +1,91 @@
+import asyncio
+import os
+import random
+import httpx
+
+MODEL_SERVICE_URL = os.getenv("MODEL_SERVICE_URL", "http://127.0.0.1:8001/generate")
+
+# Flan-T5 on CPU can take a few seconds, but anything past this is a hung worker.
+GENERATE_TIMEOUT = float(os.getenv("MODEL_SERVICE_TIMEOUT", "20"))
+
+
+class RetryBudget:
+    """
+    Caps retries to a fraction of real traffic so a struggling model service
+    doesn't get hit with a retry storm. Every request deposits `ratio` tokens,
+    every retry withdraws one.
+    """
+
+    def __init__(self, ratio=0.2, min_tokens=3, max_tokens=10):
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self.tokens = float(min_tokens)
+
+    def deposit(self):
+        self.tokens = min(self.max_tokens, self.tokens + self.ratio)
+
+    def try_withdraw(self):
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+
+class ModelServiceClient:
+    """
+    Non-blocking client for the Flan-T5 model service (ml/model_service.py).
+    One pooled httpx.AsyncClient is shared by every chat request, so we reuse
+    keep-alive connections instead of opening a new TCP socket per message.
+    """
+
+    RETRY_STATUSES = {502, 503, 504}
+
+    def __init__(self, url=MODEL_SERVICE_URL, timeout=GENERATE_TIMEOUT, max_retries=2):
+        self.url = url
+        self.max_retries = max_retries
+        self.budget = RetryBudget()
+        self.timeout = httpx.Timeout(timeout, connect=2.0)
+        self.limits = httpx.Limits(max_connections=100, max_keepalive_connections=20)
+        self._client = None
+
+    def _get_client(self):
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(timeout=self.timeout, limits=self.limits)
+        return self._client
+
+    async def generate(self, player_name, question):
+        """
+        Returns the model's answer, or None if the service is down/slow.
+        Only connection errors and 502/503/504 are retried: a generation that
+        timed out would just time out again and burn another CPU slot.
+        """
+        self.budget.deposit()
+        payload = {"player_name": player_name, "question": question}
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                resp = await self._get_client().post(self.url, json=payload)
+                if resp.status_code == 200:
+                    return resp.json().get("answer")
+                if resp.status_code not in self.RETRY_STATUSES:
+                    return None
+            except (httpx.ConnectError, httpx.RemoteProtocolError):
+                pass
+            except httpx.HTTPError as e:
+                print(f"❌ Model service error: {e!r}")
+                return None
+
+            if attempt == self.max_retries or not self.budget.try_withdraw():
+                return None
+            # Exponential backoff with jitter: ~0.1s, ~0.2s, ...
+            await asyncio.sleep(0.1 * (2 ** attempt) * (0.5 + random.random()))
+
+        return None
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+model_client = ModelServiceClient()
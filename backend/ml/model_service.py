@@ -1,7 +1,12 @@
-from fastapi import FastAPI, HTTPException
+import asyncio
+import time
+from fastapi import FastAPI, HTTPException, Response
 from pydantic import BaseModel
 import uvicorn
-from rag_system import rag 
+from rag_system import rag, PREWARM, PREWARM_PROMPT
+from batcher import MicroBatcher
+from worker_pool import WorkerPool, MODEL_WORKERS
+from ml.answer_cache import answer_cache   # same module object rag_system uses
 
 app = FastAPI()
 
@@ -10,16 +15,69 @@ class QueryRequest(BaseModel):
     question: str
 
 print("🚀 MODEL SERVICE: Starting up... (The Brain is ON)")
+BOOT_STARTED = time.perf_counter()
+
+# MODEL_WORKERS > 1: forked inference processes sharing one copy of the weights.
+# Both expose load_in_background / ready / status / generate_batch.
+if MODEL_WORKERS > 1:
+    inference = WorkerPool(rag, MODEL_WORKERS, prewarm_prompt=PREWARM_PROMPT if PREWARM else None)
+else:
+    inference = rag
+
+# Concurrent prompts share one generate call (MODEL_BATCH_SIZE / MODEL_BATCH_WAIT_MS),
+# and each worker can run its own batch at the same time.
+batcher = MicroBatcher(inference.generate_batch, concurrency=MODEL_WORKERS)
+
+@app.on_event("startup")
+async def start_batcher():
+    batcher.start()
+    print(f"📦 Micro-batching: up to {batcher.max_batch_size} prompts / {batcher.max_wait * 1000:.0f}ms")
+
+@app.on_event("startup")
+async def start_model_load():
+    # Bind the port first, load weights (and prewarm) in the background.
+    # /health says "loading" until then, so the orchestrator can tell booting from dead.
+    rag.phases["boot_to_port_s"] = round(time.perf_counter() - BOOT_STARTED, 2)
+    inference.load_in_background()
+
+@app.get("/health")
+def health(response: Response):
+    status = inference.status()
+    if status != "ready":
+        response.status_code = 503
+    return {"status": status, "phases": rag.phases, "error": rag.load_error}
+
+@app.on_event("shutdown")
+async def stop_batcher():
+    await batcher.stop()
+    if inference is not rag:
+        inference.stop()
 
 @app.post("/generate")
-def generate_response(request: QueryRequest):
+async def generate_response(request: QueryRequest):
     try:
-        # The logic is all in rag_system.py now
-        answer = rag.generate_answer(request.player_name, request.question)
+        # The logic is all in rag_system.py now. Prompt building hits the DB, keep it off the loop.
+        answer, prompt, gen_kwargs = await asyncio.to_thread(rag.build_prompt, request.player_name, request.question)
+        if prompt is not None:
+            # Cached / template answers don't need the model, everything else waits for it
+            if not inference.ready.is_set():
+                raise HTTPException(status_code=503, detail=f"Model {inference.status()}", headers={"Retry-After": "5"})
+            answer = await batcher.submit(prompt, **gen_kwargs)
         return {"answer": answer}
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"❌ MODEL ERROR: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/metrics")
+def metrics():
+    return {
+        "batching": batcher.metrics.snapshot(),
+        "answer_cache": answer_cache.stats(),
+        "rendering": rag.render_snapshot(),
+        "workers": inference.utilization() if inference is not rag else {"workers": 1},
+    }
+
 if __name__ == "__main__":
-    uvicorn.run(app, host="127.0.0.1", port=8001)
\ No newline at end of file
+    uvicorn.run(app, host="127.0.0.1", port=8001)
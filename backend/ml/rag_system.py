@@ -1,31 +1,106 @@
 import os
 import sys
 import re
+import threading
+import time
+from collections import Counter
 from sqlalchemy import text
-from transformers import pipeline
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from database import engine
+from api.nlp.player_search import find_player
+from ml.answer_cache import answer_cache
+from ml.backends import load_pipeline, RAG_BACKEND
+
+# How answers get rendered:
+#   "llm"      - always let Flan-T5 polish the fact sentence (old behaviour)
+#   "hybrid"   - return the fact sentence as-is when the question clearly asks
+#                for that one stat, use the model for anything else
+#   "template" - never call the model for stat questions
+ANSWER_MODE = os.getenv("ANSWER_MODE", "hybrid")
+
+# Run one synthetic generation after loading so the first real user doesn't
+# pay for lazy allocations / kernel selection.
+PREWARM = os.getenv("MODEL_PREWARM", "1") == "1"
+PREWARM_PROMPT = (
+    "Fact: In 2025, Josh Allen threw for 3731 yards and 28 touchdowns.\n"
+    "Question: How many yards did Josh Allen throw for?\n"
+    "Task: Write a complete natural sentence using the Fact above. Include the player name and year."
+)
+
+# Stat keywords (same ones the intent detection uses). Points are only asked
+# about on their own, "score" also appears in "how many TDs did he score".
+STAT_KEYWORDS = {
+    "touchdowns": ("touchdown", " td"),
+    "rushing": ("rush", "run"),
+    "passing": ("pass", "throw"),
+    "receiving": ("receiv", "catch"),
+}
+
+# Opinion / comparison questions: the fact alone doesn't answer these
+FREE_FORM_WORDS = re.compile(
+    r"\b(why|should|would|could|better|worse|compare|think|explain|good|bad|expect|predict|will|start|sit|trade)\b"
+)
+
+# Fact sentences share the answer cache (and its data version) under their own
+# kwargs, keyed on what the question resolved to, so a repeat question is
+# answered without touching find_player or season_stats.
+FACT_KWARGS = {"kind": "fact"}
 
 class RAGEngine:
     def __init__(self):
-        print("🧠 Loading AI Model (Google Flan-T5)...")
-        self.pipeline = pipeline("text2text-generation", model="google/flan-t5-small")
-        print("✅ Model Loaded.")
+        # The model is NOT loaded here: call load() / load_in_background(),
+        # or let the first generate_batch load it.
+        self.pipeline = None
+        self.ready = threading.Event()
+        self.load_error = None
+        self.phases = {}                 # startup phase -> seconds
+        self._load_lock = threading.Lock()
+        self.answer_mode = ANSWER_MODE
+        self.render_stats = Counter()    # template / cache / model / direct
+
+    def load(self, prewarm=PREWARM):
+        with self._load_lock:
+            if self.ready.is_set():
+                return
+            try:
+                # 1. LOAD WEIGHTS
+                print(f"🧠 Loading AI Model (Google Flan-T5, {RAG_BACKEND} backend)...")
+                start = time.perf_counter()
+                self.pipeline = load_pipeline(RAG_BACKEND)
+                self.phases["model_load_s"] = round(time.perf_counter() - start, 2)
+
+                # 2. PREWARM (not cached, the fact is made up)
+                if prewarm:
+                    start = time.perf_counter()
+                    self.pipeline(PREWARM_PROMPT, max_length=80, do_sample=False)
+                    self.phases["prewarm_s"] = round(time.perf_counter() - start, 2)
+            except Exception as e:
+                self.load_error = str(e)
+                print(f"❌ Model load failed: {e}")
+                raise
+            self.load_error = None
+            self.ready.set()
+            print(f"✅ Model Loaded. {self.phases}")
+
+    def load_in_background(self, prewarm=PREWARM):
+        def run():
+            try:
+                self.load(prewarm)
+            except Exception:
+                pass   # already logged, surfaced through load_error / /health
+        threading.Thread(target=run, name="model-loader", daemon=True).start()
+
+    def status(self):
+        if self.ready.is_set():
+            return "ready"
+        return "failed" if self.load_error else "loading"
 
     def retrieve_precise_data(self, player_name, season, intent):
         try:
             with engine.connect() as conn:
                 # 1. FIND PLAYER (Using Popularity Sort)
-                find_sql = text("""
-                    SELECT p.gsis_id, p.name, p.position, p.team_id, s.fantasy_points
-                    FROM players p
-                    LEFT JOIN season_stats s ON p.gsis_id = s.gsis_id AND s.season = :season
-                    WHERE p.name ILIKE :name
-                    ORDER BY s.fantasy_points DESC NULLS LAST
-                    LIMIT 1
-                """)
-                player = conn.execute(find_sql, {"name": f"%{player_name}%", "season": season}).mappings().first()
+                player = find_player(conn, player_name, season)
 
                 if not player: return None
 
@@ -67,11 +142,25 @@ class RAGEngine:
             print(f"❌ DB Error: {e}")
             return None
 
-    def generate_answer(self, player_name, user_question):
+    def cached_fact(self, player_name, season, intent):
+        """retrieve_precise_data behind the answer cache. Misses (None) are not cached."""
+        key = f"{player_name}|{season}|{intent}"
+        fact = answer_cache.get(key, FACT_KWARGS, count=False)
+        if fact is None:
+            fact = self.retrieve_precise_data(player_name, season, intent)
+            if fact is not None:
+                answer_cache.put(key, FACT_KWARGS, fact)
+        return fact
+
+    def build_prompt(self, player_name, user_question):
+        """
+        Everything generate_answer does before the model runs.
+        Returns (answer, None, None) when no generation is needed
+        (including answer-cache hits), otherwise (None, prompt, generation kwargs).
+        """
         # 0. BYPASS FOR TRADEBOT
         if player_name == "TradeBot":
-            output = self.pipeline(user_question, max_length=100, do_sample=False)
-            return output[0]['generated_text']
+            return self._cached_or_prompt(user_question, {"max_length": 100})
 
         # 1. DETECT SEASON
         target_season = 2025
@@ -90,13 +179,22 @@ class RAGEngine:
         elif "point" in q_lower or "score" in q_lower: intent = "points"
         
         # 3. GET CONTEXT
-        context = self.retrieve_precise_data(player_name, target_season, intent)
-        if not context: return f"I couldn't find stats for {player_name} in {target_season}."
+        context = self.cached_fact(player_name, target_season, intent)
+        if not context:
+            self.render_stats["direct"] += 1
+            return f"I couldn't find stats for {player_name} in {target_season}.", None, None
         
         # If it's an Info message (no stats), return it directly
-        if context.startswith("Info:"): return context
+        if context.startswith("Info:"):
+            self.render_stats["direct"] += 1
+            return context, None, None
+
+        # The fact sentence already answers "how many rushing yards did X have?"
+        if self.template_answers(intent, q_lower):
+            self.render_stats["template"] += 1
+            return context, None, None
 
-        # 4. GENERATE RESPONSE
+        # 4. BUILD PROMPT
         # We give the AI the full sentence and tell it to repeat/polish it.
         prompt = (
             f"Fact: {context}\n"
@@ -105,7 +203,59 @@ class RAGEngine:
         )
         
         # Increased max_length slightly to allow for the full sentence
-        output = self.pipeline(prompt, max_length=80, repetition_penalty=1.2, do_sample=False)
-        return output[0]['generated_text']
+        return self._cached_or_prompt(prompt, {"max_length": 80, "repetition_penalty": 1.2})
+
+    def _cached_or_prompt(self, prompt, gen_kwargs):
+        # Same prompt + same data version = same deterministic answer
+        cached = answer_cache.get(prompt, gen_kwargs)
+        if cached is not None:
+            self.render_stats["cache"] += 1
+            return cached, None, None
+        self.render_stats["model"] += 1
+        return None, prompt, gen_kwargs
+
+    def template_answers(self, intent, q_lower):
+        """True if the question asks for exactly the stat the fact sentence states."""
+        if self.answer_mode == "llm" or intent == "general":
+            return False
+        if self.answer_mode == "template":
+            return True
+        if FREE_FORM_WORDS.search(q_lower):
+            return False
+        # "rushing and receiving yards" needs both sentences, let the model handle it
+        asked = [k for k, words in STAT_KEYWORDS.items() if any(w in q_lower for w in words)]
+        return len(asked) <= 1
+
+    def render_snapshot(self):
+        total = sum(self.render_stats.values())
+        skipped = total - self.render_stats["model"]
+        return {
+            "answer_mode": self.answer_mode,
+            **dict(self.render_stats),
+            "inference_skipped_fraction": round(skipped / total, 3) if total else 0.0,
+        }
+
+    def generate_batch(self, prompts, **gen_kwargs):
+        """Runs several prompts through one generate call. Prompts must share gen_kwargs."""
+        if not self.ready.is_set():
+            self.load()
+        answers = self.generate_uncached(prompts, **gen_kwargs)
+        self.cache_answers(prompts, gen_kwargs, answers)
+        return answers
+
+    def generate_uncached(self, prompts, **gen_kwargs):
+        """Just the model call. Worker processes run this, the parent does the caching."""
+        outputs = self.pipeline(prompts, batch_size=len(prompts), do_sample=False, **gen_kwargs)
+        return [o[0]['generated_text'] if isinstance(o, list) else o['generated_text'] for o in outputs]
+
+    def cache_answers(self, prompts, gen_kwargs, answers):
+        for prompt, answer in zip(prompts, answers):
+            answer_cache.put(prompt, gen_kwargs, answer)
+
+    def generate_answer(self, player_name, user_question):
+        answer, prompt, gen_kwargs = self.build_prompt(player_name, user_question)
+        if prompt is None:
+            return answer
+        return self.generate_batch([prompt], **gen_kwargs)[0]
 
 rag = RAGEngine()
\ No newline at end of file
@@ -0,0 +1,223 @@
+import itertools
+import multiprocessing as mp
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+# One uvicorn process running one pipeline only ever uses about one core for
+# generation. In pool mode the parent loads the weights once and forks
+# MODEL_WORKERS inference processes. Fork shares the weight pages
+# copy-on-write, so N workers cost far less than N x the RSS. The parent keeps
+# the HTTP side (batching, caching, DB lookups) and sends batches to the
+# workers over a multiprocessing queue.
+MODEL_WORKERS = int(os.getenv("MODEL_WORKERS", "1"))
+JOB_TIMEOUT = float(os.getenv("MODEL_WORKER_TIMEOUT", "60"))   # a dead worker must not hang callers forever
+START_TIMEOUT = float(os.getenv("MODEL_WORKER_START_TIMEOUT", "300"))   # fork + prewarm of every worker
+WATCH_INTERVAL = 1.0         # seconds between liveness checks while waiting on the results queue
+
+
+def _worker_main(worker_id, rag, tasks, results, running, threads, prewarm_prompt):
+    """Runs in the forked child: pin torch threads, prewarm, then serve batches."""
+    import torch
+    torch.set_num_threads(threads)
+    if prewarm_prompt:
+        rag.generate_uncached([prewarm_prompt], max_length=80)
+    results.put(("ready", worker_id, None, 0.0))
+
+    while True:
+        job = tasks.get()
+        if job is None:
+            break
+        job_id, prompts, gen_kwargs = job
+        running[worker_id] = job_id   # shared memory, not the queue: still readable if we die mid-job
+        start = time.perf_counter()
+        try:
+            out = rag.generate_uncached(prompts, **gen_kwargs)
+        except Exception as e:
+            out = RuntimeError(f"worker {worker_id}: {e}")
+        running[worker_id] = -1
+        results.put((job_id, worker_id, out, time.perf_counter() - start))
+
+
+class WorkerPool:
+    """
+    Same interface the model service uses on RAGEngine (load_in_background,
+    ready, status, generate_batch), backed by forked worker processes.
+    """
+
+    def __init__(self, rag, workers=MODEL_WORKERS, prewarm_prompt=None):
+        self.rag = rag
+        self.workers = workers
+        self.prewarm_prompt = prewarm_prompt
+        # Split the cores so N workers don't each spin up a full torch thread pool
+        self.threads_per_worker = max(1, (os.cpu_count() or 1) // workers)
+        self.ready = threading.Event()
+        self.processes = []
+        self.busy_seconds = [0.0] * workers
+        self.jobs_done = [0] * workers
+        self.started_at = None
+        self._pending = {}           # job id -> Future
+        self._running = None         # shared array: worker id -> job id it is running, -1 when idle
+        self._dead = set()           # worker ids already reported as exited
+        self._job_ids = itertools.count()
+        self._lock = threading.Lock()
+        self._tasks = None
+        self._results = None
+
+    @property
+    def load_error(self):
+        return self.rag.load_error
+
+    @property
+    def phases(self):
+        return self.rag.phases
+
+    def status(self):
+        if self.ready.is_set():
+            return "ready"
+        return "failed" if self.load_error else "loading"
+
+    def start(self):
+        # 1. LOAD ONCE IN THE PARENT (no prewarm here: each worker warms its own thread pool)
+        self.rag.load(prewarm=False)
+
+        # 2. FORK WORKERS (they inherit the loaded pipeline)
+        start = time.perf_counter()
+        ctx = mp.get_context("fork")
+        self._tasks = ctx.Queue()
+        self._results = ctx.Queue()
+        self._running = ctx.Array("q", [-1] * self.workers)
+        for worker_id in range(self.workers):
+            proc = ctx.Process(
+                target=_worker_main,
+                args=(worker_id, self.rag, self._tasks, self._results, self._running,
+                      self.threads_per_worker, self.prewarm_prompt),
+                name=f"model-worker-{worker_id}",
+                daemon=True,
+            )
+            proc.start()
+            self.processes.append(proc)
+
+        # 3. WAIT FOR EVERY WORKER TO REPORT IN (a worker that dies during prewarm never will)
+        waiting = set(range(self.workers))
+        deadline = time.monotonic() + START_TIMEOUT
+        while waiting:
+            try:
+                tag, worker_id, _, _ = self._results.get(timeout=WATCH_INTERVAL)
+            except queue.Empty:
+                exited = [i for i in waiting if not self.processes[i].is_alive()]
+                if exited:
+                    codes = ", ".join(f"{i} (exit code {self.processes[i].exitcode})" for i in exited)
+                    self._abort_start(f"Model worker(s) {codes} exited during startup")
+                if time.monotonic() > deadline:
+                    self._abort_start(f"Model workers {sorted(waiting)} not ready after {START_TIMEOUT:.0f}s")
+                continue
+            if tag == "ready":
+                waiting.discard(worker_id)
+        self.phases["workers_start_s"] = round(time.perf_counter() - start, 2)
+
+        threading.Thread(target=self._collect_results, name="model-worker-results", daemon=True).start()
+        self.started_at = time.monotonic()
+        self.ready.set()
+        print(f"✅ {self.workers} model workers ready ({self.threads_per_worker} threads each). {self.phases}")
+
+    def _abort_start(self, message):
+        """Startup failed: stop the workers that did come up and surface the error through /health."""
+        for proc in self.processes:
+            if proc.is_alive():
+                proc.terminate()
+        self.rag.load_error = message
+        raise RuntimeError(message)
+
+    def load_in_background(self):
+        def run():
+            try:
+                self.start()
+            except Exception as e:
+                self.rag.load_error = self.rag.load_error or str(e)
+                print(f"❌ Worker pool failed to start: {e}")
+        threading.Thread(target=run, name="model-pool-loader", daemon=True).start()
+
+    def _collect_results(self):
+        while True:
+            try:
+                job_id, worker_id, out, busy = self._results.get(timeout=WATCH_INTERVAL)
+            except queue.Empty:
+                self._check_workers()
+                continue
+            with self._lock:
+                self.busy_seconds[worker_id] += busy
+                self.jobs_done[worker_id] += 1
+                future = self._pending.pop(job_id, None)
+            if future is None:
+                continue
+            if isinstance(out, Exception):
+                future.set_exception(out)
+            else:
+                future.set_result(out)
+            self._check_workers()
+
+    def _check_workers(self):
+        """Fails the job a dead worker was running; once every worker is gone, fails the pool."""
+        failed = []
+        with self._lock:
+            for worker_id, proc in enumerate(self.processes):
+                if worker_id in self._dead or proc.is_alive():
+                    continue
+                self._dead.add(worker_id)
+                error = RuntimeError(f"Model worker {worker_id} exited (exit code {proc.exitcode})")
+                print(f"❌ {error}")
+                job_id = self._running[worker_id]
+                if job_id in self._pending:
+                    failed.append((self._pending.pop(job_id), error))
+            if len(self._dead) == len(self.processes) and self.ready.is_set():
+                # Nobody is left to read the task queue: fail everything still waiting
+                self.ready.clear()
+                self.rag.load_error = "All model workers exited"
+                error = RuntimeError(self.rag.load_error)
+                failed.extend((future, error) for future in self._pending.values())
+                self._pending.clear()
+        for future, error in failed:
+            future.set_exception(error)
+
+    def generate_batch(self, prompts, **gen_kwargs):
+        """Blocking: hands the batch to whichever worker is free and waits for it."""
+        if not self.ready.is_set():
+            raise RuntimeError("Worker pool is not ready")
+        future = Future()
+        with self._lock:
+            job_id = next(self._job_ids)
+            self._pending[job_id] = future
+        self._tasks.put((job_id, list(prompts), gen_kwargs))
+        try:
+            answers = future.result(timeout=JOB_TIMEOUT)
+        except TimeoutError:
+            with self._lock:
+                self._pending.pop(job_id, None)
+            raise RuntimeError(f"No model worker answered within {JOB_TIMEOUT:.0f}s")
+        self.rag.cache_answers(prompts, gen_kwargs, answers)
+        return answers
+
+    def utilization(self):
+        uptime = time.monotonic() - self.started_at if self.started_at else 0.0
+        return {
+            "workers": self.workers,
+            "threads_per_worker": self.threads_per_worker,
+            "per_worker": [
+                {
+                    "pid": proc.pid,
+                    "alive": proc.is_alive(),
+                    "jobs": self.jobs_done[i],
+                    "utilization": round(self.busy_seconds[i] / uptime, 3) if uptime else 0.0,
+                }
+                for i, proc in enumerate(self.processes)
+            ],
+        }
+
+    def stop(self):
+        for _ in self.processes:
+            self._tasks.put(None)
+        for proc in self.processes:
+            proc.join(timeout=5)
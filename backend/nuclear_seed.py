@@ -2,6 +2,12 @@ import pandas as pd
 import numpy as np
 from database import engine
 from sqlalchemy import text
+from etl.pbp_store import read_pbp
+from etl.bulk_load import bulk_load
+from etl.migrate import apply_migrations
+from etl.state import bump_data_version
+from etl.leaderboards import rebuild_leaderboards
+from etl.percentiles import rebuild_percentiles
 import time
 
 # --- HELPER: Force Unique Columns ---
@@ -27,13 +33,12 @@ def nuclear_reload():
     ]
 
     # --- STEP 1: WIPE EVERYTHING ---
-    with engine.connect() as conn:
+    # Rows only: the schema and its indexes belong to the migrations.
+    # players is kept: its player_ids are what every weekly/crosswalk row points at.
+    with engine.begin() as conn:
         print("   🗑️ Wiping ALL tables...")
-        conn.execute(text("DROP TABLE IF EXISTS season_stats CASCADE;"))
-        conn.execute(text("DROP TABLE IF EXISTS weekly_stats CASCADE;"))
-        conn.execute(text("DROP TABLE IF EXISTS team_season_stats CASCADE;"))
-        conn.execute(text("DROP TABLE IF EXISTS players CASCADE;"))
-        conn.commit()
+        apply_migrations(conn)
+        conn.execute(text("TRUNCATE season_stats, weekly_stats, team_season_stats;"))
     print("   ✅ Database Wiped.")
 
     # --- STEP 2: LOAD PLAYERS (2025 ROSTER) ---
@@ -43,8 +48,9 @@ def nuclear_reload():
         roster_df = pd.read_csv(ROSTER_URL, low_memory=False)
         players_db = roster_df[['gsis_id', 'full_name', 'position', 'team', 'headshot_url', 'espn_id', 'sleeper_id', 'yahoo_id']].copy()
         players_db.rename(columns={'full_name': 'name', 'team': 'team_id'}, inplace=True)
-        players_db.drop_duplicates(subset=['gsis_id'], inplace=True)
-        players_db.to_sql('players', engine, if_exists='replace', index=False)
+        players_db = players_db.dropna(subset=['gsis_id']).drop_duplicates(subset=['gsis_id'])
+        with engine.begin() as conn:
+            bulk_load(conn, players_db, 'players', mode='upsert', key_cols=['gsis_id'])   # keeps existing player_ids
         print(f"   ✅ Saved {len(players_db)} players.")
     except Exception as e:
         print(f"   ❌ Error loading rosters: {e}")
@@ -91,8 +97,13 @@ def nuclear_reload():
 
     # --- STEP 4: GENERATE 2025 (CALC WOPR & SHARES) ---
     print("\n3. ⚙️ Calculating 2025 Stats (Include Advanced)...")
-    PBP_URL = "https://github.com/nflverse/nflverse-data/releases/download/pbp/play_by_play_2025.csv.gz"
-    pbp_df = pd.read_csv(PBP_URL, compression='gzip', low_memory=False)
+    pbp_cols = [
+        'season', 'week', 'posteam', 'defteam', 'play_type', 'passer_player_id', 'rusher_player_id',
+        'receiver_player_id', 'passing_yards', 'rushing_yards', 'receiving_yards', 'pass_touchdown',
+        'rush_touchdown', 'interception', 'fumble_lost', 'complete_pass', 'pass_attempt', 'rush_attempt',
+        'sack', 'epa', 'air_yards'
+    ]
+    pbp_df = read_pbp(2025, columns=pbp_cols)
 
     # A. Team Totals
     team_passing = pbp_df.groupby(['posteam', 'week'])['air_yards'].sum().reset_index().rename(columns={'air_yards': 'team_air_yards', 'posteam': 'team_id'})
@@ -183,7 +194,8 @@ def nuclear_reload():
     print(f"   -> Concatenating {len(all_weekly)} DataFrames...")
     final_weekly = pd.concat(all_weekly, ignore_index=True)
     
-    final_weekly.to_sql('weekly_stats', engine, if_exists='replace', index=False)
+    with engine.begin() as conn:
+        bulk_load(conn, final_weekly, 'weekly_stats', mode='reload')
     print(f"   ✅ Saved {len(final_weekly)} Weekly Stats (2023-2025).")
 
     # --- STEP 5: RE-CREATE SEASON STATS ---
@@ -194,7 +206,9 @@ def nuclear_reload():
         'receiving_yards': 'sum', 'receiving_tds': 'sum', 'receiving_epa': 'mean', 'receptions': 'sum',
         'wopr': 'mean', 'target_share': 'mean'
     }).reset_index()
-    season_df.to_sql('season_stats', engine, if_exists='replace', index=False)
+    with engine.begin() as conn:
+        bulk_load(conn, season_df, 'season_stats', mode='reload')
+        bump_data_version(conn, 2025)   # invalidates cached chat answers
     print(f"   ✅ Saved {len(season_df)} Season Stats.")
 
     # --- STEP 6: TEAM DEFENSE (2025) ---
@@ -202,9 +216,18 @@ def nuclear_reload():
     def_stats_25 = pbp_df.groupby(['defteam', 'season']).agg({
         'sack': 'sum', 'interception': 'sum', 'fumble_lost': 'sum'
     }).reset_index().rename(columns={'defteam': 'team_id', 'sack': 'def_sacks_made', 'interception': 'def_interceptions', 'fumble_lost': 'def_fumbles_recovered'})
-    def_stats_25.to_sql('team_season_stats', engine, if_exists='replace', index=False)
+    with engine.begin() as conn:
+        bulk_load(conn, def_stats_25, 'team_season_stats', mode='reload')
     print("   ✅ Team Defense (2025) Calculated & Saved.")
 
+    # --- STEP 7: DERIVED TABLES ---
+    # /leaders and the profile percentiles read snapshots of season_stats
+    print("\n6. 🏆 Rebuilding leaderboards & percentiles...")
+    with engine.begin() as conn:
+        rebuild_percentiles(conn)
+        rebuild_leaderboards(conn)
+    print("   ✅ Snapshots rebuilt.")
+
     print("\n🎉 NUCLEAR RELOAD COMPLETE.")
 
 if __name__ == "__main__":
@@ -1,6 +1,8 @@
 import pandas as pd
 from database import engine
 from sqlalchemy import text
+from etl.bulk_load import bulk_load
+from etl.migrate import apply_migrations
 
 def rebuild_player_directory():
     print("📖 STARTING PLAYER DIRECTORY REBUILD (OFFICIAL LATEST_TEAM FIX)...")
@@ -51,7 +53,9 @@ def rebuild_player_directory():
 
         # 5. Upload
         print(f"   💾 Updating 'players' table with {len(clean_df)} valid players...")
-        clean_df.to_sql('players', engine, if_exists='replace', index=False)
+        with engine.begin() as conn:
+            apply_migrations(conn)
+            bulk_load(conn, clean_df.drop_duplicates(subset=['gsis_id']), 'players', mode='upsert', key_cols=['gsis_id'])   # keeps existing player_ids
         print("✅ REBUILD COMPLETE. Teams are now linked.")
 
     except Exception as e:
@@ -2,17 +2,24 @@ import pandas as pd
 import numpy as np
 from database import engine
 from sqlalchemy import text
+from etl.pbp_store import read_pbp
+from etl.bulk_load import bulk_load
+from etl.migrate import apply_migrations
+from etl.state import bump_data_version
+from etl.leaderboards import rebuild_leaderboards
+from etl.percentiles import rebuild_percentiles
 
 def seed_database():
     print("🚀 STARTING FINAL DATABASE WIPE & RELOAD...")
     
     # --- STEP 0: WIPE THE DATABASE (CLEAN SLATE) ---
-    with engine.connect() as conn:
+    # Rows only: the schema and its indexes belong to the migrations.
+    # players is kept: its player_ids are what every weekly/crosswalk row points at.
+    with engine.begin() as conn:
         print("   🗑️ Wiping old tables...")
-        conn.execute(text("DROP TABLE IF EXISTS season_stats CASCADE;"))
-        conn.execute(text("DROP TABLE IF EXISTS weekly_stats CASCADE;"))
-        conn.execute(text("DROP TABLE IF EXISTS players CASCADE;"))
-        conn.commit()
+        apply_migrations(conn)
+        conn.execute(text("TRUNCATE season_stats, weekly_stats;"))
+        bump_data_version(conn, 2025)   # cached chat answers describe the wiped season_stats
     print("   ✅ Database Cleaned.")
 
     # --- STEP 1: PLAYERS (2025 ROSTER) ---
@@ -21,8 +28,9 @@ def seed_database():
     roster_df = pd.read_csv(ROSTER_URL, low_memory=False)
     players_db = roster_df[['gsis_id', 'full_name', 'position', 'team', 'headshot_url', 'espn_id', 'sleeper_id', 'yahoo_id']].copy()
     players_db.rename(columns={'full_name': 'name', 'team': 'team_id'}, inplace=True)
-    players_db.drop_duplicates(subset=['gsis_id'], inplace=True)
-    players_db.to_sql('players', engine, if_exists='replace', index=False)
+    players_db = players_db.dropna(subset=['gsis_id']).drop_duplicates(subset=['gsis_id'])
+    with engine.begin() as conn:
+        bulk_load(conn, players_db, 'players', mode='upsert', key_cols=['gsis_id'])   # keeps existing player_ids
     print(f"   ✅ Saved {len(players_db)} players.")
 
     # --- STEP 2: HISTORY (2023-2024) - USE OFFICIAL FILES ---
@@ -39,8 +47,13 @@ def seed_database():
 
     # --- STEP 3: 2025 (CALCULATE FROM RAW PBP) ---
     print("\n3. ⚙️ Calculating 2025 Stats from Raw Play-by-Play...")
-    PBP_URL = "https://github.com/nflverse/nflverse-data/releases/download/pbp/play_by_play_2025.csv.gz"
-    pbp_df = pd.read_csv(PBP_URL, compression='gzip', low_memory=False)
+    pbp_cols = [
+        'season', 'week', 'posteam', 'defteam', 'passer_player_id', 'rusher_player_id', 'receiver_player_id',
+        'passing_yards', 'rushing_yards', 'receiving_yards', 'pass_touchdown', 'rush_touchdown', 'interception',
+        'fumble_lost', 'complete_pass', 'pass_attempt', 'rush_attempt', 'sack', 'epa', 'cpoe', 'air_yards',
+        'yards_after_catch'
+    ]
+    pbp_df = read_pbp(2025, columns=pbp_cols)
 
     # A. OFFENSE AGGREGATION (With EPA!)
     pass_stats = pbp_df.groupby(['passer_player_id', 'week', 'posteam']).agg({
@@ -84,7 +97,8 @@ def seed_database():
 
     # --- SAVE WEEKLY STATS ---
     final_weekly = pd.concat(history_dfs)
-    final_weekly.to_sql('weekly_stats', engine, if_exists='replace', index=False)
+    with engine.begin() as conn:
+        bulk_load(conn, final_weekly, 'weekly_stats', mode='reload')
     print("   ✅ Weekly Stats Table Created.")
 
     # --- STEP 4: TEAM DEFENSE (FIXING THE SACKS NULL) ---
@@ -94,9 +108,18 @@ def seed_database():
     }).reset_index().rename(columns={'defteam': 'team_id', 'sack': 'def_sacks_made', 'interception': 'def_interceptions', 'fumble_lost': 'def_fumbles_recovered'})
     
     # We save this to a new table or merge it? Let's just create a simple 'team_season_stats' table
-    def_stats.to_sql('team_season_stats', engine, if_exists='replace', index=False)
+    with engine.begin() as conn:
+        bulk_load(conn, def_stats, 'team_season_stats', mode='reload')
     print("   ✅ Team Defense Table Created (Sacks Fixed).")
 
+    # --- STEP 5: DERIVED TABLES ---
+    # /leaders and the profile percentiles read snapshots of season_stats
+    print("\n5. 🏆 Rebuilding leaderboards & percentiles...")
+    with engine.begin() as conn:
+        rebuild_percentiles(conn)
+        rebuild_leaderboards(conn)
+    print("   ✅ Snapshots rebuilt.")
+
     print("\n🎉 FINAL RELOAD COMPLETE.")
 
 if __name__ == "__main__":